@@ -16,14 +16,105 @@ Author: Cherry Studio Integration Team
 Version: 1.0.0
 """
 
+import hashlib
 import json
+import mmap
 import os
 import platform
+import re
+import select
+import shlex
+import struct
 import subprocess
 import sys
-from dataclasses import dataclass, asdict
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field, fields, is_dataclass, replace
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import IO, Any, Callable, Dict, List, Optional, Tuple, Union, get_args, get_origin, get_type_hints
+
+
+# Usable PCIe throughput per lane in GB/s (after line encoding), by generation
+PCIE_LANE_GBPS = {1: 0.25, 2: 0.5, 3: 0.985, 4: 1.969, 5: 3.938, 6: 7.563}
+
+# Link speed as reported by sysfs (GT/s) mapped to PCIe generation
+PCIE_GTS_TO_GEN = {2.5: 1, 5.0: 2, 8.0: 3, 16.0: 4, 32.0: 5, 64.0: 6}
+
+# Ollama stores model blobs content-addressed as "sha256-<hex digest>"
+BLOB_NAME_PATTERN = re.compile(r'^sha256[-:]([0-9a-f]{64})$')
+
+# Slice size fed to the hasher from each memory-mapped blob
+HASH_CHUNK_BYTES = 64 * 1024 * 1024
+
+# Bumped whenever a serialized field is renamed, removed or changes type
+REPORT_SCHEMA_VERSION = 1
+
+OUTPUT_FORMATS = ('json', 'ndjson', 'compact')
+
+# inotify(7) event masks
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+
+WATCH_DIR_MASK = IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO | IN_CLOSE_WRITE | IN_DELETE_SELF
+WATCH_FILE_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_ATTRIB
+
+# Filesystems where every mmap page fault becomes a network round trip
+NETWORK_FILESYSTEMS = {
+    'nfs', 'nfs4', 'cifs', 'smb3', 'smbfs', '9p', 'ceph', 'glusterfs',
+    'fuse.sshfs', 'fuse.s3fs', 'fuse.rclone', 'fuse.gcsfuse', 'lustre', 'afs',
+}
+
+# Size of the buffer locked to prove mlock() works at all
+MLOCK_TRIAL_BYTES = 64 * 1024 * 1024
+
+# CAP_IPC_LOCK bit in /proc/self/status CapEff; lifts RLIMIT_MEMLOCK
+CAP_IPC_LOCK = 14
+
+# Processes read concurrently when walking the process table
+PROCESS_SCAN_WORKERS = 8
+# Largest memory consumers listed in the resource budget
+TOP_CONSUMERS = 5
+
+# Windows GetLogicalProcessorInformationEx relationship for physical cores
+RELATION_PROCESSOR_CORE = 0
+# MEMORYSTATUSEX: dwLength, dwMemoryLoad, then seven DWORDLONG byte counters
+MEMORYSTATUSEX_FORMAT = '<II7Q'
+# macOS host_statistics64 flavor and the vm_statistics64 struct it fills
+HOST_VM_INFO64 = 4
+VM_STATISTICS64_FORMAT = '=4I9Q2I4Q4IQ'
+# macOS struct statfs (64-bit inode layout): block size, counts, fsid, owner,
+# type, flags, subtype, then type name, mount point and mount source
+STATFS_FORMAT = '=2I5Q2i4I16s1024s1024s8I'
+MNT_LOCAL = 0x00001000
+MNT_NOATIME = 0x10000000
+
+# Workflows the disk forecast understands
+DISK_WORKFLOWS = ('pull', 'convert', 'convert-hf')
+# Name prefix of the temporary file --check-fallocate reserves space with
+PREALLOCATE_PREFIX = '.fallocate-check-'
+
+# Approximate bits per weight of GGUF quantizations, for deriving F16 sizes
+QUANT_BITS_PER_WEIGHT = {
+    'Q4_0': 4.55, 'Q4_K_M': 4.85, 'Q5_0': 5.54, 'Q5_K_M': 5.69,
+    'Q6_K': 6.56, 'Q8_0': 8.5, 'F16': 16.0, 'BF16': 16.0,
+}
+
+# Requirement thresholds that model and host profiles may override
+THRESHOLD_PREFIXES = ('MIN_', 'RECOMMENDED_', 'OPTIMAL_')
+
+VM_SETTINGS = ('swappiness', 'overcommit_memory', 'max_map_count', 'nr_hugepages')
+
+# Read-ahead below this makes sequential faulting of multi-GB weights slow
+MIN_READ_AHEAD_KB = 1024
 
 
 @dataclass
@@ -46,6 +137,45 @@ class MemoryInfo:
     meets_recommended: bool
 
 
+@dataclass
+class MemoryLockInfo:
+    """Memory locking and hugepage readiness for pinned model weights"""
+    memlock_limit_gb: Optional[float]  # None when unlimited
+    has_ipc_lock: bool
+    trial_lock_ok: bool
+    pinnable_gb: float
+    model_footprint_gb: float
+    can_pin_model: bool
+    hugepages_total_gb: float
+    hugepages_free_gb: float
+    thp_mode: str
+    vm_settings: Dict[str, str]
+
+
+@dataclass
+class ProcessUsage:
+    """Memory attributed to a single running process"""
+    pid: int
+    name: str
+    rss_gb: float
+    pss_gb: float  # Shared pages split between the processes mapping them
+    peak_gb: float  # PSS plus the growth back to the process's high-water mark
+    swap_gb: float
+    vram_gb: float
+
+
+@dataclass
+class ResourceBudgetInfo:
+    """RAM and VRAM held by other running workloads and what is left for the model"""
+    processes_scanned: int
+    ram_in_use_gb: float
+    ram_peak_gb: float
+    vram_in_use_gb: float
+    ram_headroom_gb: float
+    vram_headroom_gb: float
+    top_consumers: List[ProcessUsage]
+
+
 @dataclass
 class GPUInfo:
     """GPU information container"""
@@ -56,6 +186,11 @@ class GPUInfo:
     compute_capability: str
     is_available: bool
     recommended_quantization: str
+    pci_bus_id: str = "Unknown"
+    pcie_gen_current: Optional[int] = None
+    pcie_gen_max: Optional[int] = None
+    pcie_width_current: Optional[int] = None
+    pcie_width_max: Optional[int] = None
 
 
 @dataclass
@@ -65,6 +200,92 @@ class StorageInfo:
     available_gb: float
     meets_minimum: bool
     filesystem: str
+    mount_point: str = "Unknown"
+    mount_source: str = "Unknown"
+    mount_options: List[str] = field(default_factory=list)
+    is_network: bool = False
+    is_overlay: bool = False
+    compression: Optional[str] = None
+    noatime: bool = False
+    read_ahead_kb: Optional[int] = None
+    rotational: Optional[bool] = None
+
+
+@dataclass
+class OffloadPlan:
+    """Planned CPU/GPU layer split for partial offload"""
+    quantization: str
+    model_size_gb: float
+    total_layers: int
+    gpu_layers: int
+    host_resident_gb: float
+    pcie_bandwidth_gbps: Optional[float]
+    transfer_ms_per_batch: Optional[float]  # Streaming host weights for one prompt batch
+
+
+@dataclass
+class BlobVerification:
+    """Integrity check result for a single model blob"""
+    path: str
+    expected_digest: str
+    actual_digest: str
+    size_bytes: int
+    elapsed_seconds: float
+    ok: bool
+
+
+@dataclass
+class IntegrityInfo:
+    """Model blob integrity verification summary"""
+    blobs_checked: int
+    bytes_hashed: int
+    elapsed_seconds: float
+    throughput_mb_s: float
+    mismatches: List[BlobVerification]
+
+
+@dataclass
+class ModelProfile:
+    """Requirements and geometry of a model that can be deployed on a host"""
+    name: str
+    layers: int
+    sizes_gb: Dict[str, float]
+    default_quantization: str = "Q4_K_M"
+    kv_cache_gb: float = 0.0  # At the default context length
+    source_size_gb: Optional[float] = None  # Unquantized F16 weights; estimated from sizes_gb if unset
+    requirements: Optional[Dict[str, float]] = None  # MIN_*/RECOMMENDED_* overrides
+
+
+@dataclass
+class CoResidencyInfo:
+    """Combined footprint of models that should stay loaded together"""
+    models: List[str]
+    placements: Dict[str, str]
+    ram_required_gb: float
+    vram_required_gb: float
+    disk_required_gb: float
+    fits_in_memory: bool
+    fits_on_disk: bool
+
+
+@dataclass
+class DiskStage:
+    """Disk usage at one step of a model workflow"""
+    name: str
+    usage_gb: float
+
+
+@dataclass
+class DiskForecast:
+    """Peak disk usage of a model workflow against available space"""
+    workflow: str
+    quantization: str
+    keep_versions: int
+    stages: List[DiskStage]
+    peak_gb: float
+    available_gb: float
+    fits: bool
+    preallocation: str  # ok, no space, unsupported, failed or skipped
 
 
 @dataclass
@@ -78,6 +299,313 @@ class SystemReport:
     recommendations: List[str]
     warnings: List[str]
     timestamp: str
+    offload_plan: Optional[OffloadPlan] = None
+    integrity: Optional[IntegrityInfo] = None
+    co_residency: Optional[CoResidencyInfo] = None
+    memory_lock: Optional[MemoryLockInfo] = None
+    disk_forecast: Optional[DiskForecast] = None
+    resource_budget: Optional[ResourceBudgetInfo] = None
+
+
+def hash_blob(path: str, chunk_size: int = HASH_CHUNK_BYTES) -> Tuple[str, str, int, float]:
+    """
+    Compute the sha256 of a file by hashing slices of a memory map.
+
+    Slicing a memoryview over the map hands pages straight to the hasher
+    without copying them into Python bytes objects. Returns
+    (path, hex digest, size in bytes, elapsed seconds).
+    """
+    start = time.perf_counter()
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if hasattr(mm, 'madvise'):
+                    mm.madvise(mmap.MADV_SEQUENTIAL)
+                view = memoryview(mm)
+                try:
+                    for offset in range(0, size, chunk_size):
+                        digest.update(view[offset:offset + chunk_size])
+                finally:
+                    view.release()
+    return path, digest.hexdigest(), size, time.perf_counter() - start
+
+
+def estimate_source_size_gb(sizes_gb: Dict[str, float]) -> Optional[float]:
+    """Estimate F16 weight size from the largest quantization with a known bits per weight"""
+    known = [(size, quant) for quant, size in sizes_gb.items() if quant in QUANT_BITS_PER_WEIGHT]
+    if not known:
+        return None
+    size, quant = max(known)
+    return round(size * 16.0 / QUANT_BITS_PER_WEIGHT[quant], 1)
+
+
+# Report sections emitted as individual probe events
+PROBE_TYPES = {
+    'cpu': CPUInfo,
+    'memory': MemoryInfo,
+    'gpu': GPUInfo,
+    'resource_budget': ResourceBudgetInfo,
+    'memory_lock': MemoryLockInfo,
+    'storage': StorageInfo,
+    'disk_forecast': DiskForecast,
+    'integrity': IntegrityInfo,
+}
+
+
+def to_serializable(value: Any) -> Any:
+    """Recursively convert dataclasses to plain containers, sharing leaf values instead of deep-copying them like asdict"""
+    if is_dataclass(value) and not isinstance(value, type):
+        return {f.name: to_serializable(getattr(value, f.name)) for f in fields(value)}
+    if isinstance(value, (list, tuple)):
+        return [to_serializable(item) for item in value]
+    if isinstance(value, dict):
+        return {key: to_serializable(item) for key, item in value.items()}
+    return value
+
+
+def _schema_errors(cls: type, data: Any, path: str) -> List[str]:
+    """Collect mismatches between serialized data and a dataclass definition"""
+    if not isinstance(data, dict):
+        return [f"{path}: expected object"]
+
+    errors = [f"{path}.{key}: unexpected field" for key in data.keys() - {f.name for f in fields(cls)}]
+    hints = get_type_hints(cls)
+    for field in fields(cls):
+        name = f"{path}.{field.name}"
+        if field.name not in data:
+            errors.append(f"{name}: missing")
+            continue
+
+        value = data[field.name]
+        hint = hints[field.name]
+        if get_origin(hint) is Union and type(None) in get_args(hint):
+            if value is None:
+                continue
+            hint = next(arg for arg in get_args(hint) if arg is not type(None))
+
+        if is_dataclass(hint):
+            errors.extend(_schema_errors(hint, value, name))
+        elif get_origin(hint) in (list, List):
+            if not isinstance(value, list):
+                errors.append(f"{name}: expected array")
+                continue
+            item_type = get_args(hint)[0]
+            for index, item in enumerate(value):
+                if is_dataclass(item_type):
+                    errors.extend(_schema_errors(item_type, item, f"{name}[{index}]"))
+                elif not isinstance(item, item_type):
+                    errors.append(f"{name}[{index}]: expected {item_type.__name__}")
+        elif hint is float:
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                errors.append(f"{name}: expected number")
+        elif hint is int and (isinstance(value, bool) or not isinstance(value, int)):
+            errors.append(f"{name}: expected integer")
+        elif hint in (str, bool) and not isinstance(value, hint):
+            errors.append(f"{name}: expected {hint.__name__}")
+    return errors
+
+
+def validate_report_schema(data: Dict[str, Any]) -> None:
+    """Validate a serialized report against the current schema version"""
+    if data.get('schema_version') != REPORT_SCHEMA_VERSION:
+        raise ValueError(f"Unsupported report schema version: {data.get('schema_version')}")
+    body = {key: value for key, value in data.items() if key != 'schema_version'}
+    errors = _schema_errors(SystemReport, body, 'report')
+    if errors:
+        raise ValueError("Report does not match schema: " + "; ".join(errors))
+
+
+def _from_serializable(hint: Any, value: Any) -> Any:
+    """Rebuild a value of the given type hint from plain containers"""
+    if value is None:
+        return None
+    if get_origin(hint) is Union:
+        hint = next(arg for arg in get_args(hint) if arg is not type(None))
+    if is_dataclass(hint):
+        field_hints = get_type_hints(hint)
+        return hint(**{
+            f.name: _from_serializable(field_hints[f.name], value[f.name])
+            for f in fields(hint) if f.name in value
+        })
+    if get_origin(hint) in (list, List):
+        return [_from_serializable(get_args(hint)[0], item) for item in value]
+    return value
+
+
+def report_from_dict(data: Dict[str, Any]) -> 'SystemReport':
+    """Rebuild a SystemReport from its serialized, schema-validated form"""
+    validate_report_schema(data)
+    return _from_serializable(SystemReport, {k: v for k, v in data.items() if k != 'schema_version'})
+
+
+def pack_compact(value: Any) -> bytes:
+    """Encode plain containers in the MessagePack binary format"""
+    out = bytearray()
+
+    def pack(item: Any) -> None:
+        if item is None:
+            out.append(0xc0)
+        elif item is True:
+            out.append(0xc3)
+        elif item is False:
+            out.append(0xc2)
+        elif isinstance(item, int):
+            if 0 <= item < 0x80:
+                out.append(item)
+            elif -32 <= item < 0:
+                out.append(item & 0xff)
+            elif 0 <= item <= 0xffffffff:
+                out.extend(struct.pack('>BI', 0xce, item))
+            elif item > 0:
+                out.extend(struct.pack('>BQ', 0xcf, item))
+            elif item >= -0x80000000:
+                out.extend(struct.pack('>Bi', 0xd2, item))
+            else:
+                out.extend(struct.pack('>Bq', 0xd3, item))
+        elif isinstance(item, float):
+            out.extend(struct.pack('>Bd', 0xcb, item))
+        elif isinstance(item, str):
+            encoded = item.encode('utf-8')
+            if len(encoded) < 32:
+                out.append(0xa0 | len(encoded))
+            elif len(encoded) <= 0xff:
+                out.extend(struct.pack('>BB', 0xd9, len(encoded)))
+            elif len(encoded) <= 0xffff:
+                out.extend(struct.pack('>BH', 0xda, len(encoded)))
+            else:
+                out.extend(struct.pack('>BI', 0xdb, len(encoded)))
+            out.extend(encoded)
+        elif isinstance(item, (list, tuple)):
+            if len(item) < 16:
+                out.append(0x90 | len(item))
+            elif len(item) <= 0xffff:
+                out.extend(struct.pack('>BH', 0xdc, len(item)))
+            else:
+                out.extend(struct.pack('>BI', 0xdd, len(item)))
+            for element in item:
+                pack(element)
+        elif isinstance(item, dict):
+            if len(item) < 16:
+                out.append(0x80 | len(item))
+            elif len(item) <= 0xffff:
+                out.extend(struct.pack('>BH', 0xde, len(item)))
+            else:
+                out.extend(struct.pack('>BI', 0xdf, len(item)))
+            for key, element in item.items():
+                pack(key)
+                pack(element)
+        else:
+            raise TypeError(f"Cannot encode {type(item).__name__}")
+
+    pack(value)
+    return bytes(out)
+
+
+class NDJSONWriter:
+    """Writes report events as newline-delimited JSON, flushing each line"""
+
+    def __init__(self, stream: IO[str]):
+        self.stream = stream
+
+    def emit(self, event: Dict[str, Any]) -> None:
+        self.stream.write(json.dumps(event, separators=(',', ':')) + "\n")
+        self.stream.flush()
+
+    def emit_probe(self, probe: str, result: Any) -> None:
+        """Emit a single probe result; usable as validate()'s on_probe callback"""
+        data = to_serializable(result)
+        if data is not None:
+            errors = _schema_errors(PROBE_TYPES[probe], data, probe)
+            if errors:
+                raise ValueError("Probe does not match schema: " + "; ".join(errors))
+        self.emit({'schema_version': REPORT_SCHEMA_VERSION, 'type': 'probe', 'probe': probe, 'data': data})
+
+    def emit_summary(self, report: 'SystemReport') -> None:
+        """Emit everything in the report that is not a probe section"""
+        data = {
+            f.name: to_serializable(getattr(report, f.name))
+            for f in fields(report) if f.name not in PROBE_TYPES
+        }
+        self.emit({'schema_version': REPORT_SCHEMA_VERSION, 'type': 'summary', 'data': data})
+
+
+def parse_mountinfo(text: str) -> List[Dict[str, Any]]:
+    """Parse /proc/self/mountinfo into one dict per mount, in mount order"""
+    def unescape(value: str) -> str:
+        # Spaces, tabs, newlines and backslashes are octal-escaped
+        return re.sub(r'\\([0-7]{3})', lambda m: chr(int(m.group(1), 8)), value)
+
+    mounts = []
+    for line in text.splitlines():
+        parts = line.split()
+        if '-' not in parts:
+            continue
+        separator = parts.index('-')
+        if separator < 6 or len(parts) < separator + 3:
+            continue
+        mounts.append({
+            'device': parts[2],
+            'mount_point': unescape(parts[4]),
+            'mount_options': parts[5].split(','),
+            'fstype': parts[separator + 1],
+            'source': unescape(parts[separator + 2]),
+            'super_options': parts[separator + 3].split(',') if len(parts) > separator + 3 else [],
+        })
+    return mounts
+
+
+class InotifyWatcher:
+    """Minimal inotify(7) binding over ctypes, blocking in select() between events"""
+
+    EVENT_HEADER = struct.Struct('iIII')
+
+    def __init__(self):
+        import ctypes
+
+        if platform.system() != "Linux":
+            raise OSError("inotify is only available on Linux")
+        self._libc = ctypes.CDLL(None, use_errno=True)
+        self.fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        self.paths: Dict[int, str] = {}
+
+    def add(self, path: str, mask: int) -> Optional[int]:
+        """Watch a path, returning the watch descriptor or None if it cannot be watched"""
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            return None
+        self.paths[wd] = path
+        return wd
+
+    def read(self, timeout: Optional[float] = None) -> List[Tuple[str, int, str]]:
+        """Wait for events and return them as (watched path, mask, name) tuples"""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+
+        events = []
+        offset = 0
+        while offset + self.EVENT_HEADER.size <= len(data):
+            wd, mask, _, length = self.EVENT_HEADER.unpack_from(data, offset)
+            offset += self.EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b'\0').decode(errors='replace')
+            offset += length
+            if wd in self.paths:
+                events.append((self.paths[wd], mask, name))
+            if mask & IN_IGNORED:
+                self.paths.pop(wd, None)
+        return events
+
+    def close(self) -> None:
+        os.close(self.fd)
 
 
 class SystemValidator:
@@ -93,9 +621,194 @@ class SystemValidator:
     RECOMMENDED_VRAM_GB = 24
     OPTIMAL_VRAM_GB = 32  # For Q6_K full offload
 
-    def __init__(self, target_dir: str = "."):
-        """Initialize validator with target directory for storage check"""
+    # Model geometry used for offload planning (Llama 3 70B)
+    MODEL_LAYERS = 80
+    MODEL_SIZE_GB = {"Q4_K_M": 42.5, "Q5_K_M": 49.9, "Q6_K": 57.9, "Q8_0": 75.0}
+    DEFAULT_QUANTIZATION = "Q4_K_M"
+    SOURCE_SIZE_GB = 141.1  # F16 weights, input to requantization
+    VRAM_RESERVED_GB = 2.0  # CUDA context, KV cache and scratch buffers
+
+    # Bandwidth assumed for throughput estimates when a profile gives none (GB/s)
+    DEFAULT_RAM_BANDWIDTH_GBPS = 60.0
+    DEFAULT_VRAM_BANDWIDTH_GBPS = 900.0
+    HOST_RESERVED_GB = 4.0  # OS and Ollama runtime
+    TARGET_TOKENS_PER_S = 5.0  # Interactive chat floor when picking a quantization
+
+    SYSFS_PCI_DEVICES = Path('/sys/bus/pci/devices')
+    SYSFS_DEV_BLOCK = Path('/sys/dev/block')
+    PROC_MOUNTINFO = Path('/proc/self/mountinfo')
+    PROC_DIR = Path('/proc')
+    PROC_SELF_STATUS = Path('/proc/self/status')
+    PROC_SYS_VM = Path('/proc/sys/vm')
+    SYSFS_HUGEPAGES = Path('/sys/kernel/mm/hugepages')
+    SYSFS_THP_ENABLED = Path('/sys/kernel/mm/transparent_hugepage/enabled')
+
+    def __init__(
+        self,
+        target_dir: str = ".",
+        model: Optional[ModelProfile] = None,
+        co_resident: Optional[List[Tuple[ModelProfile, str]]] = None,
+        use_mlock: bool = False,
+        disk_plan: Optional[Tuple[str, str, int]] = None,
+        check_fallocate: bool = False,
+        budget_workloads: bool = False
+    ):
+        """
+        Initialize validator with target directory for storage check.
+
+        model replaces the built-in 70B requirements and geometry; co_resident
+        lists (model, quantization) pairs that must stay loaded together;
+        use_mlock turns memory locking shortfalls into warnings. disk_plan is
+        a (workflow, quantization, versions kept) tuple to forecast disk usage
+        for, and check_fallocate tries to preallocate its peak. budget_workloads
+        plans against the RAM and VRAM left over by other running processes.
+        """
         self.target_dir = Path(target_dir).resolve()
+        self.co_resident = co_resident or []
+        self.use_mlock = use_mlock
+        self.disk_plan = disk_plan
+        self.check_fallocate = check_fallocate
+        self.budget_workloads = budget_workloads
+        if model is not None:
+            self.MODEL_LAYERS = model.layers
+            self.MODEL_SIZE_GB = dict(model.sizes_gb)
+            self.DEFAULT_QUANTIZATION = model.default_quantization
+            # None when unknown; convert workflows are then rejected
+            self.SOURCE_SIZE_GB = model.source_size_gb or estimate_source_size_gb(model.sizes_gb)
+            self.apply_thresholds(model.requirements or {}, model.name)
+        # Verified blobs keyed by path, reused while (size, mtime) are unchanged
+        self._blob_cache: Dict[str, Tuple[int, int, BlobVerification]] = {}
+        # kernel32 or libSystem, loaded on first use and shared by all probes
+        self._native_lib: Any = None
+        self._mach_host: Optional[int] = None
+        self._rendered: Optional[Tuple[SystemReport, 'ReportRenderer']] = None
+
+    @staticmethod
+    def check_thresholds(overrides: Dict[str, Any], source: str) -> None:
+        """Raise ValueError unless every override is a number for a MIN_*/RECOMMENDED_*/OPTIMAL_* threshold"""
+        if not isinstance(overrides, dict):
+            raise ValueError(f"Thresholds in {source} must be a table of names to numbers")
+        for name, value in overrides.items():
+            if not name.startswith(THRESHOLD_PREFIXES) or not isinstance(getattr(SystemValidator, name, None), (int, float)):
+                raise ValueError(f"Unknown threshold in {source}: {name}")
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                raise ValueError(f"Threshold {name} in {source} must be a number, not {value!r}")
+
+    def apply_thresholds(self, overrides: Dict[str, float], source: str) -> None:
+        """Override MIN_*/RECOMMENDED_*/OPTIMAL_* class thresholds on this instance"""
+        self.check_thresholds(overrides, source)
+        for name, value in overrides.items():
+            setattr(self, name, value)
+
+    def _native(self) -> Any:
+        """Load the platform's system library once (kernel32 on Windows, libSystem on macOS)"""
+        if self._native_lib is None:
+            import ctypes
+
+            if platform.system() == "Windows":
+                self._native_lib = ctypes.WinDLL('kernel32', use_last_error=True)
+            else:
+                import ctypes.util
+
+                self._native_lib = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        return self._native_lib
+
+    def _sysctl(self, name: str) -> bytes:
+        """Read a raw sysctl value with sysctlbyname, without forking sysctl(8)"""
+        import ctypes
+
+        lib = self._native()
+        size = ctypes.c_size_t(0)
+        if lib.sysctlbyname(name.encode(), None, ctypes.byref(size), None, ctypes.c_size_t(0)) != 0:
+            raise OSError(ctypes.get_errno(), f"sysctlbyname({name}) failed")
+        buffer = ctypes.create_string_buffer(size.value)
+        if lib.sysctlbyname(name.encode(), buffer, ctypes.byref(size), None, ctypes.c_size_t(0)) != 0:
+            raise OSError(ctypes.get_errno(), f"sysctlbyname({name}) failed")
+        return buffer.raw[:size.value]
+
+    def _sysctl_int(self, name: str) -> int:
+        # Integer sysctls are 4 or 8 bytes wide depending on the name
+        return int.from_bytes(self._sysctl(name), sys.byteorder)
+
+    def _sysctl_string(self, name: str) -> str:
+        return self._sysctl(name).split(b'\0', 1)[0].decode().strip()
+
+    def _mach_available_bytes(self) -> int:
+        """Free plus inactive (reclaimable) memory from host_statistics64, as vm_stat counts it"""
+        import ctypes
+
+        lib = self._native()
+        if self._mach_host is None:
+            # Each mach_host_self() call adds a port reference, so keep one
+            self._mach_host = lib.mach_host_self()
+
+        page_size = ctypes.c_size_t(0)
+        if lib.host_page_size(self._mach_host, ctypes.byref(page_size)) != 0:
+            raise OSError("host_page_size failed")
+        buffer = ctypes.create_string_buffer(struct.calcsize(VM_STATISTICS64_FORMAT))
+        count = ctypes.c_uint32(len(buffer) // 4)  # In natural_t units
+        if lib.host_statistics64(self._mach_host, HOST_VM_INFO64, buffer, ctypes.byref(count)) != 0:
+            raise OSError("host_statistics64 failed")
+
+        stats = struct.unpack_from(VM_STATISTICS64_FORMAT, buffer.raw)
+        free_count, inactive_count, speculative_count = stats[0], stats[2], stats[14]
+        # free_count includes speculative pages, which vm_stat reports separately
+        return (free_count - speculative_count + inactive_count) * page_size.value
+
+    def _windows_memory_status(self) -> Tuple[int, int]:
+        """Return (total, available) physical memory in bytes from GlobalMemoryStatusEx"""
+        import ctypes
+
+        buffer = ctypes.create_string_buffer(struct.calcsize(MEMORYSTATUSEX_FORMAT))
+        struct.pack_into('<I', buffer, 0, len(buffer))  # dwLength
+        if not self._native().GlobalMemoryStatusEx(buffer):
+            raise OSError("GlobalMemoryStatusEx failed")
+        status = struct.unpack_from(MEMORYSTATUSEX_FORMAT, buffer.raw)
+        return status[2], status[3]  # ullTotalPhys, ullAvailPhys
+
+    def _windows_processor_counts(self) -> Tuple[int, int]:
+        """Count physical cores and logical processors with GetLogicalProcessorInformationEx"""
+        import ctypes
+
+        lib = self._native()
+        length = ctypes.c_uint32(0)
+        # The first call only reports the buffer size needed
+        lib.GetLogicalProcessorInformationEx(RELATION_PROCESSOR_CORE, None, ctypes.byref(length))
+        buffer = ctypes.create_string_buffer(length.value)
+        if not lib.GetLogicalProcessorInformationEx(RELATION_PROCESSOR_CORE, buffer, ctypes.byref(length)):
+            raise OSError("GetLogicalProcessorInformationEx failed")
+
+        # Each record: Relationship, Size, then PROCESSOR_RELATIONSHIP whose
+        # GroupCount sits at byte 30 and GROUP_AFFINITY array starts at byte 32
+        pointer_size = struct.calcsize('P')
+        mask_format = '<Q' if pointer_size == 8 else '<I'
+        raw = buffer.raw[:length.value]
+        cores = threads = 0
+        offset = 0
+        while offset + 8 <= len(raw):
+            relationship, size = struct.unpack_from('<II', raw, offset)
+            if not size:
+                break
+            if relationship == RELATION_PROCESSOR_CORE:
+                cores += 1
+                group_count = struct.unpack_from('<H', raw, offset + 30)[0]
+                for group in range(group_count):
+                    mask = struct.unpack_from(mask_format, raw, offset + 32 + group * (pointer_size + 8))[0]
+                    threads += bin(mask).count('1')
+            offset += size
+        return cores, threads or cores
+
+    def _windows_cpu_model(self) -> str:
+        """Read the processor brand string from the registry"""
+        try:
+            import winreg
+
+            with winreg.OpenKey(
+                winreg.HKEY_LOCAL_MACHINE, r"HARDWARE\DESCRIPTION\System\CentralProcessor\0"
+            ) as key:
+                return str(winreg.QueryValueEx(key, "ProcessorNameString")[0]).strip()
+        except (ImportError, OSError):
+            return "Unknown"
 
     def get_cpu_info(self) -> CPUInfo:
         """Retrieve CPU information"""
@@ -110,6 +823,9 @@ class SystemValidator:
 
                 # Get core and thread count
                 cores = int(subprocess.check_output(['nproc', '--all']).decode().strip())
+                cpu_limit = self._cgroup_cpu_limit()
+                if cpu_limit is not None:
+                    cores = min(cores, cpu_limit)
 
                 # Get threads (logical CPUs)
                 threads = cores  # nproc returns logical CPUs
@@ -119,19 +835,14 @@ class SystemValidator:
                 arch = platform.machine()
 
             elif platform.system() == "Windows":
-                # Windows implementation
-                import wmi
-                w = wmi.WMI()
-                cpu = w.Win32_Processor()[0]
-                model = cpu.Name
-                cores = cpu.NumberOfCores
-                threads = cpu.NumberOfLogicalProcessors
+                model = self._windows_cpu_model()
+                cores, threads = self._windows_processor_counts()
                 arch = platform.machine()
 
             else:  # macOS
-                model = subprocess.check_output(['sysctl', '-n', 'machdep.cpu.brand_string']).decode().strip()
-                cores = int(subprocess.check_output(['sysctl', '-n', 'hw.physicalcpu']).decode().strip())
-                threads = int(subprocess.check_output(['sysctl', '-n', 'hw.logicalcpu']).decode().strip())
+                model = self._sysctl_string('machdep.cpu.brand_string')
+                cores = self._sysctl_int('hw.physicalcpu')
+                threads = self._sysctl_int('hw.logicalcpu')
                 arch = platform.machine()
 
             return CPUInfo(
@@ -164,24 +875,28 @@ class SystemValidator:
                 total_kb = int([line for line in meminfo.split('\n') if 'MemTotal' in line][0].split()[1])
                 available_kb = int([line for line in meminfo.split('\n') if 'MemAvailable' in line][0].split()[1])
 
+                # A container sees the host's meminfo; its cgroup limit is what it can use
+                limit_bytes, usage_bytes = self._cgroup_memory_limit()
+                if limit_bytes is not None:
+                    total_kb = min(total_kb, limit_bytes // 1024)
+                    if usage_bytes is not None:
+                        available_kb = min(available_kb, max(limit_bytes - usage_bytes, 0) // 1024)
+
                 total_gb = total_kb / (1024 ** 2)
                 available_gb = available_kb / (1024 ** 2)
 
             elif platform.system() == "Windows":
-                import wmi
-                w = wmi.WMI()
-                os_info = w.Win32_OperatingSystem()[0]
-                total_bytes = int(os_info.TotalVisibleMemorySize) * 1024
-                available_bytes = int(os_info.FreePhysicalMemory) * 1024
+                total_bytes, available_bytes = self._windows_memory_status()
 
                 total_gb = total_bytes / (1024 ** 3)
                 available_gb = available_bytes / (1024 ** 3)
 
             else:  # macOS
-                total_bytes = int(subprocess.check_output(['sysctl', '-n', 'hw.memsize']).decode().strip())
-                # Note: Getting available memory on macOS is more complex
+                total_bytes = self._sysctl_int('hw.memsize')
+                available_bytes = self._mach_available_bytes()
+
                 total_gb = total_bytes / (1024 ** 3)
-                available_gb = total_gb * 0.7  # Estimate
+                available_gb = available_bytes / (1024 ** 3)
 
             return MemoryInfo(
                 total_gb=round(total_gb, 2),
@@ -199,23 +914,247 @@ class SystemValidator:
                 meets_recommended=False
             )
 
+    def pin_footprint_gb(self, gpu: Optional[GPUInfo], budget: Optional[ResourceBudgetInfo] = None) -> float:
+        """Host-resident weights that use_mlock would pin, per the offload planner"""
+        if gpu is None:
+            return self.MODEL_SIZE_GB[self.DEFAULT_QUANTIZATION]
+        return self.plan_offload(gpu, budget=budget).host_resident_gb
+
+    def _trial_mlock(self, size: int) -> bool:
+        """Lock and unlock an anonymous buffer of the given size"""
+        import ctypes
+
+        libc = ctypes.CDLL(None, use_errno=True)
+        buffer = mmap.mmap(-1, size)
+        try:
+            anchor = ctypes.c_char.from_buffer(buffer)
+            try:
+                address = ctypes.c_void_p(ctypes.addressof(anchor))
+                if libc.mlock(address, ctypes.c_size_t(size)) != 0:
+                    return False
+                libc.munlock(address, ctypes.c_size_t(size))
+                return True
+            finally:
+                del anchor
+        finally:
+            buffer.close()
+
+    def get_memory_lock_info(self, footprint_gb: float, available_gb: float) -> Optional[MemoryLockInfo]:
+        """Check how much memory can be pinned with mlock and hugepages (Linux only)"""
+        if platform.system() != "Linux":
+            return None
+        try:
+            import resource
+
+            soft_limit, _ = resource.getrlimit(resource.RLIMIT_MEMLOCK)
+            unlimited = soft_limit == resource.RLIM_INFINITY
+            memlock_limit_gb = None if unlimited else soft_limit / (1024 ** 3)
+
+            has_ipc_lock = False
+            try:
+                for line in self.PROC_SELF_STATUS.read_text().splitlines():
+                    if line.startswith('CapEff:'):
+                        has_ipc_lock = bool(int(line.split()[1], 16) >> CAP_IPC_LOCK & 1)
+            except (OSError, ValueError, IndexError):
+                pass
+
+            # Stay within the limit so the trial tests mlock itself, not the limit
+            trial_size = MLOCK_TRIAL_BYTES
+            if not unlimited and not has_ipc_lock:
+                trial_size = min(trial_size, soft_limit)
+            trial_lock_ok = trial_size > 0 and self._trial_mlock(trial_size)
+
+            if not trial_lock_ok:
+                pinnable_gb = 0.0
+            elif unlimited or has_ipc_lock:
+                pinnable_gb = available_gb
+            else:
+                pinnable_gb = min(memlock_limit_gb, available_gb)
+
+            hugepages_total_gb = 0.0
+            hugepages_free_gb = 0.0
+            if self.SYSFS_HUGEPAGES.is_dir():
+                for pool in self.SYSFS_HUGEPAGES.iterdir():
+                    # e.g. hugepages-2048kB
+                    try:
+                        page_kb = int(pool.name.split('-')[1].rstrip('kB'))
+                        total = int((pool / 'nr_hugepages').read_text())
+                        free = int((pool / 'free_hugepages').read_text())
+                    except (OSError, ValueError, IndexError):
+                        continue
+                    hugepages_total_gb += total * page_kb / (1024 ** 2)
+                    hugepages_free_gb += free * page_kb / (1024 ** 2)
+
+            try:
+                # "always [madvise] never" -> madvise
+                thp_mode = re.search(r'\[(\w+)\]', self.SYSFS_THP_ENABLED.read_text()).group(1)
+            except (OSError, AttributeError):
+                thp_mode = "Unknown"
+
+            vm_settings = {}
+            for name in VM_SETTINGS:
+                try:
+                    vm_settings[name] = (self.PROC_SYS_VM / name).read_text().strip()
+                except OSError:
+                    continue
+
+            return MemoryLockInfo(
+                memlock_limit_gb=round(memlock_limit_gb, 3) if memlock_limit_gb is not None else None,
+                has_ipc_lock=has_ipc_lock,
+                trial_lock_ok=trial_lock_ok,
+                pinnable_gb=round(pinnable_gb, 2),
+                model_footprint_gb=round(footprint_gb, 2),
+                can_pin_model=pinnable_gb >= footprint_gb,
+                hugepages_total_gb=round(hugepages_total_gb, 2),
+                hugepages_free_gb=round(hugepages_free_gb, 2),
+                thp_mode=thp_mode,
+                vm_settings=vm_settings
+            )
+
+        except Exception as e:
+            print(f"Warning: Could not get memory lock info: {e}", file=sys.stderr)
+            return None
+
+    def read_process_usage(self, pid: int) -> Optional[ProcessUsage]:
+        """Read a process's resident, proportional and peak memory from procfs"""
+        proc_dir = self.PROC_DIR / str(pid)
+        status = {}
+        try:
+            with open(proc_dir / 'status', 'r') as f:
+                for line in f:
+                    key, _, value = line.partition(':')
+                    if key == 'Name':
+                        status[key] = value.strip()
+                    elif key in ('VmRSS', 'VmHWM', 'VmSwap'):
+                        status[key] = int(value.split()[0])
+        except (OSError, ValueError, IndexError):
+            # Exited between listing and reading
+            return None
+        if 'VmRSS' not in status:
+            # Kernel threads have no user address space
+            return None
+
+        rss_kb = status['VmRSS']
+        pss_kb = rss_kb
+        try:
+            with open(proc_dir / 'smaps_rollup', 'r') as f:
+                for line in f:
+                    if line.startswith('Pss:'):
+                        pss_kb = int(line.split()[1])
+                        break
+        except (OSError, ValueError, IndexError):
+            # Other users' processes need ptrace access; count shared pages in full
+            pass
+        peak_kb = pss_kb + max(status.get('VmHWM', rss_kb) - rss_kb, 0)
+
+        return ProcessUsage(
+            pid=pid,
+            name=status.get('Name', "Unknown"),
+            rss_gb=rss_kb / (1024 ** 2),
+            pss_gb=pss_kb / (1024 ** 2),
+            peak_gb=peak_kb / (1024 ** 2),
+            swap_gb=status.get('VmSwap', 0) / (1024 ** 2),
+            vram_gb=0.0
+        )
+
+    def get_gpu_process_memory(self) -> Dict[int, Tuple[str, float]]:
+        """Map pid to (process name, VRAM in GB) for NVIDIA compute apps"""
+        try:
+            result = subprocess.run(
+                ['nvidia-smi', '--query-compute-apps=pid,process_name,used_memory',
+                 '--format=csv,noheader,nounits'],
+                capture_output=True,
+                text=True,
+                check=True
+            )
+        except (OSError, subprocess.CalledProcessError):
+            return {}
+
+        usage: Dict[int, Tuple[str, float]] = {}
+        for line in result.stdout.strip().splitlines():
+            try:
+                pid, rest = line.split(', ', 1)
+                name, used_mb = rest.rsplit(', ', 1)
+                pid, vram_gb = int(pid), float(used_mb) / 1024
+            except ValueError:
+                # e.g. "[N/A]" memory on GPUs without per-process accounting
+                continue
+            # A process can hold memory on several GPUs
+            usage[pid] = (name, usage.get(pid, (name, 0.0))[1] + vram_gb)
+        return usage
+
+    def get_resource_budget(self, memory: MemoryInfo, gpu: Optional[GPUInfo]) -> Optional[ResourceBudgetInfo]:
+        """
+        Attribute RAM and VRAM held by other running processes (Linux only).
+
+        The process table is listed once and processes are read on a bounded
+        thread pool, since reading smaps_rollup makes the kernel walk each
+        process's page tables. RAM is budgeted at each process's high-water
+        mark, so services that shrank since their last peak keep their share.
+        """
+        if platform.system() != "Linux":
+            return None
+        try:
+            own_pid = os.getpid()
+            pids = [int(entry.name) for entry in os.scandir(self.PROC_DIR) if entry.name.isdigit()]
+            with ThreadPoolExecutor(max_workers=PROCESS_SCAN_WORKERS) as pool:
+                usages = {
+                    usage.pid: usage for usage in pool.map(self.read_process_usage, pids)
+                    if usage is not None and usage.pid != own_pid
+                }
+
+            for pid, (name, vram_gb) in (self.get_gpu_process_memory() if gpu else {}).items():
+                if pid == own_pid:
+                    continue
+                if pid in usages:
+                    usages[pid].vram_gb = vram_gb
+                else:
+                    # Processes in other PID namespaces are only visible to the driver
+                    usages[pid] = ProcessUsage(pid, name, 0.0, 0.0, 0.0, 0.0, vram_gb)
+
+            ram_peak_gb = sum(usage.peak_gb for usage in usages.values())
+            vram_in_use_gb = sum(usage.vram_gb for usage in usages.values())
+            top = sorted(usages.values(), key=lambda usage: usage.peak_gb + usage.vram_gb, reverse=True)
+
+            return ResourceBudgetInfo(
+                processes_scanned=len(pids),
+                ram_in_use_gb=round(sum(usage.pss_gb for usage in usages.values()), 2),
+                ram_peak_gb=round(ram_peak_gb, 2),
+                vram_in_use_gb=round(vram_in_use_gb, 2),
+                ram_headroom_gb=round(max(memory.total_gb - self.HOST_RESERVED_GB - ram_peak_gb, 0), 2),
+                vram_headroom_gb=round(max(gpu.vram_gb - self.VRAM_RESERVED_GB - vram_in_use_gb, 0), 2) if gpu else 0.0,
+                top_consumers=[
+                    ProcessUsage(**{
+                        f.name: round(getattr(usage, f.name), 2) if f.type is float else getattr(usage, f.name)
+                        for f in fields(usage)
+                    })
+                    for usage in top[:TOP_CONSUMERS]
+                ]
+            )
+
+        except Exception as e:
+            print(f"Warning: Could not get resource budget: {e}", file=sys.stderr)
+            return None
+
     def get_gpu_info(self) -> Optional[GPUInfo]:
         """Retrieve NVIDIA GPU information"""
         try:
             # Check if nvidia-smi is available
             result = subprocess.run(
-                ['nvidia-smi', '--query-gpu=name,memory.total,driver_version',
+                ['nvidia-smi', '--query-gpu=name,memory.total,driver_version,pci.bus_id',
                  '--format=csv,noheader,nounits'],
                 capture_output=True,
                 text=True,
                 check=True
             )
 
-            gpu_data = result.stdout.strip().split(', ')
+            # One line per GPU; the report describes the first one
+            gpu_data = result.stdout.strip().splitlines()[0].split(', ')
             name = gpu_data[0]
             vram_mb = float(gpu_data[1])
             vram_gb = round(vram_mb / 1024, 2)
             driver_version = gpu_data[2]
+            bus_id = gpu_data[3] if len(gpu_data) > 3 else None
 
             # Get CUDA version
             cuda_result = subprocess.run(
@@ -235,19 +1174,12 @@ class SystemValidator:
                     text=True,
                     check=True
                 )
-                compute_capability = nvcc_result.stdout.strip()
+                compute_capability = nvcc_result.stdout.strip().splitlines()[0]
             except:
                 compute_capability = "Unknown"
 
-            # Determine recommended quantization based on VRAM
-            if vram_gb >= self.OPTIMAL_VRAM_GB:
-                recommended_quant = "Q6_K or Q8_0 (full GPU offload)"
-            elif vram_gb >= self.RECOMMENDED_VRAM_GB:
-                recommended_quant = "Q5_K_M (full GPU offload)"
-            elif vram_gb >= self.MIN_VRAM_GB:
-                recommended_quant = "Q4_K_M (partial GPU offload)"
-            else:
-                recommended_quant = "Q4_K_M (CPU-heavy, limited GPU)"
+            recommended_quant = self.recommend_quantization(vram_gb)
+            link = self.get_pcie_link_info(bus_id)
 
             return GPUInfo(
                 name=name,
@@ -256,7 +1188,8 @@ class SystemValidator:
                 driver_version=driver_version,
                 compute_capability=compute_capability,
                 is_available=True,
-                recommended_quantization=recommended_quant
+                recommended_quantization=recommended_quant,
+                **link
             )
 
         except subprocess.CalledProcessError:
@@ -266,6 +1199,478 @@ class SystemValidator:
             print(f"Warning: Could not get GPU info: {e}", file=sys.stderr)
             return None
 
+    def quantization_tiers(self) -> Tuple[str, str, str]:
+        """
+        Name the model's quantizations for the optimal, recommended and minimum VRAM tiers.
+
+        The optimal tier offers the two largest quantizations, the recommended
+        tier the next largest that is not smaller than the default, and the
+        minimum tier the model's default quantization.
+        """
+        ranked = sorted(self.MODEL_SIZE_GB, key=self.MODEL_SIZE_GB.get, reverse=True)
+        optimal = " or ".join(reversed(ranked[:2]))
+        default_gb = self.MODEL_SIZE_GB[self.DEFAULT_QUANTIZATION]
+        candidates = [quant for quant in ranked[2:] if self.MODEL_SIZE_GB[quant] >= default_gb]
+        recommended = candidates[0] if candidates else self.DEFAULT_QUANTIZATION
+        return optimal, recommended, self.DEFAULT_QUANTIZATION
+
+    def recommend_quantization(self, vram_gb: float) -> str:
+        """Determine recommended quantization based on VRAM"""
+        optimal, recommended, minimum = self.quantization_tiers()
+        if vram_gb >= self.OPTIMAL_VRAM_GB:
+            return f"{optimal} (full GPU offload)"
+        elif vram_gb >= self.RECOMMENDED_VRAM_GB:
+            return f"{recommended} (full GPU offload)"
+        elif vram_gb >= self.MIN_VRAM_GB:
+            return f"{minimum} (partial GPU offload)"
+        else:
+            return f"{minimum} (CPU-heavy, limited GPU)"
+
+    def _find_pci_device(self, bus_id: Optional[str]) -> Optional[Path]:
+        """Locate the sysfs directory of the GPU, by bus id or first NVIDIA display device"""
+        if bus_id:
+            # nvidia-smi reports an 8-digit domain ("00000000:01:00.0"), sysfs uses 4
+            parts = bus_id.strip().lower().split(':')
+            if len(parts) == 3:
+                device_dir = self.SYSFS_PCI_DEVICES / f"{parts[0][-4:]}:{parts[1]}:{parts[2]}"
+                if device_dir.is_dir():
+                    return device_dir
+
+        if not self.SYSFS_PCI_DEVICES.is_dir():
+            return None
+
+        for device_dir in sorted(self.SYSFS_PCI_DEVICES.iterdir()):
+            try:
+                vendor = (device_dir / 'vendor').read_text().strip()
+                device_class = (device_dir / 'class').read_text().strip()
+            except OSError:
+                continue
+            # 0x10de = NVIDIA, class 0x03xxxx = display controller
+            if vendor == '0x10de' and device_class.startswith('0x03'):
+                return device_dir
+        return None
+
+    def get_pcie_link_info(self, bus_id: Optional[str] = None) -> Dict[str, object]:
+        """Read PCIe link generation and width (current and max) from sysfs"""
+        link = {
+            'pci_bus_id': bus_id.strip() if bus_id else "Unknown",
+            'pcie_gen_current': None,
+            'pcie_gen_max': None,
+            'pcie_width_current': None,
+            'pcie_width_max': None,
+        }
+
+        device_dir = self._find_pci_device(bus_id)
+        if device_dir is None:
+            return link
+        link['pci_bus_id'] = device_dir.name
+
+        def read_speed(name: str) -> Optional[int]:
+            try:
+                # e.g. "32.0 GT/s PCIe"
+                gts = float((device_dir / name).read_text().split()[0])
+            except (OSError, ValueError, IndexError):
+                return None
+            return PCIE_GTS_TO_GEN.get(gts)
+
+        def read_width(name: str) -> Optional[int]:
+            try:
+                width = int((device_dir / name).read_text().strip())
+            except (OSError, ValueError):
+                return None
+            return width or None
+
+        link['pcie_gen_current'] = read_speed('current_link_speed')
+        link['pcie_gen_max'] = read_speed('max_link_speed')
+        link['pcie_width_current'] = read_width('current_link_width')
+        link['pcie_width_max'] = read_width('max_link_width')
+        return link
+
+    @staticmethod
+    def pcie_bandwidth_gbps(gen: Optional[int], width: Optional[int]) -> Optional[float]:
+        """Usable host-to-device bandwidth in GB/s for a link, if known"""
+        if gen not in PCIE_LANE_GBPS or not width:
+            return None
+        return round(PCIE_LANE_GBPS[gen] * width, 2)
+
+    def plan_offload(
+        self,
+        gpu: GPUInfo,
+        quantization: Optional[str] = None,
+        budget: Optional[ResourceBudgetInfo] = None
+    ) -> OffloadPlan:
+        """
+        Plan the CPU/GPU layer split for a quantization and estimate PCIe cost.
+
+        The transfer estimate is the time to move all host-resident weights
+        across the link once. llama.cpp does this per batch during prompt
+        processing; during generation the CPU-resident layers run on the CPU
+        and only activations cross the link, so it is not a per-token cost.
+        VRAM held by other processes in budget is not available to the model.
+        Without a quantization the model's default is planned.
+        """
+        quantization = quantization or self.DEFAULT_QUANTIZATION
+        model_size_gb = self.MODEL_SIZE_GB[quantization]
+        layer_gb = model_size_gb / self.MODEL_LAYERS
+        vram_in_use_gb = budget.vram_in_use_gb if budget else 0.0
+        usable_vram_gb = max(gpu.vram_gb - self.VRAM_RESERVED_GB - vram_in_use_gb, 0)
+        gpu_layers = min(int(usable_vram_gb // layer_gb), self.MODEL_LAYERS)
+        host_resident_gb = round((self.MODEL_LAYERS - gpu_layers) * layer_gb, 2)
+
+        bandwidth = self.pcie_bandwidth_gbps(gpu.pcie_gen_current, gpu.pcie_width_current)
+        transfer_ms = round(host_resident_gb / bandwidth * 1000, 1) if bandwidth else None
+
+        return OffloadPlan(
+            quantization=quantization,
+            model_size_gb=model_size_gb,
+            total_layers=self.MODEL_LAYERS,
+            gpu_layers=gpu_layers,
+            host_resident_gb=host_resident_gb,
+            pcie_bandwidth_gbps=bandwidth,
+            transfer_ms_per_batch=transfer_ms
+        )
+
+    def estimate_tokens_per_s(
+        self,
+        quantization: str,
+        memory: MemoryInfo,
+        gpu: Optional[GPUInfo],
+        ram_bandwidth_gbps: Optional[float] = None,
+        vram_bandwidth_gbps: Optional[float] = None
+    ) -> Optional[float]:
+        """
+        Estimate generation speed for a quantization, or None if it does not fit.
+
+        Token generation reads every weight once per token, so time per token
+        is the GPU-resident share over VRAM bandwidth plus the host-resident
+        share over RAM bandwidth.
+        """
+        ram_bw = ram_bandwidth_gbps or self.DEFAULT_RAM_BANDWIDTH_GBPS
+        vram_bw = vram_bandwidth_gbps or self.DEFAULT_VRAM_BANDWIDTH_GBPS
+
+        if gpu is not None:
+            plan = self.plan_offload(gpu, quantization)
+            host_gb = plan.host_resident_gb
+            gpu_gb = plan.model_size_gb - host_gb
+        else:
+            host_gb = self.MODEL_SIZE_GB[quantization]
+            gpu_gb = 0.0
+
+        if host_gb > memory.total_gb - self.HOST_RESERVED_GB:
+            return None
+        seconds_per_token = gpu_gb / vram_bw + host_gb / ram_bw
+        return round(1 / seconds_per_token, 2)
+
+    def check_co_residency(
+        self,
+        memory: MemoryInfo,
+        gpu: Optional[GPUInfo],
+        storage: StorageInfo,
+        budget: Optional[ResourceBudgetInfo] = None
+    ) -> CoResidencyInfo:
+        """
+        Check whether the co-resident models can all stay loaded at once.
+
+        Models are placed in the order given: each goes fully into the VRAM
+        still free if it fits, otherwise the remaining VRAM takes part of it
+        and the rest spills into host RAM. With a budget, RAM and VRAM held
+        by other running processes are not available to the models.
+        """
+        vram_in_use_gb = budget.vram_in_use_gb if budget else 0.0
+        vram_free = max(gpu.vram_gb - self.VRAM_RESERVED_GB - vram_in_use_gb, 0) if gpu else 0.0
+        host_gb = 0.0
+        vram_gb = 0.0
+        disk_gb = 0.0
+        placements = {}
+
+        for model, quantization in self.co_resident:
+            label = f"{model.name}:{quantization}"
+            weights_gb = model.sizes_gb[quantization]
+            footprint = weights_gb + model.kv_cache_gb
+            disk_gb += weights_gb
+
+            if footprint <= vram_free:
+                placements[label] = "gpu"
+                on_gpu = footprint
+            elif vram_free > 0:
+                placements[label] = "partial"
+                on_gpu = vram_free
+            else:
+                placements[label] = "cpu"
+                on_gpu = 0.0
+            vram_free -= on_gpu
+            vram_gb += on_gpu
+            host_gb += footprint - on_gpu
+
+        ram_required = round(host_gb + self.HOST_RESERVED_GB, 2)
+        return CoResidencyInfo(
+            models=list(placements),
+            placements=placements,
+            ram_required_gb=ram_required,
+            vram_required_gb=round(vram_gb + (self.VRAM_RESERVED_GB if vram_gb else 0), 2),
+            disk_required_gb=round(disk_gb, 2),
+            fits_in_memory=ram_required <= memory.total_gb - (budget.ram_peak_gb if budget else 0.0),
+            fits_on_disk=disk_gb <= storage.available_gb
+        )
+
+    def disk_stages(self, workflow: str, quantization: str, keep_versions: int = 1) -> List[DiskStage]:
+        """
+        Disk usage at each step of a workflow, including retained older versions.
+
+        pull: Ollama downloads into a -partial blob and renames it in place.
+        convert: quantize an F16 GGUF, then ollama create copies the output
+        into the blob store. convert-hf first converts safetensors to F16 GGUF.
+        Inputs are kept (the F16 GGUF is normally reused for other
+        quantizations), so each stage counts everything written before it.
+        Kept versions are counted as new usage, so the forecast is for a
+        store that does not hold them yet.
+        """
+        if workflow not in DISK_WORKFLOWS:
+            raise ValueError(f"Unknown disk workflow: {workflow}")
+        if quantization not in self.MODEL_SIZE_GB:
+            raise ValueError(f"No model size for {quantization}")
+        if workflow != 'pull' and not self.SOURCE_SIZE_GB:
+            raise ValueError(f"{workflow} needs the model's F16 size; set source_size_gb in its profile")
+
+        target_gb = self.MODEL_SIZE_GB[quantization]
+        source_gb = self.SOURCE_SIZE_GB
+        retained_gb = target_gb * max(keep_versions - 1, 0)
+
+        if workflow == 'pull':
+            steps = [("download", target_gb)]
+        else:
+            # Safetensors are about the size of the F16 GGUF made from them
+            inputs_gb = source_gb if workflow == 'convert' else source_gb * 2
+            steps = []
+            if workflow == 'convert-hf':
+                steps.append(("convert to F16 GGUF", source_gb * 2))
+            steps += [
+                ("quantize", inputs_gb + target_gb),
+                ("ollama create", inputs_gb + target_gb * 2),
+            ]
+        return [DiskStage(name, round(usage + retained_gb, 2)) for name, usage in steps]
+
+    def try_preallocate(self, size_gb: float) -> str:
+        """
+        Try to fallocate() a file of the given size in the target directory.
+
+        Calls fallocate(2) directly rather than posix_fallocate, which falls
+        back to writing zeros on filesystems without support.
+        """
+        if platform.system() != "Linux":
+            return "skipped"
+        import ctypes
+        import errno
+        import tempfile
+
+        libc = ctypes.CDLL(None, use_errno=True)
+        libc.fallocate.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_int64, ctypes.c_int64]
+        fd, path = tempfile.mkstemp(prefix=PREALLOCATE_PREFIX, dir=self.target_dir)
+        try:
+            if libc.fallocate(fd, 0, 0, int(size_gb * (1024 ** 3))) == 0:
+                return "ok"
+            error = ctypes.get_errno()
+            if error == errno.ENOSPC:
+                return "no space"
+            if error in (errno.EOPNOTSUPP, errno.ENOSYS):
+                return "unsupported"
+            return "failed"
+        finally:
+            os.close(fd)
+            os.unlink(path)
+
+    def forecast_disk_usage(self, storage: StorageInfo) -> Optional[DiskForecast]:
+        """Forecast peak disk usage of the configured workflow against free space"""
+        if self.disk_plan is None:
+            return None
+        workflow, quantization, keep_versions = self.disk_plan
+        stages = self.disk_stages(workflow, quantization, keep_versions)
+        peak_gb = max(stage.usage_gb for stage in stages)
+        fits = peak_gb <= storage.available_gb
+
+        preallocation = "skipped"
+        if self.check_fallocate and fits:
+            try:
+                preallocation = self.try_preallocate(peak_gb)
+            except OSError as e:
+                print(f"Warning: Could not test preallocation: {e}", file=sys.stderr)
+                preallocation = "failed"
+
+        return DiskForecast(
+            workflow=workflow,
+            quantization=quantization,
+            keep_versions=keep_versions,
+            stages=stages,
+            peak_gb=peak_gb,
+            available_gb=storage.available_gb,
+            fits=fits,
+            preallocation=preallocation
+        )
+
+    def find_model_blobs(self) -> Dict[str, str]:
+        """Find content-addressed model blobs under the target directory"""
+        blobs = {}
+        for root, _, files in os.walk(self.target_dir):
+            for name in files:
+                match = BLOB_NAME_PATTERN.match(name)
+                if match:
+                    blobs[os.path.join(root, name)] = match.group(1)
+        return blobs
+
+    def verify_model_blobs(self, workers: Optional[int] = None, progress: bool = True) -> IntegrityInfo:
+        """
+        Verify model blobs against their sha256 digests, hashing several in parallel.
+
+        Blobs whose size and mtime are unchanged since a previous call on this
+        validator are not hashed again.
+        """
+        blobs = self.find_model_blobs()
+        stats = {path: os.stat(path) for path in blobs}
+        workers = workers or min(len(blobs), os.cpu_count() or 1) or 1
+
+        start = time.perf_counter()
+        results: List[BlobVerification] = []
+        bytes_hashed = 0
+
+        for path in blobs:
+            cached = self._blob_cache.get(path)
+            if cached and cached[:2] == (stats[path].st_size, stats[path].st_mtime_ns):
+                results.append(cached[2])
+        self._blob_cache = {path: self._blob_cache[path] for path in blobs if path in self._blob_cache}
+
+        def record(path: str, actual: str, size: int, elapsed: float) -> None:
+            nonlocal bytes_hashed
+            result = BlobVerification(
+                path=path,
+                expected_digest=blobs[path],
+                actual_digest=actual,
+                size_bytes=size,
+                elapsed_seconds=round(elapsed, 3),
+                ok=actual == blobs[path]
+            )
+            results.append(result)
+            bytes_hashed += size
+            self._blob_cache[path] = (stats[path].st_size, stats[path].st_mtime_ns, result)
+            if progress:
+                rate = size / (1024 ** 2) / elapsed if elapsed > 0 else 0.0
+                print(f"[{len(results)}/{len(blobs)}] {'OK' if result.ok else 'MISMATCH'} "
+                      f"{Path(path).name} ({size / (1024 ** 3):.2f}GB, {rate:.0f}MB/s)",
+                      file=sys.stderr)
+
+        # Largest first so the slowest blob does not start last
+        cached_paths = {r.path for r in results}
+        ordered = sorted(
+            (path for path in blobs if path not in cached_paths),
+            key=lambda p: stats[p].st_size,
+            reverse=True
+        )
+        if workers <= 1 or len(ordered) <= 1:
+            for path in ordered:
+                record(*hash_blob(path))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(hash_blob, path) for path in ordered]
+                for future in as_completed(futures):
+                    record(*future.result())
+
+        elapsed = time.perf_counter() - start
+        return IntegrityInfo(
+            blobs_checked=len(results),
+            bytes_hashed=bytes_hashed,
+            elapsed_seconds=round(elapsed, 3),
+            throughput_mb_s=round(bytes_hashed / (1024 ** 2) / elapsed, 1) if elapsed > 0 else 0.0,
+            mismatches=sorted((r for r in results if not r.ok), key=lambda r: r.path)
+        )
+
+    def get_mount_features(self) -> Dict[str, Any]:
+        """Describe the mount holding the target directory from mountinfo and sysfs"""
+        try:
+            mounts = parse_mountinfo(self.PROC_MOUNTINFO.read_text())
+        except OSError:
+            return {}
+
+        target = str(self.target_dir)
+        mount = None
+        for candidate in mounts:
+            point = candidate['mount_point']
+            if target == point or target.startswith(point.rstrip('/') + '/'):
+                # Later and longer mount points shadow earlier ones
+                if mount is None or len(point) >= len(mount['mount_point']):
+                    mount = candidate
+        if mount is None:
+            return {}
+
+        options = mount['mount_options'] + mount['super_options']
+        compression = next(
+            (option.split('=', 1)[1] for option in options
+             if option.startswith(('compress=', 'compress-force='))),
+            None
+        )
+        read_ahead_kb, rotational = self.get_block_queue_info(mount['device'], mount['source'])
+
+        return {
+            'filesystem': mount['fstype'],
+            'mount_point': mount['mount_point'],
+            'mount_source': mount['source'],
+            'mount_options': mount['mount_options'],
+            'is_network': mount['fstype'] in NETWORK_FILESYSTEMS,
+            'is_overlay': mount['fstype'] == 'overlay',
+            'compression': compression,
+            'noatime': 'noatime' in mount['mount_options'],
+            'read_ahead_kb': read_ahead_kb,
+            'rotational': rotational,
+        }
+
+    def _macos_mount_features(self) -> Dict[str, Any]:
+        """Describe the mount holding the target directory with statfs(2)"""
+        import ctypes
+
+        lib = self._native()
+        # x86_64 exports the 64-bit inode layout under a suffixed name
+        statfs = getattr(lib, 'statfs$INODE64', None) or lib.statfs
+        buffer = ctypes.create_string_buffer(struct.calcsize(STATFS_FORMAT))
+        if statfs(str(self.target_dir).encode(), buffer) != 0:
+            return {}
+
+        values = struct.unpack_from(STATFS_FORMAT, buffer.raw)
+        flags = values[11]
+        fstype, mount_point, mount_source = (
+            value.split(b'\0', 1)[0].decode(errors='replace') for value in values[13:16]
+        )
+        return {
+            'filesystem': fstype,
+            'mount_point': mount_point,
+            'mount_source': mount_source,
+            # smbfs, nfs, afpfs and webdav mounts all lack MNT_LOCAL
+            'is_network': fstype in NETWORK_FILESYSTEMS or not flags & MNT_LOCAL,
+            'noatime': bool(flags & MNT_NOATIME),
+        }
+
+    def get_block_queue_info(self, device: str, source: str) -> Tuple[Optional[int], Optional[bool]]:
+        """Read read-ahead and rotational flags for the block device behind a mount"""
+        # btrfs and similar report an anonymous 0:N device; fall back to the source node
+        if device.startswith('0:') and source.startswith('/dev/'):
+            try:
+                rdev = os.stat(source).st_rdev
+                device = f"{os.major(rdev)}:{os.minor(rdev)}"
+            except OSError:
+                return None, None
+
+        device_dir = self.SYSFS_DEV_BLOCK / device
+        queue_dir = device_dir / 'queue'
+        if not queue_dir.is_dir():
+            # Partitions share their parent disk's queue
+            queue_dir = device_dir.resolve().parent / 'queue'
+        try:
+            read_ahead_kb = int((queue_dir / 'read_ahead_kb').read_text().strip())
+        except (OSError, ValueError):
+            read_ahead_kb = None
+        try:
+            rotational = (queue_dir / 'rotational').read_text().strip() == '1'
+        except OSError:
+            rotational = None
+        return read_ahead_kb, rotational
+
     def get_storage_info(self) -> StorageInfo:
         """Retrieve storage information for target directory"""
         try:
@@ -273,36 +1678,34 @@ class SystemValidator:
                 import ctypes
                 free_bytes = ctypes.c_ulonglong(0)
                 total_bytes = ctypes.c_ulonglong(0)
-                ctypes.windll.kernel32.GetDiskFreeSpaceExW(
-                    str(self.target_dir), None, ctypes.byref(total_bytes), ctypes.byref(free_bytes)
+                # Space available to this user, matching f_bavail on other platforms
+                self._native().GetDiskFreeSpaceExW(
+                    str(self.target_dir), ctypes.byref(free_bytes), ctypes.byref(total_bytes), None
                 )
                 total_gb = total_bytes.value / (1024 ** 3)
                 available_gb = free_bytes.value / (1024 ** 3)
                 filesystem = "NTFS"
+                mount = {}
             else:
                 stat = os.statvfs(self.target_dir)
                 total_gb = (stat.f_blocks * stat.f_frsize) / (1024 ** 3)
                 available_gb = (stat.f_bavail * stat.f_frsize) / (1024 ** 3)
 
-                # Get filesystem type (Linux only)
+                # Get filesystem type and mount features
                 if platform.system() == "Linux":
-                    try:
-                        fs_result = subprocess.run(
-                            ['df', '-T', str(self.target_dir)],
-                            capture_output=True,
-                            text=True
-                        )
-                        filesystem = fs_result.stdout.split('\n')[1].split()[1] if fs_result.stdout else "Unknown"
-                    except:
-                        filesystem = "Unknown"
+                    mount = self.get_mount_features()
+                elif platform.system() == "Darwin":
+                    mount = self._macos_mount_features()
                 else:
-                    filesystem = "APFS/HFS+"
+                    mount = {}
+                filesystem = mount.pop('filesystem', "Unknown")
 
             return StorageInfo(
                 total_gb=round(total_gb, 2),
                 available_gb=round(available_gb, 2),
                 meets_minimum=available_gb >= self.MIN_STORAGE_GB,
-                filesystem=filesystem
+                filesystem=filesystem,
+                **mount
             )
 
         except Exception as e:
@@ -314,53 +1717,266 @@ class SystemValidator:
                 filesystem="Unknown"
             )
 
-    def validate(self) -> SystemReport:
-        """Perform complete system validation"""
+    def validate(
+        self,
+        verify_blobs: bool = False,
+        verify_workers: Optional[int] = None,
+        on_probe: Optional[Callable[[str, Any], None]] = None
+    ) -> SystemReport:
+        """
+        Perform complete system validation, optionally verifying model blob integrity.
+
+        If given, on_probe is called with the section name and result as soon
+        as each probe completes, before the report is assembled.
+        """
+        def probe(name: str, getter: Callable[[], Any]) -> Any:
+            result = getter()
+            if on_probe:
+                on_probe(name, result)
+            return result
+
+        cpu = probe('cpu', self.get_cpu_info)
+        memory = probe('memory', self.get_memory_info)
+        gpu = probe('gpu', self.get_gpu_info)
+        resource_budget = None
+        if self.budget_workloads:
+            resource_budget = probe('resource_budget', lambda: self.get_resource_budget(memory, gpu))
+        memory_lock = probe(
+            'memory_lock',
+            lambda: self.get_memory_lock_info(self.pin_footprint_gb(gpu, resource_budget), memory.available_gb)
+        )
+        storage = probe('storage', self.get_storage_info)
+        disk_forecast = None
+        if self.disk_plan:
+            disk_forecast = probe('disk_forecast', lambda: self.forecast_disk_usage(storage))
+        integrity = None
+        if verify_blobs:
+            integrity = probe('integrity', lambda: self.verify_model_blobs(workers=verify_workers))
+
+        return self.evaluate(cpu, memory, gpu, storage, integrity, memory_lock, disk_forecast, resource_budget)
+
+    def evaluate(
+        self,
+        cpu: CPUInfo,
+        memory: MemoryInfo,
+        gpu: Optional[GPUInfo],
+        storage: StorageInfo,
+        integrity: Optional[IntegrityInfo] = None,
+        memory_lock: Optional[MemoryLockInfo] = None,
+        disk_forecast: Optional[DiskForecast] = None,
+        resource_budget: Optional[ResourceBudgetInfo] = None
+    ) -> SystemReport:
+        """Evaluate probe results against requirements and assemble the report"""
         from datetime import datetime
 
-        cpu = self.get_cpu_info()
-        memory = self.get_memory_info()
-        gpu = self.get_gpu_info()
-        storage = self.get_storage_info()
-
         warnings = []
         recommendations = []
+        offload_plan = None
 
         # Evaluate CPU
         if not cpu.meets_minimum:
             warnings.append(f"CPU has only {cpu.cores} cores (minimum: {self.MIN_CPU_CORES})")
-            recommendations.append("Upgrade to a CPU with at least 8 cores for acceptable performance")
+            recommendations.append(f"Upgrade to a CPU with at least {self.MIN_CPU_CORES} cores for acceptable performance")
         elif not cpu.meets_recommended:
-            recommendations.append(f"CPU has {cpu.cores} cores. 12+ cores recommended for optimal performance")
+            recommendations.append(f"CPU has {cpu.cores} cores. {self.RECOMMENDED_CPU_CORES}+ cores recommended for optimal performance")
 
         # Evaluate Memory
         if not memory.meets_minimum:
             warnings.append(f"RAM is {memory.total_gb}GB (minimum: {self.MIN_RAM_GB}GB)")
-            recommendations.append("CRITICAL: Upgrade RAM to at least 32GB to run 70B model")
+            recommendations.append(f"CRITICAL: Upgrade RAM to at least {self.MIN_RAM_GB}GB to run the model")
         elif not memory.meets_recommended:
-            recommendations.append(f"RAM is {memory.total_gb}GB. 40GB+ recommended for Q5_K_M or higher")
+            recommendations.append(
+                f"RAM is {memory.total_gb}GB. {self.RECOMMENDED_RAM_GB}GB+ recommended for "
+                f"{self.quantization_tiers()[1]} or higher"
+            )
+
+        # Evaluate memory locking
+        if memory_lock is not None and self.use_mlock:
+            if not memory_lock.trial_lock_ok:
+                warnings.append("mlock() of a test buffer failed; use_mlock cannot pin model weights")
+            elif not memory_lock.can_pin_model:
+                warnings.append(
+                    f"Only {memory_lock.pinnable_gb}GB can be locked but the model needs "
+                    f"{memory_lock.model_footprint_gb}GB pinned in RAM for use_mlock"
+                )
+            if not memory_lock.can_pin_model and not memory_lock.has_ipc_lock:
+                recommendations.append(
+                    "Raise the memlock limit (LimitMEMLOCK=infinity in the Ollama systemd unit, "
+                    "or ulimit -l unlimited) or grant CAP_IPC_LOCK"
+                )
+
+        if memory_lock is not None:
+            if 0 < memory_lock.hugepages_free_gb < memory_lock.model_footprint_gb:
+                recommendations.append(
+                    f"Hugepage pool has {memory_lock.hugepages_free_gb}GB free, less than the "
+                    f"{memory_lock.model_footprint_gb}GB model footprint; increase vm.nr_hugepages"
+                )
+            if memory_lock.thp_mode == "never":
+                recommendations.append(
+                    "Transparent hugepages are disabled; set them to madvise to cut TLB misses on weights"
+                )
+
+        # Evaluate running workloads
+        if resource_budget is not None:
+            largest = ", ".join(
+                f"{usage.name} ({usage.pid}) {round(usage.peak_gb + usage.vram_gb, 2)}GB"
+                for usage in resource_budget.top_consumers[:3]
+            )
+            model_host_gb = self.pin_footprint_gb(gpu, resource_budget)
+            # Only blame running workloads when the weights would fit without them
+            if resource_budget.ram_headroom_gb < model_host_gb <= memory.total_gb - self.HOST_RESERVED_GB:
+                warnings.append(
+                    f"Running processes peak at {resource_budget.ram_peak_gb}GB RAM, leaving "
+                    f"{resource_budget.ram_headroom_gb}GB for {model_host_gb}GB of host-resident weights "
+                    f"(largest: {largest})"
+                )
+                recommendations.append("Stop or move the largest workloads, or use a smaller quantization")
+            if gpu is not None and resource_budget.vram_in_use_gb:
+                warnings.append(
+                    f"{resource_budget.vram_in_use_gb}GB of VRAM is held by other processes; "
+                    f"{resource_budget.vram_headroom_gb}GB is left for the model"
+                )
 
         # Evaluate GPU
         if gpu is None:
             warnings.append("No NVIDIA GPU detected - will use CPU-only inference (very slow)")
             recommendations.append("Add NVIDIA GPU with 24GB+ VRAM for 10-20x speedup")
         else:
+            usable_vram_gb = gpu.vram_gb
+            if resource_budget is not None:
+                # Tier the model on the VRAM other processes leave free, not the card's total
+                usable_vram_gb = round(max(gpu.vram_gb - resource_budget.vram_in_use_gb, 0), 2)
+                gpu = replace(gpu, recommended_quantization=self.recommend_quantization(usable_vram_gb))
+
             if gpu.vram_gb < self.MIN_VRAM_GB:
                 warnings.append(f"GPU VRAM is {gpu.vram_gb}GB (recommended: {self.RECOMMENDED_VRAM_GB}GB+)")
                 recommendations.append("GPU will be underutilized. Consider hybrid CPU/GPU inference")
-            elif gpu.vram_gb >= self.OPTIMAL_VRAM_GB:
-                recommendations.append(f"Excellent! {gpu.vram_gb}GB VRAM enables Q6_K or Q8_0 quantization")
+            elif usable_vram_gb >= self.OPTIMAL_VRAM_GB:
+                free = " free" if usable_vram_gb < gpu.vram_gb else ""
+                recommendations.append(
+                    f"Excellent! {usable_vram_gb}GB{free} VRAM enables {self.quantization_tiers()[0]} quantization"
+                )
+
+            # Evaluate PCIe link
+            if gpu.pcie_width_current and gpu.pcie_width_max and gpu.pcie_width_current < gpu.pcie_width_max:
+                warnings.append(
+                    f"GPU PCIe link running at x{gpu.pcie_width_current} (capable of x{gpu.pcie_width_max})"
+                )
+                recommendations.append("Reseat the GPU or move it to a full-width x16 slot")
+            if gpu.pcie_gen_current and gpu.pcie_gen_max and gpu.pcie_gen_current < gpu.pcie_gen_max:
+                # GPUs drop link speed when idle, so this is only advisory
+                recommendations.append(
+                    f"GPU PCIe link at Gen{gpu.pcie_gen_current} (capable of Gen{gpu.pcie_gen_max}). "
+                    "Re-check under load; if it stays low, check BIOS PCIe settings and risers"
+                )
+
+            # VRAM held by other processes can force a split on a GPU big enough on paper
+            if "partial GPU offload" in gpu.recommended_quantization or (
+                resource_budget is not None and resource_budget.vram_in_use_gb
+            ):
+                offload_plan = self.plan_offload(gpu, budget=resource_budget)
+                if offload_plan.transfer_ms_per_batch is not None and offload_plan.host_resident_gb:
+                    full_bw = self.pcie_bandwidth_gbps(gpu.pcie_gen_max, gpu.pcie_width_max)
+                    message = (
+                        f"Partial offload: {offload_plan.gpu_layers}/{offload_plan.total_layers} layers on GPU, "
+                        f"{offload_plan.host_resident_gb}GB on host, ~{offload_plan.transfer_ms_per_batch}ms per "
+                        f"prompt-processing batch to stream host weights over PCIe at {offload_plan.pcie_bandwidth_gbps}GB/s"
+                    )
+                    if full_bw and full_bw > offload_plan.pcie_bandwidth_gbps:
+                        full_ms = round(offload_plan.host_resident_gb / full_bw * 1000, 1)
+                        message += f" (~{full_ms}ms at full link speed)"
+                    recommendations.append(message)
 
         # Evaluate Storage
         if not storage.meets_minimum:
             warnings.append(f"Only {storage.available_gb}GB available (minimum: {self.MIN_STORAGE_GB}GB)")
             recommendations.append("Free up disk space or use a larger drive")
 
+        # Evaluate disk forecast
+        if disk_forecast is not None:
+            peak_stage = max(disk_forecast.stages, key=lambda stage: stage.usage_gb)
+            if not disk_forecast.fits:
+                warnings.append(
+                    f"{disk_forecast.workflow} {disk_forecast.quantization} peaks at {disk_forecast.peak_gb}GB "
+                    f"during '{peak_stage.name}' (available: {disk_forecast.available_gb}GB)"
+                )
+                recommendations.append(
+                    "Free space, keep fewer versions, or delete or stage the F16 source on another disk"
+                )
+            elif disk_forecast.preallocation not in ("ok", "skipped"):
+                warnings.append(
+                    f"Preallocating {disk_forecast.peak_gb}GB in the target directory failed "
+                    f"({disk_forecast.preallocation})"
+                )
+
+        # Evaluate mount features for mmap-based model loading
+        if storage.is_network:
+            warnings.append(
+                f"Model directory is on network filesystem {storage.filesystem}; "
+                "mmap page faults will go over the network"
+            )
+            recommendations.append("Copy models to local NVMe storage before loading")
+        elif storage.filesystem.startswith('fuse'):
+            # Network FUSE mounts (sshfs, rclone) already got the network warning
+            warnings.append(f"Model directory is on FUSE filesystem {storage.filesystem}")
+        if storage.is_overlay:
+            warnings.append("Model directory is on an overlayfs container layer")
+            recommendations.append("Bind-mount a host directory or volume for the model store")
+        if storage.compression:
+            recommendations.append(
+                f"Filesystem compression ({storage.compression}) gains nothing on quantized weights "
+                "and decompresses on every page fault; disable it for the model directory"
+            )
+        if storage.rotational:
+            warnings.append("Model directory is on a rotational disk; model loads will be slow")
+        if storage.read_ahead_kb is not None and storage.read_ahead_kb < MIN_READ_AHEAD_KB:
+            recommendations.append(
+                f"Block device read-ahead is {storage.read_ahead_kb}KB; raise it to "
+                f"{MIN_READ_AHEAD_KB}KB+ (e.g. blockdev --setra) for faster sequential loads"
+            )
+        if storage.mount_options and not storage.noatime and 'relatime' not in storage.mount_options:
+            recommendations.append("Mount the model filesystem with noatime to avoid atime writes on reads")
+
+        # Evaluate model blob integrity
+        if integrity is not None:
+            if integrity.blobs_checked == 0:
+                warnings.append(f"No model blobs found under {self.target_dir}")
+            for mismatch in integrity.mismatches:
+                warnings.append(
+                    f"Blob {Path(mismatch.path).name} is corrupt (sha256 {mismatch.actual_digest[:12]}...)"
+                )
+            if integrity.mismatches:
+                recommendations.append("Delete corrupt blobs and re-pull the affected models")
+
+        # Evaluate co-resident models
+        co_residency = None
+        if self.co_resident:
+            co_residency = self.check_co_residency(memory, gpu, storage, resource_budget)
+            if not co_residency.fits_in_memory:
+                have = f"have {memory.total_gb}GB"
+                if resource_budget is not None:
+                    have += f", {resource_budget.ram_peak_gb}GB of it used by running processes"
+                warnings.append(
+                    f"{len(co_residency.models)} models need {co_residency.ram_required_gb}GB RAM to stay loaded "
+                    f"together ({have}); Ollama will evict and reload them between requests"
+                )
+                recommendations.append("Use smaller quantizations or move a model to another host")
+            else:
+                recommendations.append(
+                    f"Set OLLAMA_MAX_LOADED_MODELS={len(co_residency.models)} so all models stay resident"
+                )
+            if not co_residency.fits_on_disk:
+                warnings.append(
+                    f"Co-resident models need {co_residency.disk_required_gb}GB of disk "
+                    f"(available: {storage.available_gb}GB)"
+                )
+
         # Determine overall status
         critical_failures = [
             not memory.meets_minimum,
             not storage.meets_minimum,
-            not cpu.meets_minimum
+            not cpu.meets_minimum,
+            bool(integrity and integrity.mismatches)
         ]
 
         if any(critical_failures):
@@ -378,123 +1994,1197 @@ class SystemValidator:
             overall_status=overall_status,
             recommendations=recommendations,
             warnings=warnings,
-            timestamp=datetime.utcnow().isoformat()
+            timestamp=datetime.utcnow().isoformat(),
+            offload_plan=offload_plan,
+            integrity=integrity,
+            co_residency=co_residency,
+            memory_lock=memory_lock,
+            disk_forecast=disk_forecast,
+            resource_budget=resource_budget
         )
 
+    def _cgroup_dir(self) -> Optional[Path]:
+        """Return the cgroup v2 directory of this process, if mounted"""
+        try:
+            with open('/proc/self/cgroup', 'r') as f:
+                for line in f:
+                    if line.startswith('0::'):
+                        cgroup_dir = Path('/sys/fs/cgroup') / line[3:].strip().lstrip('/')
+                        return cgroup_dir if cgroup_dir.is_dir() else None
+        except OSError:
+            pass
+        return None
+
+    def _cgroup_dirs(self) -> List[Path]:
+        """cgroup directories holding this process's limits: v2 first, then v1 controllers"""
+        v1_dirs = [Path('/sys/fs/cgroup') / name for name in ('memory', 'cpu', 'cpuset')]
+        return [cgroup_dir for cgroup_dir in [self._cgroup_dir()] + v1_dirs if cgroup_dir is not None]
+
+    def _read_cgroup_file(self, name: str) -> Optional[str]:
+        """Contents of the first cgroup limit file with this name"""
+        for cgroup_dir in self._cgroup_dirs():
+            try:
+                with open(cgroup_dir / name, 'r') as f:
+                    return f.read().strip()
+            except OSError:
+                continue
+        return None
+
+    def _cgroup_memory_limit(self) -> Tuple[Optional[int], Optional[int]]:
+        """Lowest cgroup memory limit and current cgroup usage in bytes, None when absent"""
+        limits = []
+        for name in ('memory.max', 'memory.high', 'memory.limit_in_bytes'):
+            value = self._read_cgroup_file(name)
+            # "max" means no limit; v1 reports it as a huge number instead
+            if value and value.isdigit():
+                limits.append(int(value))
+        usage = self._read_cgroup_file('memory.current') or self._read_cgroup_file('memory.usage_in_bytes')
+        return (min(limits) if limits else None), (int(usage) if usage and usage.isdigit() else None)
+
+    def _cgroup_cpu_limit(self) -> Optional[int]:
+        """CPUs usable under the cgroup's cpuset and CFS quota, None when unrestricted"""
+        limits = []
+        cpus = self._read_cgroup_file('cpuset.cpus.effective') or self._read_cgroup_file('cpuset.effective_cpus')
+        if cpus:
+            try:
+                count = 0
+                for part in cpus.split(','):
+                    first, _, last = part.partition('-')
+                    count += int(last or first) - int(first) + 1
+                limits.append(count)
+            except ValueError:
+                pass
+
+        quota = self._read_cgroup_file('cpu.max')
+        if quota:
+            quota, _, period = quota.partition(' ')
+        else:
+            quota = self._read_cgroup_file('cpu.cfs_quota_us')
+            period = self._read_cgroup_file('cpu.cfs_period_us')
+        # "max" (v2) and -1 (v1) mean no quota
+        if quota and period and quota.isdigit() and period.isdigit() and int(period):
+            limits.append(max(-(-int(quota) // int(period)), 1))
+        return min(limits) if limits else None
+
+    def watch_targets(self, verify_blobs: bool = False) -> Dict[str, Tuple[int, set]]:
+        """Map each watchable path to its inotify mask and the probes it affects"""
+        storage_probes = {'storage', 'integrity'} if verify_blobs else {'storage'}
+        targets = {}
+        for root, _, _ in os.walk(self.target_dir):
+            targets[root] = (WATCH_DIR_MASK, storage_probes)
+
+        # Limit changes written through cgroupfs raise IN_MODIFY
+        limit_files = {
+            'memory': ['memory.max', 'memory.high', 'memory.limit_in_bytes'],
+            'cpu': ['cpu.max', 'cpuset.cpus.effective', 'cpu.cfs_quota_us', 'cpuset.effective_cpus'],
+        }
+        for cgroup_dir in self._cgroup_dirs():
+            for probe, names in limit_files.items():
+                for name in names:
+                    if (cgroup_dir / name).is_file():
+                        targets[str(cgroup_dir / name)] = (WATCH_FILE_MASK, {probe})
+
+        # Driver reloads and hotplug re-create the GPU's device directory
+        device_dir = self._find_pci_device(None)
+        if device_dir is not None:
+            targets[str(device_dir)] = (WATCH_DIR_MASK | WATCH_FILE_MASK, {'gpu'})
+        return targets
+
+    def watch(
+        self,
+        writer: NDJSONWriter,
+        verify_blobs: bool = False,
+        verify_workers: Optional[int] = None,
+        debounce: float = 0.5,
+        max_updates: Optional[int] = None
+    ) -> SystemReport:
+        """
+        Emit a full report, then re-run only the probes affected by inotify events.
+
+        Only sections whose serialized result changed are re-emitted, followed
+        by the summary if it changed. Blocks in select() between events, so an
+        idle watch costs no CPU. Runs until interrupted, or for max_updates
+        change batches.
+        """
+        getters = {
+            'cpu': self.get_cpu_info,
+            'memory': self.get_memory_info,
+            'gpu': self.get_gpu_info,
+            'storage': self.get_storage_info,
+            'integrity': lambda: self.verify_model_blobs(workers=verify_workers, progress=False),
+            'resource_budget': lambda: self.get_resource_budget(results['memory'], results['gpu']),
+            'memory_lock': lambda: self.get_memory_lock_info(
+                self.pin_footprint_gb(results['gpu'], results.get('resource_budget')), results['memory'].available_gb
+            ),
+            'disk_forecast': lambda: self.forecast_disk_usage(results['storage']),
+        }
+        results: Dict[str, Any] = {}
+
+        def record(name: str, result: Any) -> None:
+            results[name] = result
+            writer.emit_probe(name, result)
+
+        report = self.validate(verify_blobs, verify_workers, on_probe=record)
+        writer.emit_summary(report)
+        emitted = {name: to_serializable(result) for name, result in results.items()}
+
+        watcher = InotifyWatcher()
+        probes_by_path: Dict[str, set] = {}
+        for path, (mask, probes) in self.watch_targets(verify_blobs).items():
+            if watcher.add(path, mask) is not None:
+                probes_by_path[path] = probes
+
+        updates = 0
+        try:
+            while max_updates is None or updates < max_updates:
+                events = watcher.read()
+                if not events:
+                    continue
+                # Coalesce bursts, e.g. a model pull touching many files
+                while True:
+                    more = watcher.read(timeout=debounce)
+                    if not more:
+                        break
+                    events.extend(more)
+
+                affected = set()
+                for path, mask, name in events:
+                    if name.startswith(PREALLOCATE_PREFIX):
+                        # Our own preallocation check would otherwise retrigger itself
+                        continue
+                    affected |= probes_by_path.get(path, set())
+                    if mask & IN_CREATE and mask & IN_ISDIR:
+                        subdir = os.path.join(path, name)
+                        if watcher.add(subdir, WATCH_DIR_MASK) is not None:
+                            probes_by_path[subdir] = probes_by_path.get(path, set())
+                if not affected:
+                    continue
+                if affected & {'gpu', 'memory'}:
+                    # The pinnable footprint depends on the offload split and free RAM
+                    affected.add('memory_lock')
+                    if self.budget_workloads:
+                        affected.add('resource_budget')
+                if 'storage' in affected and self.disk_plan:
+                    affected.add('disk_forecast')
+
+                # Dependent probes run after the probes they read from
+                for name in [probe for probe in PROBE_TYPES if probe in affected]:
+                    results[name] = getters[name]()
+                    serialized = to_serializable(results[name])
+                    if serialized != emitted.get(name):
+                        writer.emit_probe(name, results[name])
+                        emitted[name] = serialized
+
+                previous = report
+                report = self.evaluate(
+                    results['cpu'], results['memory'], results['gpu'], results['storage'],
+                    results.get('integrity'), results.get('memory_lock'), results.get('disk_forecast'),
+                    results.get('resource_budget')
+                )
+                # The timestamp alone changing is not worth an event
+                if any(
+                    getattr(report, f.name) != getattr(previous, f.name)
+                    for f in fields(report) if f.name not in PROBE_TYPES and f.name != 'timestamp'
+                ):
+                    writer.emit_summary(report)
+                updates += 1
+        finally:
+            watcher.close()
+        return report
+
+    def render(self, report: SystemReport) -> 'ReportRenderer':
+        """Build the report's rendering IR once and reuse it for every output"""
+        if self._rendered is None or self._rendered[0] is not report:
+            self._rendered = (report, ReportRenderer(self.serialize_report(report)))
+        return self._rendered[1]
+
     def print_report(self, report: SystemReport) -> None:
         """Print formatted validation report"""
-        print("\n" + "=" * 70)
-        print("SYSTEM VALIDATION REPORT")
-        print("Strawberrylemonade-L3-70B-v1.1 Integration")
-        print("=" * 70)
-        print(f"\nTimestamp: {report.timestamp}")
-        print(f"Overall Status: {report.overall_status}\n")
+        sys.stdout.write(self.render(report).render('text'))
+        sys.stdout.flush()
+
+    def serialize_report(self, report: SystemReport) -> Dict[str, Any]:
+        """Convert a report to a schema-validated, versioned dictionary"""
+        data = {'schema_version': REPORT_SCHEMA_VERSION}
+        data.update(to_serializable(report))
+        validate_report_schema(data)
+        return data
+
+    def write_report(self, report: SystemReport, stream: Union[IO[str], IO[bytes]], output_format: str = "json") -> None:
+        """Write a report to an open stream (binary for the compact format)"""
+        stream.write(self.render(report).render(output_format))
+
+    def save_report(
+        self,
+        report: SystemReport,
+        output_path: str = "system_validation_report.json",
+        output_format: str = "json",
+        quiet: bool = False
+    ) -> None:
+        """Save validation report to a file in the requested format"""
+        output_file = Path(output_path)
+        mode = 'wb' if output_format == "compact" else 'w'
+        with output_file.open(mode) as f:
+            self.write_report(report, f, output_format)
+        if not quiet:
+            print(f"Report saved to: {output_file.resolve()}")
+
+
+class ReportRenderer:
+    """
+    Renders a serialized report to text, JSON, NDJSON or compact output.
+
+    All formats read the same schema-validated dictionary, and each is
+    rendered at most once into a single string so callers can emit it with
+    one write.
+    """
+
+    FORMATS = ('text',) + OUTPUT_FORMATS
+
+    def __init__(self, data: Dict[str, Any]):
+        self.data = data
+        self._cache: Dict[str, Union[str, bytes]] = {}
+
+    def render(self, output_format: str) -> Union[str, bytes]:
+        if output_format not in self.FORMATS:
+            raise ValueError(f"Unknown output format: {output_format}")
+        if output_format not in self._cache:
+            self._cache[output_format] = getattr(self, f"_render_{output_format}")()
+        return self._cache[output_format]
+
+    def _render_json(self) -> str:
+        return json.dumps(self.data, indent=2)
+
+    def _render_compact(self) -> bytes:
+        return pack_compact(self.data)
+
+    def _render_ndjson(self) -> str:
+        version = self.data['schema_version']
+        events = [
+            {'schema_version': version, 'type': 'probe', 'probe': name, 'data': self.data[name]}
+            # A missing GPU is a result; other empty sections were not probed
+            for name in PROBE_TYPES if name == 'gpu' or self.data[name] is not None
+        ]
+        summary = {k: v for k, v in self.data.items() if k not in PROBE_TYPES and k != 'schema_version'}
+        events.append({'schema_version': version, 'type': 'summary', 'data': summary})
+        return "".join(json.dumps(event, separators=(',', ':')) + "\n" for event in events)
+
+    def _render_text(self) -> str:
+        data = self.data
+        cpu, memory, gpu, storage = data['cpu'], data['memory'], data['gpu'], data['storage']
+        lines = []
+        line = lines.append
+
+        line("\n" + "=" * 70)
+        line("SYSTEM VALIDATION REPORT")
+        line("Strawberrylemonade-L3-70B-v1.1 Integration")
+        line("=" * 70)
+        line(f"\nTimestamp: {data['timestamp']}")
+        line(f"Overall Status: {data['overall_status']}\n")
 
         # CPU Section
-        print("CPU Information:")
-        print(f"  Model: {report.cpu.model}")
-        print(f"  Cores: {report.cpu.cores} (Physical)")
-        print(f"  Threads: {report.cpu.threads} (Logical)")
-        print(f"  Architecture: {report.cpu.architecture}")
-        status = "✅" if report.cpu.meets_minimum else "❌"
-        print(f"  Status: {status} {'Meets minimum' if report.cpu.meets_minimum else 'Below minimum'}")
+        line("CPU Information:")
+        line(f"  Model: {cpu['model']}")
+        line(f"  Cores: {cpu['cores']} (Physical)")
+        line(f"  Threads: {cpu['threads']} (Logical)")
+        line(f"  Architecture: {cpu['architecture']}")
+        status = "✅" if cpu['meets_minimum'] else "❌"
+        line(f"  Status: {status} {'Meets minimum' if cpu['meets_minimum'] else 'Below minimum'}")
 
         # Memory Section
-        print(f"\nMemory Information:")
-        print(f"  Total: {report.memory.total_gb}GB")
-        print(f"  Available: {report.memory.available_gb}GB")
-        status = "✅" if report.memory.meets_minimum else "❌"
-        print(f"  Status: {status} {'Meets minimum' if report.memory.meets_minimum else 'Below minimum'}")
+        line(f"\nMemory Information:")
+        line(f"  Total: {memory['total_gb']}GB")
+        line(f"  Available: {memory['available_gb']}GB")
+        status = "✅" if memory['meets_minimum'] else "❌"
+        line(f"  Status: {status} {'Meets minimum' if memory['meets_minimum'] else 'Below minimum'}")
+
+        # Memory Lock Section
+        lock = data['memory_lock']
+        if lock:
+            limit = "unlimited" if lock['memlock_limit_gb'] is None else f"{lock['memlock_limit_gb']}GB"
+            line(f"\nMemory Locking:")
+            line(f"  Memlock Limit: {limit}{' (CAP_IPC_LOCK)' if lock['has_ipc_lock'] else ''}")
+            line(f"  Pinnable: {lock['pinnable_gb']}GB (model needs {lock['model_footprint_gb']}GB)")
+            line(f"  Hugepages: {lock['hugepages_free_gb']}GB free of {lock['hugepages_total_gb']}GB")
+            line(f"  Transparent Hugepages: {lock['thp_mode']}")
+            status = "✅" if lock['can_pin_model'] else "⚠️ "
+            line(f"  Status: {status} {'Model can be pinned' if lock['can_pin_model'] else 'Model cannot be fully pinned'}")
+
+        # Running Workloads Section
+        budget = data['resource_budget']
+        if budget:
+            line(f"\nRunning Workloads:")
+            line(f"  Processes Scanned: {budget['processes_scanned']}")
+            line(f"  RAM In Use: {budget['ram_in_use_gb']}GB (peak {budget['ram_peak_gb']}GB), "
+                 f"{budget['ram_headroom_gb']}GB headroom")
+            if gpu:
+                line(f"  VRAM In Use: {budget['vram_in_use_gb']}GB, {budget['vram_headroom_gb']}GB headroom")
+            for usage in budget['top_consumers']:
+                line(f"  - {usage['name']} ({usage['pid']}): {usage['peak_gb']}GB RAM peak, {usage['vram_gb']}GB VRAM")
 
         # GPU Section
-        print(f"\nGPU Information:")
-        if report.gpu:
-            print(f"  Name: {report.gpu.name}")
-            print(f"  VRAM: {report.gpu.vram_gb}GB")
-            print(f"  CUDA Version: {report.gpu.cuda_version}")
-            print(f"  Driver Version: {report.gpu.driver_version}")
-            print(f"  Compute Capability: {report.gpu.compute_capability}")
-            print(f"  Recommended Quantization: {report.gpu.recommended_quantization}")
-            print(f"  Status: ✅ GPU Available")
+        line(f"\nGPU Information:")
+        if gpu:
+            line(f"  Name: {gpu['name']}")
+            line(f"  VRAM: {gpu['vram_gb']}GB")
+            line(f"  CUDA Version: {gpu['cuda_version']}")
+            line(f"  Driver Version: {gpu['driver_version']}")
+            line(f"  Compute Capability: {gpu['compute_capability']}")
+            if gpu['pcie_gen_current'] and gpu['pcie_width_current']:
+                line(f"  PCIe Link: Gen{gpu['pcie_gen_current']} x{gpu['pcie_width_current']} "
+                     f"(max Gen{gpu['pcie_gen_max']} x{gpu['pcie_width_max']})")
+            line(f"  Recommended Quantization: {gpu['recommended_quantization']}")
+            line(f"  Status: ✅ GPU Available")
         else:
-            print(f"  Status: ⚠️  No NVIDIA GPU detected (CPU-only mode)")
+            line(f"  Status: ⚠️  No NVIDIA GPU detected (CPU-only mode)")
 
         # Storage Section
-        print(f"\nStorage Information:")
-        print(f"  Total: {report.storage.total_gb}GB")
-        print(f"  Available: {report.storage.available_gb}GB")
-        print(f"  Filesystem: {report.storage.filesystem}")
-        status = "✅" if report.storage.meets_minimum else "❌"
-        print(f"  Status: {status} {'Sufficient space' if report.storage.meets_minimum else 'Insufficient space'}")
+        line(f"\nStorage Information:")
+        line(f"  Total: {storage['total_gb']}GB")
+        line(f"  Available: {storage['available_gb']}GB")
+        line(f"  Filesystem: {storage['filesystem']}")
+        if storage['mount_options']:
+            line(f"  Mount: {storage['mount_point']} ({','.join(storage['mount_options'])})")
+        if storage['read_ahead_kb'] is not None:
+            disk_type = "rotational" if storage['rotational'] else "non-rotational"
+            line(f"  Block Device: {disk_type}, read-ahead {storage['read_ahead_kb']}KB")
+        status = "✅" if storage['meets_minimum'] else "❌"
+        line(f"  Status: {status} {'Sufficient space' if storage['meets_minimum'] else 'Insufficient space'}")
+
+        # Disk Forecast Section
+        forecast = data['disk_forecast']
+        if forecast:
+            line(f"\nDisk Forecast ({forecast['workflow']} {forecast['quantization']}, "
+                 f"{forecast['keep_versions']} version(s) kept):")
+            for stage in forecast['stages']:
+                line(f"  {stage['name']}: {stage['usage_gb']}GB")
+            line(f"  Peak: {forecast['peak_gb']}GB of {forecast['available_gb']}GB available")
+            line(f"  Preallocation: {forecast['preallocation']}")
+            status = "✅" if forecast['fits'] else "❌"
+            line(f"  Status: {status} {'Fits' if forecast['fits'] else 'Does not fit'}")
+
+        # Integrity Section
+        integrity = data['integrity']
+        if integrity:
+            line(f"\nModel Blob Integrity:")
+            line(f"  Blobs Checked: {integrity['blobs_checked']}")
+            line(f"  Data Hashed: {integrity['bytes_hashed'] / (1024 ** 3):.2f}GB "
+                 f"in {integrity['elapsed_seconds']}s ({integrity['throughput_mb_s']}MB/s)")
+            status = "❌" if integrity['mismatches'] else "✅"
+            line(f"  Status: {status} {len(integrity['mismatches'])} mismatched blob(s)")
+
+        # Co-Residency Section
+        co_residency = data['co_residency']
+        if co_residency:
+            line(f"\nCo-Resident Models:")
+            for label, placement in co_residency['placements'].items():
+                line(f"  {label}: {placement}")
+            line(f"  RAM Required: {co_residency['ram_required_gb']}GB")
+            line(f"  VRAM Required: {co_residency['vram_required_gb']}GB")
+            line(f"  Disk Required: {co_residency['disk_required_gb']}GB")
+            status = "✅" if co_residency['fits_in_memory'] else "❌"
+            line(f"  Status: {status} {'All stay loaded' if co_residency['fits_in_memory'] else 'Cannot all stay loaded'}")
 
         # Warnings
-        if report.warnings:
-            print(f"\n⚠️  WARNINGS:")
-            for warning in report.warnings:
-                print(f"  - {warning}")
+        if data['warnings']:
+            line(f"\n⚠️  WARNINGS:")
+            for warning in data['warnings']:
+                line(f"  - {warning}")
 
         # Recommendations
-        if report.recommendations:
-            print(f"\n💡 RECOMMENDATIONS:")
-            for rec in report.recommendations:
-                print(f"  - {rec}")
+        if data['recommendations']:
+            line(f"\n💡 RECOMMENDATIONS:")
+            for rec in data['recommendations']:
+                line(f"  - {rec}")
 
         # Final verdict
-        print("\n" + "=" * 70)
-        if report.overall_status == "PASSED":
-            print("✅ SYSTEM VALIDATION PASSED")
-            print("Your system meets all requirements for model deployment.")
-        elif report.overall_status == "PASSED_WITH_WARNINGS":
-            print("⚠️  SYSTEM VALIDATION PASSED WITH WARNINGS")
-            print("Your system meets minimum requirements but has limitations.")
+        line("\n" + "=" * 70)
+        if data['overall_status'] == "PASSED":
+            line("✅ SYSTEM VALIDATION PASSED")
+            line("Your system meets all requirements for model deployment.")
+        elif data['overall_status'] == "PASSED_WITH_WARNINGS":
+            line("⚠️  SYSTEM VALIDATION PASSED WITH WARNINGS")
+            line("Your system meets minimum requirements but has limitations.")
         else:
-            print("❌ SYSTEM VALIDATION FAILED")
-            print("Your system does not meet minimum requirements.")
-            print("Please address critical issues before proceeding.")
-        print("=" * 70 + "\n")
+            line("❌ SYSTEM VALIDATION FAILED")
+            line("Your system does not meet minimum requirements.")
+            line("Please address critical issues before proceeding.")
+        line("=" * 70 + "\n")
 
-    def save_report(self, report: SystemReport, output_path: str = "system_validation_report.json") -> None:
-        """Save validation report to JSON file"""
-        output_file = Path(output_path)
-        with output_file.open('w') as f:
-            # Convert dataclasses to dict
-            report_dict = asdict(report)
-            json.dump(report_dict, f, indent=2)
-        print(f"Report saved to: {output_file.resolve()}")
+        return "".join(text + "\n" for text in lines)
+
+
+DEFAULT_MODEL_NAME = "strawberrylemonade-l3-70b"
+
+
+def builtin_model_profiles() -> Dict[str, ModelProfile]:
+    """Model profiles that need no registry file"""
+    return {
+        DEFAULT_MODEL_NAME: ModelProfile(
+            name=DEFAULT_MODEL_NAME,
+            layers=SystemValidator.MODEL_LAYERS,
+            sizes_gb=dict(SystemValidator.MODEL_SIZE_GB),
+            default_quantization=SystemValidator.DEFAULT_QUANTIZATION,
+            kv_cache_gb=2.5,
+            source_size_gb=SystemValidator.SOURCE_SIZE_GB,
+        )
+    }
+
+
+def load_model_profiles(path: Optional[str] = None) -> Dict[str, ModelProfile]:
+    """Load a model registry from JSON or TOML on top of the built-in profiles"""
+    registry = builtin_model_profiles()
+    if path is None:
+        return registry
+
+    registry_path = Path(path)
+    if registry_path.suffix == '.toml':
+        import tomllib  # Python 3.11+
+        with registry_path.open('rb') as f:
+            data = tomllib.load(f)
+    else:
+        with registry_path.open('r') as f:
+            data = json.load(f)
+
+    if not isinstance(data, dict) or not isinstance(data.get('models', []), list):
+        raise ValueError(f"Model registry {path} must have a \"models\" list")
+    for index, entry in enumerate(data.get('models', [])):
+        try:
+            profile = ModelProfile(
+                name=entry['name'],
+                layers=int(entry['layers']),
+                sizes_gb={quant: float(size) for quant, size in entry['sizes_gb'].items()},
+                default_quantization=entry.get('default_quantization', "Q4_K_M"),
+                kv_cache_gb=float(entry.get('kv_cache_gb', 0.0)),
+                source_size_gb=entry.get('source_size_gb'),
+                requirements=entry.get('requirements')
+            )
+        except KeyError as e:
+            raise ValueError(f"Model {index} in {path} is missing {e}") from e
+        except (AttributeError, TypeError, ValueError) as e:
+            raise ValueError(f"Model {index} in {path} is invalid: {e}") from e
+        if profile.default_quantization not in profile.sizes_gb:
+            raise ValueError(f"Model {profile.name} has no size for {profile.default_quantization}")
+        SystemValidator.check_thresholds(profile.requirements or {}, f"model {profile.name}")
+        registry[profile.name] = profile
+    return registry
+
+
+def resolve_models(registry: Dict[str, ModelProfile], specs: List[str]) -> List[Tuple[ModelProfile, str]]:
+    """Resolve "name" or "name:quantization" specs against the registry"""
+    resolved = []
+    for spec in specs:
+        name, _, quantization = spec.partition(':')
+        if name not in registry:
+            raise ValueError(f"Unknown model: {name} (known: {', '.join(sorted(registry))})")
+        model = registry[name]
+        quantization = quantization or model.default_quantization
+        if quantization not in model.sizes_gb:
+            raise ValueError(f"Model {name} has no size for {quantization}")
+        resolved.append((model, quantization))
+    return resolved
+
+
+@dataclass
+class HostProfile:
+    """Synthetic host description for what-if simulation"""
+    name: str
+    cpu: CPUInfo
+    memory: MemoryInfo
+    gpu: Optional[GPUInfo]
+    storage: StorageInfo
+    ram_bandwidth_gbps: Optional[float] = None
+    vram_bandwidth_gbps: Optional[float] = None
+    thresholds: Optional[Dict[str, float]] = None
+
+
+@dataclass
+class SimulationResult:
+    """Outcome of validating and planning against a host profile"""
+    profile: str
+    overall_status: str
+    best_quantization: Optional[str]
+    tokens_per_s: Optional[float]
+    tokens_per_s_by_quant: Dict[str, Optional[float]]
+    warnings: List[str]
+
+
+class SimulatedValidator(SystemValidator):
+    """Runs validation and planning against a host profile instead of real hardware"""
+
+    def __init__(
+        self,
+        profile: HostProfile,
+        model: Optional[ModelProfile] = None,
+        co_resident: Optional[List[Tuple[ModelProfile, str]]] = None
+    ):
+        super().__init__(target_dir=".", model=model, co_resident=co_resident)
+        self.profile = profile
+        self.apply_thresholds(profile.thresholds or {}, f"profile {profile.name}")
+
+    def get_cpu_info(self) -> CPUInfo:
+        # Copies, so the caller's profile can be validated again against other models
+        cpu = self.profile.cpu
+        return replace(
+            cpu,
+            meets_minimum=cpu.cores >= self.MIN_CPU_CORES,
+            meets_recommended=cpu.cores >= self.RECOMMENDED_CPU_CORES
+        )
+
+    def get_memory_info(self) -> MemoryInfo:
+        memory = self.profile.memory
+        return replace(
+            memory,
+            meets_minimum=memory.total_gb >= self.MIN_RAM_GB,
+            meets_recommended=memory.total_gb >= self.RECOMMENDED_RAM_GB
+        )
+
+    def get_gpu_info(self) -> Optional[GPUInfo]:
+        gpu = self.profile.gpu
+        if gpu is None:
+            return None
+        return replace(gpu, recommended_quantization=self.recommend_quantization(gpu.vram_gb))
+
+    def get_memory_lock_info(self, footprint_gb: float, available_gb: float) -> Optional[MemoryLockInfo]:
+        # Lock limits are host configuration, not hardware; profiles do not describe them
+        return None
+
+    def get_storage_info(self) -> StorageInfo:
+        storage = self.profile.storage
+        return replace(storage, meets_minimum=storage.available_gb >= self.MIN_STORAGE_GB)
+
+
+def parse_host_profile(data: Dict[str, Any]) -> HostProfile:
+    """Build a HostProfile from its file representation, raising ValueError on missing or bad fields"""
+    if not isinstance(data, dict):
+        raise ValueError(f"Host profile must be a table, not {type(data).__name__}")
+    name = data.get('name', "unnamed")
+    try:
+        profile = _parse_host_profile(data, name)
+    except KeyError as e:
+        raise ValueError(f"Host profile {name} is missing {e.args[0]}") from e
+    except (AttributeError, TypeError, ValueError) as e:
+        raise ValueError(f"Host profile {name} is invalid: {e}") from e
+    SystemValidator.check_thresholds(profile.thresholds or {}, f"profile {name}")
+    return profile
+
+
+def _parse_host_profile(data: Dict[str, Any], name: str) -> HostProfile:
+    """Build a HostProfile; a missing required field raises KeyError naming it as section.key"""
+    cpu = data.get('cpu', {})
+    memory = data.get('memory', {})
+    gpu = data.get('gpu')
+    storage = data.get('storage', {})
+
+    def require(section: str, values: Dict[str, Any], key: str) -> Any:
+        if key not in values:
+            raise KeyError(f"{section}.{key}")
+        return values[key]
+
+    gpu_info = None
+    if gpu:
+        gpu_info = GPUInfo(
+            name=gpu.get('name', "Simulated GPU"),
+            vram_gb=float(require('gpu', gpu, 'vram_gb')),
+            cuda_version=gpu.get('cuda_version', "Unknown"),
+            driver_version=gpu.get('driver_version', "Unknown"),
+            compute_capability=gpu.get('compute_capability', "Unknown"),
+            is_available=True,
+            recommended_quantization="",
+            pcie_gen_current=gpu.get('pcie_gen'),
+            pcie_gen_max=gpu.get('pcie_gen'),
+            pcie_width_current=gpu.get('pcie_width'),
+            pcie_width_max=gpu.get('pcie_width')
+        )
+
+    total_gb = float(require('memory', memory, 'total_gb'))
+    cores = int(require('cpu', cpu, 'cores'))
+    storage_gb = float(require('storage', storage, 'total_gb'))
+    return HostProfile(
+        name=name,
+        cpu=CPUInfo(
+            model=cpu.get('model', "Simulated CPU"),
+            cores=cores,
+            threads=int(cpu.get('threads', cores)),
+            architecture=cpu.get('architecture', "x86_64"),
+            meets_minimum=False,
+            meets_recommended=False
+        ),
+        memory=MemoryInfo(
+            total_gb=total_gb,
+            available_gb=float(memory.get('available_gb', total_gb)),
+            meets_minimum=False,
+            meets_recommended=False
+        ),
+        gpu=gpu_info,
+        storage=StorageInfo(
+            total_gb=storage_gb,
+            available_gb=float(storage.get('available_gb', storage_gb)),
+            meets_minimum=False,
+            filesystem=storage.get('filesystem', "Unknown")
+        ),
+        ram_bandwidth_gbps=memory.get('bandwidth_gbps'),
+        vram_bandwidth_gbps=gpu.get('bandwidth_gbps') if gpu else None,
+        thresholds=data.get('thresholds')
+    )
+
+
+def load_host_profiles(path: str) -> List[HostProfile]:
+    """Load host profiles from a JSON or TOML file (a single profile or a "profiles" list)"""
+    profile_path = Path(path)
+    if profile_path.suffix == '.toml':
+        import tomllib  # Python 3.11+
+        with profile_path.open('rb') as f:
+            data = tomllib.load(f)
+    else:
+        with profile_path.open('r') as f:
+            data = json.load(f)
+
+    if isinstance(data, dict) and 'profiles' in data:
+        data = data['profiles']
+    if isinstance(data, dict):
+        data = [data]
+    return [parse_host_profile(entry) for entry in data]
+
+
+def simulate_profiles(
+    profiles: List[HostProfile],
+    model: Optional[ModelProfile] = None,
+    co_resident: Optional[List[Tuple[ModelProfile, str]]] = None
+) -> List[SimulationResult]:
+    """
+    Validate every profile and evaluate each quantization of the model against it.
+
+    The profile x quantization grid is filled in one pass; the best
+    quantization is the highest quality one reaching TARGET_TOKENS_PER_S,
+    or the fastest that fits if none does. Without a model the built-in
+    70B requirements are used.
+    """
+    results = []
+    for profile in profiles:
+        validator = SimulatedValidator(profile, model, co_resident)
+        report = validator.validate()
+        # Higher quality first
+        quants = sorted(validator.MODEL_SIZE_GB, key=validator.MODEL_SIZE_GB.get, reverse=True)
+        speeds = {
+            quant: validator.estimate_tokens_per_s(
+                quant, report.memory, report.gpu,
+                profile.ram_bandwidth_gbps, profile.vram_bandwidth_gbps
+            )
+            for quant in quants
+        }
+
+        fitting = [quant for quant in quants if speeds[quant] is not None]
+        fast_enough = [quant for quant in fitting if speeds[quant] >= validator.TARGET_TOKENS_PER_S]
+        if fast_enough:
+            best = fast_enough[0]
+        elif fitting:
+            best = max(fitting, key=speeds.get)
+        else:
+            best = None
+
+        results.append(SimulationResult(
+            profile=profile.name,
+            overall_status=report.overall_status,
+            best_quantization=best,
+            tokens_per_s=speeds[best] if best else None,
+            tokens_per_s_by_quant=speeds,
+            warnings=report.warnings
+        ))
+    return results
+
+
+def format_simulation_table(results: List[SimulationResult]) -> str:
+    """Render simulation results as a fixed-width comparison table"""
+    quants = list(results[0].tokens_per_s_by_quant) if results else []
+    headers = ["Profile", "Status", "Best", "tok/s"] + quants
+    rows = [
+        [
+            result.profile,
+            result.overall_status,
+            result.best_quantization or "-",
+            f"{result.tokens_per_s:.1f}" if result.tokens_per_s else "-",
+        ] + [
+            f"{result.tokens_per_s_by_quant[quant]:.1f}" if result.tokens_per_s_by_quant[quant] else "-"
+            for quant in quants
+        ]
+        for result in results
+    ]
+    widths = [max(len(str(row[i])) for row in [headers] + rows) for i in range(len(headers))]
+    lines = ["  ".join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip() for row in [headers] + rows]
+    lines.insert(1, "  ".join("-" * width for width in widths))
+    return "\n".join(lines)
+
+
+class Transport(ABC):
+    """Runs a command on a fleet host, feeding it stdin"""
+
+    name = "base"
+
+    @abstractmethod
+    def run(self, host: str, command: List[str], stdin: bytes, timeout: float) -> subprocess.CompletedProcess:
+        """Run command on host and return its completed process"""
+
+
+class SubprocessTransport(Transport):
+    """Transport that wraps the remote command in a local client process"""
+
+    @abstractmethod
+    def build_command(self, host: str, command: List[str]) -> List[str]:
+        """Wrap command in the local client invocation that reaches host"""
+
+    def run(self, host: str, command: List[str], stdin: bytes, timeout: float) -> subprocess.CompletedProcess:
+        # subprocess.run kills the client on timeout
+        return subprocess.run(
+            self.build_command(host, command),
+            input=stdin,
+            capture_output=True,
+            timeout=timeout
+        )
+
+
+class LocalTransport(SubprocessTransport):
+    """Runs the probes on this machine, whatever the host name"""
+
+    name = "local"
+
+    def build_command(self, host: str, command: List[str]) -> List[str]:
+        return [sys.executable if command[0] == 'python3' else command[0]] + command[1:]
+
+
+class SSHTransport(SubprocessTransport):
+    """Runs the probes over SSH, sharing one multiplexed connection per host"""
+
+    name = "ssh"
+
+    def __init__(self, control_dir: Optional[str] = None, persist_seconds: int = 300):
+        self.control_dir = Path(control_dir or Path.home() / '.ssh')
+        self.persist_seconds = persist_seconds
+
+    def build_command(self, host: str, command: List[str]) -> List[str]:
+        return [
+            'ssh',
+            '-o', 'BatchMode=yes',
+            '-o', 'ControlMaster=auto',
+            # %C is a hash of the connection, so long host or user names cannot
+            # push the socket path past the 104-byte sun_path limit
+            '-o', f"ControlPath={self.control_dir / 'validate-%C'}",
+            '-o', f'ControlPersist={self.persist_seconds}',
+            host,
+            # ssh joins the remote command into a single shell string
+            ' '.join(shlex.quote(part) for part in command),
+        ]
+
+
+class ContainerTransport(SubprocessTransport):
+    """Runs the probes inside a running container; host is the container name"""
+
+    name = "container"
+
+    def __init__(self, runtime: str = "docker"):
+        self.runtime = runtime
+
+    def build_command(self, host: str, command: List[str]) -> List[str]:
+        return [self.runtime, 'exec', '-i', host] + command
+
+
+TRANSPORTS = {
+    'local': LocalTransport,
+    'ssh': SSHTransport,
+    'container': ContainerTransport,
+}
+
+
+@dataclass
+class FleetResult:
+    """Validation outcome for one fleet host"""
+    host: str
+    report: Optional[SystemReport]
+    error: Optional[str]
+    elapsed_seconds: float
+
+
+def validate_host(
+    host: str,
+    transport: Transport,
+    remote_args: List[str],
+    timeout: float
+) -> FleetResult:
+    """Run this script on a host through a transport and parse its JSON report"""
+    start = time.perf_counter()
+    command = ['python3', '-'] + remote_args + ['--format', 'json', '--output', '-', '--quiet']
+    try:
+        result = transport.run(host, command, Path(__file__).read_bytes(), timeout)
+        # The script exits 1 on FAILED but still prints its report
+        try:
+            report = report_from_dict(json.loads(result.stdout))
+        except (ValueError, KeyError, TypeError) as e:
+            stderr = result.stderr.decode(errors='replace').strip() if result.stderr else ""
+            raise RuntimeError(f"exit {result.returncode}: {stderr.splitlines()[-1] if stderr else e}")
+        error = None
+    except subprocess.TimeoutExpired:
+        report, error = None, f"timed out after {timeout}s"
+    except Exception as e:
+        report, error = None, str(e)
+    return FleetResult(
+        host=host,
+        report=report,
+        error=error,
+        elapsed_seconds=round(time.perf_counter() - start, 3)
+    )
+
+
+def run_fleet(
+    hosts: List[str],
+    transport: Transport,
+    remote_args: Optional[List[str]] = None,
+    concurrency: int = 16,
+    timeout: float = 120.0
+):
+    """Validate hosts concurrently, yielding each FleetResult as soon as it completes"""
+    with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(hosts) or 1))) as pool:
+        futures = [
+            pool.submit(validate_host, host, transport, remote_args or [], timeout)
+            for host in hosts
+        ]
+        for future in as_completed(futures):
+            yield future.result()
 
 
 def main():
     """Main entry point"""
     import argparse
 
+    def common_options(with_defaults: bool) -> argparse.ArgumentParser:
+        """
+        Options accepted before or after the subcommand.
+
+        Only the top-level copy has defaults, so a subcommand does not reset
+        options that were given before it.
+        """
+        common = argparse.ArgumentParser(add_help=False)
+
+        def default(value: Any) -> Any:
+            return value if with_defaults else argparse.SUPPRESS
+
+        common.add_argument(
+            '--target-dir',
+            default=default('.'),
+            help='Target directory for storage check (default: current directory)'
+        )
+        common.add_argument(
+            '--output',
+            default=default('system_validation_report.json'),
+            help='Output file for the report, or - for stdout (default: system_validation_report.json)'
+        )
+        common.add_argument(
+            '--format',
+            dest='output_format',
+            choices=OUTPUT_FORMATS,
+            default=default(None),
+            help='Report format: indented json, streaming ndjson, or compact MessagePack '
+                 '(default: json, or ndjson with --watch)'
+        )
+        common.add_argument(
+            '--quiet',
+            action='store_true',
+            default=default(False),
+            help='Suppress console output (only save to file)'
+        )
+        common.add_argument(
+            '--models',
+            default=default(None),
+            help='JSON or TOML model registry adding to the built-in model profiles'
+        )
+        common.add_argument(
+            '--model',
+            default=default(DEFAULT_MODEL_NAME),
+            help=f'Model whose requirements to validate against (default: {DEFAULT_MODEL_NAME})'
+        )
+        common.add_argument(
+            '--co-resident',
+            nargs='+',
+            metavar='NAME[:QUANT]',
+            default=default(None),
+            help='Models that must stay loaded together on this host'
+        )
+        common.add_argument(
+            '--mlock',
+            action='store_true',
+            default=default(False),
+            help='Warn if model weights cannot be pinned in RAM (for Ollama use_mlock)'
+        )
+        common.add_argument(
+            '--budget-workloads',
+            action='store_true',
+            default=default(False),
+            help='Plan against RAM and VRAM left over by other running processes'
+        )
+        common.add_argument(
+            '--disk-plan',
+            metavar='WORKFLOW[:QUANT]',
+            default=default(None),
+            help=f"Forecast peak disk usage of a workflow ({', '.join(DISK_WORKFLOWS)}), e.g. convert:Q4_K_M"
+        )
+        common.add_argument(
+            '--keep-versions',
+            type=int,
+            default=default(1),
+            help='Model versions kept side by side for --disk-plan (default: 1)'
+        )
+        common.add_argument(
+            '--check-fallocate',
+            action='store_true',
+            default=default(False),
+            help='Briefly preallocate the forecast peak in --target-dir to prove it can be reserved'
+        )
+        common.add_argument(
+            '--watch',
+            action='store_true',
+            default=default(False),
+            help='Keep running and stream changed report sections as NDJSON on '
+                 'target directory or cgroup limit changes (Linux only)'
+        )
+        return common
+
     parser = argparse.ArgumentParser(
-        description="Validate system requirements for Strawberrylemonade-L3-70B-v1.1 deployment"
+        description="Validate system requirements for Strawberrylemonade-L3-70B-v1.1 deployment",
+        parents=[common_options(with_defaults=True)]
+    )
+    common = common_options(with_defaults=False)
+
+    subparsers = parser.add_subparsers(dest='command')
+    verify_parser = subparsers.add_parser(
+        'verify',
+        parents=[common],
+        help='Also verify model blobs under --target-dir against their sha256 digests'
     )
-    parser.add_argument(
-        '--target-dir',
-        default='.',
-        help='Target directory for storage check (default: current directory)'
+    verify_parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='Number of blobs to hash in parallel (default: one per CPU)'
     )
-    parser.add_argument(
-        '--output',
-        default='system_validation_report.json',
-        help='Output file for JSON report (default: system_validation_report.json)'
+
+    simulate_parser = subparsers.add_parser(
+        'simulate',
+        parents=[common],
+        help='Validate synthetic host profiles instead of this machine and compare them'
     )
-    parser.add_argument(
-        '--quiet',
-        action='store_true',
-        help='Suppress console output (only save to file)'
+    simulate_parser.add_argument(
+        'profiles',
+        help='JSON or TOML file with one host profile or a "profiles" list'
+    )
+
+    fleet_parser = subparsers.add_parser(
+        'fleet',
+        parents=[common],
+        help='Validate many hosts concurrently and stream their reports as NDJSON '
+             '(default output: system_validation_report.ndjson)'
+    )
+    fleet_parser.add_argument(
+        'hosts',
+        nargs='*',
+        help='Host names (SSH destinations, or container names for --transport container)'
+    )
+    fleet_parser.add_argument(
+        '--hosts-file',
+        default=None,
+        help='File with one host per line (# starts a comment)'
+    )
+    fleet_parser.add_argument(
+        '--transport',
+        choices=sorted(TRANSPORTS),
+        default='ssh',
+        help='How to reach hosts (default: ssh)'
+    )
+    fleet_parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=16,
+        help='Maximum hosts validated at once (default: 16)'
+    )
+    fleet_parser.add_argument(
+        '--timeout',
+        type=float,
+        default=120.0,
+        help='Per-host timeout in seconds (default: 120)'
     )
 
     args = parser.parse_args()
+    if args.command == 'simulate':
+        # Profiles describe hardware only, and the comparison table is the only output
+        local_options = (
+            ('target_dir', '--target-dir'), ('output', '--output'), ('output_format', '--format'),
+            ('watch', '--watch'), ('mlock', '--mlock'), ('budget_workloads', '--budget-workloads'),
+            ('disk_plan', '--disk-plan'), ('keep_versions', '--keep-versions'),
+            ('check_fallocate', '--check-fallocate'),
+        )
+        for dest, flag in local_options:
+            if getattr(args, dest) != parser.get_default(dest):
+                parser.error(f"{flag} cannot be used with simulate")
+    if args.output_format is None:
+        args.output_format = 'ndjson' if args.watch or args.command == 'fleet' else 'json'
+
+    def disk_plan_for(model: ModelProfile) -> Optional[Tuple[str, str, int]]:
+        """Check --disk-plan against the model, failing the way argparse does"""
+        if args.keep_versions < 1:
+            parser.error("--keep-versions must be at least 1")
+        if not args.disk_plan:
+            return None
+        workflow, _, quantization = args.disk_plan.partition(':')
+        quantization = quantization or model.default_quantization
+        if workflow not in DISK_WORKFLOWS:
+            parser.error(f"--disk-plan workflow must be one of: {', '.join(DISK_WORKFLOWS)}")
+        if quantization not in model.sizes_gb:
+            parser.error(
+                f"--disk-plan quantization {quantization} has no size for {model.name} "
+                f"(known: {', '.join(model.sizes_gb)})"
+            )
+        if workflow != 'pull' and not (model.source_size_gb or estimate_source_size_gb(model.sizes_gb)):
+            parser.error(f"--disk-plan {workflow} needs source_size_gb in the profile of {model.name}")
+        return workflow, quantization, args.keep_versions
+
+    if args.command == 'fleet':
+        hosts = list(args.hosts)
+        if args.hosts_file:
+            with open(args.hosts_file, 'r') as f:
+                hosts.extend(line.split('#')[0].strip() for line in f if line.split('#')[0].strip())
+        if not hosts:
+            parser.error("fleet needs at least one host")
+
+        # Hosts receive only this script, so options must make sense on their own
+        if args.models:
+            parser.error("--models cannot be used with fleet: remote hosts only have the built-in model profiles")
+        if args.watch:
+            parser.error("--watch cannot be used with fleet")
+        if args.output_format == 'compact':
+            parser.error("fleet streams NDJSON host events; --format compact is not supported")
+        try:
+            model = resolve_models(load_model_profiles(), [args.model] + (args.co_resident or []))[0][0]
+        except ValueError as e:
+            parser.error(str(e))
+        disk_plan_for(model)
+
+        remote_args = ['--target-dir', args.target_dir, '--model', args.model]
+        if args.co_resident:
+            remote_args += ['--co-resident'] + args.co_resident
+        if args.disk_plan:
+            remote_args += ['--disk-plan', args.disk_plan, '--keep-versions', str(args.keep_versions)]
+        for flag in ('mlock', 'budget_workloads', 'check_fallocate'):
+            if getattr(args, flag):
+                remote_args.append('--' + flag.replace('_', '-'))
+        results = run_fleet(hosts, TRANSPORTS[args.transport](), remote_args, args.concurrency, args.timeout)
+
+        output = args.output
+        if output == parser.get_default('output'):
+            # Host events are a stream of JSON lines, not one JSON document
+            output = str(Path(output).with_suffix('.ndjson'))
+        to_stdout = output == '-'
+        stream = sys.stdout if to_stdout else open(output, 'w')
+        failed = False
+        try:
+            writer = NDJSONWriter(stream)
+            for result in results:
+                failed |= result.report is None or result.report.overall_status == "FAILED"
+                writer.emit({
+                    'schema_version': REPORT_SCHEMA_VERSION,
+                    'type': 'host',
+                    'host': result.host,
+                    'error': result.error,
+                    'elapsed_seconds': result.elapsed_seconds,
+                    'data': to_serializable(result.report),
+                })
+                if not args.quiet:
+                    status = result.report.overall_status if result.report else f"ERROR ({result.error})"
+                    print(f"{result.host}: {status} [{result.elapsed_seconds}s]", file=sys.stderr)
+        finally:
+            if not to_stdout:
+                stream.close()
+        sys.exit(1 if failed else 0)
+
+    try:
+        registry = load_model_profiles(args.models)
+        model = resolve_models(registry, [args.model])[0][0]
+        co_resident = resolve_models(registry, args.co_resident or [])
+    except OSError as e:
+        parser.error(f"Cannot read model registry {args.models}: {e.strerror}")
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.command == 'simulate':
+        try:
+            profiles = load_host_profiles(args.profiles)
+        except OSError as e:
+            parser.error(f"Cannot read host profiles {args.profiles}: {e.strerror}")
+        except ValueError as e:
+            parser.error(str(e))
+        results = simulate_profiles(profiles, model, co_resident)
+        print(format_simulation_table(results))
+        sys.exit(0)
 
-    validator = SystemValidator(target_dir=args.target_dir)
-    report = validator.validate()
+    if args.watch:
+        if platform.system() != "Linux":
+            parser.error("--watch needs inotify and only runs on Linux")
+        if args.output_format != 'ndjson':
+            parser.error("--watch streams NDJSON; --format json and compact are not supported")
+    disk_plan = disk_plan_for(model)
+
+    validator = SystemValidator(
+        target_dir=args.target_dir,
+        model=model,
+        co_resident=co_resident,
+        use_mlock=args.mlock,
+        disk_plan=disk_plan,
+        check_fallocate=args.check_fallocate,
+        budget_workloads=args.budget_workloads
+    )
+    to_stdout = args.output == '-'
+    validate_kwargs = {}
+    if args.command == 'verify':
+        validate_kwargs.update(verify_blobs=True, verify_workers=args.workers)
 
-    if not args.quiet:
+    if args.watch:
+        stream = sys.stdout if to_stdout else open(args.output, 'w')
+        try:
+            validator.watch(NDJSONWriter(stream), **validate_kwargs)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if not to_stdout:
+                stream.close()
+        sys.exit(0)
+
+    if args.output_format == 'ndjson':
+        # Stream each probe's result as soon as it completes
+        stream = sys.stdout if to_stdout else open(args.output, 'w')
+        try:
+            writer = NDJSONWriter(stream)
+            report = validator.validate(on_probe=writer.emit_probe, **validate_kwargs)
+            writer.emit_summary(report)
+        finally:
+            if not to_stdout:
+                stream.close()
+    else:
+        report = validator.validate(**validate_kwargs)
+
+    # The human-readable report would corrupt machine output on stdout
+    if not args.quiet and not to_stdout:
         validator.print_report(report)
 
-    validator.save_report(report, output_path=args.output)
+    if to_stdout:
+        if args.output_format == 'compact':
+            validator.write_report(report, sys.stdout.buffer, 'compact')
+            sys.stdout.buffer.flush()
+        elif args.output_format == 'json':
+            sys.stdout.write(validator.render(report).render('json') + "\n")
+    elif args.output_format == 'ndjson':
+        if not args.quiet:
+            print(f"Report saved to: {Path(args.output).resolve()}")
+    else:
+        validator.save_report(
+            report, output_path=args.output, output_format=args.output_format, quiet=args.quiet
+        )
 
     # Exit with appropriate code
     if report.overall_status == "FAILED":
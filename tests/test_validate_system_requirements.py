@@ -9,9 +9,16 @@ Author: Cherry Studio Integration Team
 Version: 1.0.0
 """
 
+import ctypes
+import hashlib
+import io
 import json
+import struct
+import subprocess
 import sys
 import tempfile
+import threading
+import time
 import unittest
 from dataclasses import asdict
 from pathlib import Path
@@ -23,10 +30,49 @@ sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts'))
 from validate_system_requirements import (
     CPUInfo,
     GPUInfo,
+    HOST_VM_INFO64,
+    IN_CREATE,
+    InotifyWatcher,
+    IntegrityInfo,
+    ContainerTransport,
+    DEFAULT_MODEL_NAME,
+    DiskForecast,
     MemoryInfo,
+    MEMORYSTATUSEX_FORMAT,
+    MNT_LOCAL,
+    MNT_NOATIME,
+    MemoryLockInfo,
+    ModelProfile,
+    NDJSONWriter,
+    OffloadPlan,
+    PREALLOCATE_PREFIX,
+    REPORT_SCHEMA_VERSION,
+    RELATION_PROCESSOR_CORE,
+    ResourceBudgetInfo,
+    ReportRenderer,
+    SSHTransport,
+    STATFS_FORMAT,
+    SubprocessTransport,
     StorageInfo,
+    SimulatedValidator,
     SystemReport,
     SystemValidator,
+    VM_STATISTICS64_FORMAT,
+    Transport,
+    format_simulation_table,
+    hash_blob,
+    load_host_profiles,
+    load_model_profiles,
+    main,
+    pack_compact,
+    parse_mountinfo,
+    report_from_dict,
+    run_fleet,
+    parse_host_profile,
+    resolve_models,
+    simulate_profiles,
+    to_serializable,
+    validate_report_schema,
 )
 
 
@@ -196,6 +242,24 @@ MemAvailable:   28000000 kB
         self.assertTrue(gpu.is_available)
         self.assertIn("Q6_K", gpu.recommended_quantization)
 
+    @patch('subprocess.run')
+    def test_get_gpu_info_multiple_gpus(self, mock_run):
+        """Test only the first nvidia-smi line is parsed on multi-GPU hosts"""
+        mock_run.side_effect = [
+            Mock(stdout="NVIDIA RTX 5090, 32768, 560.35, 00000000:01:00.0\n"
+                        "NVIDIA RTX 4090, 24564, 560.35, 00000000:02:00.0\n"),
+            Mock(stdout="CUDA Version: 12.6"),
+            Mock(stdout="12.0\n8.9\n"),
+        ]
+
+        with patch.object(self.validator, 'get_pcie_link_info', return_value={}) as link:
+            gpu = self.validator.get_gpu_info()
+
+        link.assert_called_once_with("00000000:01:00.0")
+        self.assertEqual(gpu.name, "NVIDIA RTX 5090")
+        self.assertEqual(gpu.vram_gb, 32.0)
+        self.assertEqual(gpu.compute_capability, "12.0")
+
     @patch('subprocess.run')
     def test_get_gpu_info_no_nvidia(self, mock_run):
         """Test GPU info when no NVIDIA GPU is present"""
@@ -401,6 +465,1712 @@ class TestQuantizationRecommendations(unittest.TestCase):
             self.assertIn("Q4_K_M", gpu.recommended_quantization)
 
 
+class TestPCIeLink(unittest.TestCase):
+    """Test PCIe link detection from sysfs fixtures and offload planning"""
+
+    def setUp(self):
+        self.validator = SystemValidator(target_dir="/tmp")
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.pci_root = Path(self.tmpdir.name)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def make_device(self, address, vendor="0x10de", device_class="0x030000",
+                    current_speed="32.0 GT/s PCIe", max_speed="32.0 GT/s PCIe",
+                    current_width="16", max_width="16"):
+        """Create a fake sysfs PCI device directory"""
+        device_dir = self.pci_root / address
+        device_dir.mkdir()
+        (device_dir / 'vendor').write_text(vendor + "\n")
+        (device_dir / 'class').write_text(device_class + "\n")
+        (device_dir / 'current_link_speed').write_text(current_speed + "\n")
+        (device_dir / 'max_link_speed').write_text(max_speed + "\n")
+        (device_dir / 'current_link_width').write_text(current_width + "\n")
+        (device_dir / 'max_link_width').write_text(max_width + "\n")
+        return device_dir
+
+    def make_gpu(self, vram_gb, **link):
+        return GPUInfo("Test GPU", vram_gb, "12.6", "560.35", "8.9", True,
+                       "Q4_K_M (partial GPU offload)", **link)
+
+    def test_link_by_bus_id(self):
+        """Test nvidia-smi bus id is mapped onto the sysfs device"""
+        self.make_device("0000:01:00.0", current_speed="8.0 GT/s PCIe", current_width="4")
+
+        with patch.object(SystemValidator, 'SYSFS_PCI_DEVICES', self.pci_root):
+            link = self.validator.get_pcie_link_info("00000000:01:00.0")
+
+        self.assertEqual(link['pci_bus_id'], "0000:01:00.0")
+        self.assertEqual(link['pcie_gen_current'], 3)
+        self.assertEqual(link['pcie_gen_max'], 5)
+        self.assertEqual(link['pcie_width_current'], 4)
+        self.assertEqual(link['pcie_width_max'], 16)
+
+    def test_link_fallback_scans_for_nvidia_display(self):
+        """Test the first NVIDIA display controller is used without a bus id"""
+        self.make_device("0000:00:02.0", vendor="0x8086")
+        self.make_device("0000:02:00.0", current_speed="16.0 GT/s PCIe")
+
+        with patch.object(SystemValidator, 'SYSFS_PCI_DEVICES', self.pci_root):
+            link = self.validator.get_pcie_link_info()
+
+        self.assertEqual(link['pci_bus_id'], "0000:02:00.0")
+        self.assertEqual(link['pcie_gen_current'], 4)
+
+    def test_link_missing_sysfs(self):
+        """Test missing sysfs leaves link fields unknown"""
+        with patch.object(SystemValidator, 'SYSFS_PCI_DEVICES', self.pci_root / 'missing'):
+            link = self.validator.get_pcie_link_info()
+
+        self.assertIsNone(link['pcie_gen_current'])
+        self.assertIsNone(link['pcie_width_current'])
+
+    def test_pcie_bandwidth(self):
+        """Test link bandwidth calculation"""
+        self.assertAlmostEqual(SystemValidator.pcie_bandwidth_gbps(5, 16), 63.01, places=1)
+        self.assertAlmostEqual(SystemValidator.pcie_bandwidth_gbps(3, 4), 3.94, places=1)
+        self.assertIsNone(SystemValidator.pcie_bandwidth_gbps(None, 16))
+
+    def test_plan_offload_split(self):
+        """Test partial offload split and transfer estimate"""
+        gpu = self.make_gpu(16.0, pcie_gen_current=4, pcie_width_current=16)
+
+        plan = self.validator.plan_offload(gpu)
+
+        self.assertIsInstance(plan, OffloadPlan)
+        self.assertGreater(plan.gpu_layers, 0)
+        self.assertLess(plan.gpu_layers, plan.total_layers)
+        self.assertGreater(plan.host_resident_gb, 0)
+        self.assertAlmostEqual(
+            plan.transfer_ms_per_batch,
+            plan.host_resident_gb / plan.pcie_bandwidth_gbps * 1000,
+            delta=0.1
+        )
+
+    def test_validate_flags_downgraded_link(self):
+        """Test validation warns on a narrowed link and reports transfer cost"""
+        gpu = self.make_gpu(16.0, pcie_gen_current=3, pcie_gen_max=5,
+                            pcie_width_current=4, pcie_width_max=16)
+
+        with patch.object(self.validator, 'get_cpu_info') as mock_cpu, \
+             patch.object(self.validator, 'get_memory_info') as mock_memory, \
+             patch.object(self.validator, 'get_gpu_info') as mock_gpu, \
+             patch.object(self.validator, 'get_storage_info') as mock_storage:
+
+            mock_cpu.return_value = CPUInfo("Test CPU", 8, 16, "x86_64", True, False)
+            mock_memory.return_value = MemoryInfo(64.0, 60.0, True, True)
+            mock_gpu.return_value = gpu
+            mock_storage.return_value = StorageInfo(500.0, 200.0, True, "ext4")
+
+            report = self.validator.validate()
+
+        self.assertTrue(any("x4" in w for w in report.warnings))
+        self.assertTrue(any("Gen3" in r for r in report.recommendations))
+        self.assertIsNotNone(report.offload_plan)
+        self.assertTrue(any("prompt-processing batch" in r for r in report.recommendations))
+        self.assertFalse(any("ms/token" in r for r in report.recommendations))
+
+
+class TestBlobVerification(unittest.TestCase):
+    """Test model blob integrity verification"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.blobs_dir = Path(self.tmpdir.name) / 'models' / 'blobs'
+        self.blobs_dir.mkdir(parents=True)
+        self.validator = SystemValidator(target_dir=self.tmpdir.name)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def write_blob(self, data, corrupt=False):
+        """Write a content-addressed blob, optionally under the wrong digest"""
+        digest = hashlib.sha256(data + b"x" if corrupt else data).hexdigest()
+        path = self.blobs_dir / f"sha256-{digest}"
+        path.write_bytes(data)
+        return path
+
+    def test_hash_blob_matches_hashlib(self):
+        """Test chunked mmap hashing matches a plain sha256"""
+        data = b"weights" * 10000
+        path = self.write_blob(data)
+
+        _, digest, size, _ = hash_blob(str(path), chunk_size=4096)
+
+        self.assertEqual(digest, hashlib.sha256(data).hexdigest())
+        self.assertEqual(size, len(data))
+
+    def test_hash_empty_blob(self):
+        """Test empty files hash without mapping"""
+        path = self.write_blob(b"")
+
+        _, digest, size, _ = hash_blob(str(path))
+
+        self.assertEqual(digest, hashlib.sha256(b"").hexdigest())
+        self.assertEqual(size, 0)
+
+    def test_find_model_blobs_ignores_other_files(self):
+        """Test only content-addressed blob names are collected"""
+        self.write_blob(b"a")
+        (self.blobs_dir / 'manifest.json').write_text("{}")
+
+        blobs = self.validator.find_model_blobs()
+
+        self.assertEqual(len(blobs), 1)
+
+    def test_verify_reports_mismatch(self):
+        """Test a corrupt blob is reported as a mismatch"""
+        self.write_blob(b"good")
+        bad = self.write_blob(b"bad", corrupt=True)
+
+        integrity = self.validator.verify_model_blobs(workers=1, progress=False)
+
+        self.assertIsInstance(integrity, IntegrityInfo)
+        self.assertEqual(integrity.blobs_checked, 2)
+        self.assertEqual(integrity.bytes_hashed, 7)
+        self.assertEqual([m.path for m in integrity.mismatches], [str(bad)])
+
+    def test_verify_in_process_pool(self):
+        """Test parallel verification gives the same result as serial"""
+        for i in range(4):
+            self.write_blob(f"blob {i}".encode() * 1000)
+        self.write_blob(b"bad", corrupt=True)
+
+        integrity = self.validator.verify_model_blobs(workers=2, progress=False)
+
+        self.assertEqual(integrity.blobs_checked, 5)
+        self.assertEqual(len(integrity.mismatches), 1)
+
+    def test_validate_fails_on_corrupt_blob(self):
+        """Test mismatches are surfaced in the report and fail validation"""
+        self.write_blob(b"bad", corrupt=True)
+
+        with patch.object(self.validator, 'get_cpu_info') as mock_cpu, \
+             patch.object(self.validator, 'get_memory_info') as mock_memory, \
+             patch.object(self.validator, 'get_gpu_info') as mock_gpu, \
+             patch.object(self.validator, 'get_storage_info') as mock_storage, \
+             patch('sys.stderr'):
+
+            mock_cpu.return_value = CPUInfo("Test CPU", 8, 16, "x86_64", True, False)
+            mock_memory.return_value = MemoryInfo(32.0, 28.0, True, False)
+            mock_gpu.return_value = None
+            mock_storage.return_value = StorageInfo(500.0, 200.0, True, "ext4")
+
+            report = self.validator.validate(verify_blobs=True, verify_workers=1)
+
+        self.assertEqual(report.overall_status, "FAILED")
+        self.assertEqual(len(report.integrity.mismatches), 1)
+        self.assertTrue(any("corrupt" in w for w in report.warnings))
+
+
+class TestOutputFormats(unittest.TestCase):
+    """Test versioned report serialization and output formats"""
+
+    def setUp(self):
+        self.validator = SystemValidator(target_dir="/tmp")
+        self.report = SystemReport(
+            cpu=CPUInfo("Test CPU", 8, 16, "x86_64", True, False),
+            memory=MemoryInfo(32.0, 28.0, True, False),
+            gpu=GPUInfo("Test GPU", 24.0, "12.0", "550.0", "8.9", True, "Q5_K_M"),
+            storage=StorageInfo(500.0, 200.0, True, "ext4"),
+            overall_status="PASSED",
+            recommendations=["Test recommendation"],
+            warnings=[],
+            timestamp="2025-01-01T00:00:00"
+        )
+
+    def test_to_serializable_matches_asdict(self):
+        """Test the converter produces the same structure as asdict"""
+        self.assertEqual(to_serializable(self.report), asdict(self.report))
+
+    def test_serialize_report_is_versioned(self):
+        """Test serialized reports carry the schema version and validate"""
+        data = self.validator.serialize_report(self.report)
+
+        self.assertEqual(data['schema_version'], REPORT_SCHEMA_VERSION)
+        validate_report_schema(data)
+
+    def test_schema_rejects_bad_reports(self):
+        """Test schema validation catches missing, mistyped and versioned fields"""
+        data = self.validator.serialize_report(self.report)
+
+        missing = dict(data)
+        del missing['storage']
+        with self.assertRaises(ValueError):
+            validate_report_schema(missing)
+
+        mistyped = json.loads(json.dumps(data))
+        mistyped['cpu']['cores'] = "eight"
+        with self.assertRaisesRegex(ValueError, "cpu.cores"):
+            validate_report_schema(mistyped)
+
+        with self.assertRaisesRegex(ValueError, "schema version"):
+            validate_report_schema(dict(data, schema_version=REPORT_SCHEMA_VERSION + 1))
+
+    def test_ndjson_streams_probes_as_they_complete(self):
+        """Test each probe is written before the next probe runs"""
+        stream = io.StringIO()
+        writer = NDJSONWriter(stream)
+        lines_seen = []
+
+        def memory_probe():
+            lines_seen.append(len(stream.getvalue().splitlines()))
+            return self.report.memory
+
+        with patch.object(self.validator, 'get_cpu_info', return_value=self.report.cpu), \
+             patch.object(self.validator, 'get_memory_info', side_effect=memory_probe), \
+             patch.object(self.validator, 'get_gpu_info', return_value=None), \
+             patch.object(self.validator, 'get_storage_info', return_value=self.report.storage):
+            report = self.validator.validate(on_probe=writer.emit_probe)
+        writer.emit_summary(report)
+
+        events = [json.loads(line) for line in stream.getvalue().splitlines()]
+        self.assertEqual(lines_seen, [1])
+        self.assertEqual(
+            [e.get('probe') for e in events],
+            ['cpu', 'memory', 'gpu', 'memory_lock', 'storage', None]
+        )
+        self.assertEqual(events[-1]['type'], 'summary')
+        self.assertEqual(events[-1]['data']['overall_status'], report.overall_status)
+        self.assertTrue(all(e['schema_version'] == REPORT_SCHEMA_VERSION for e in events))
+
+    def test_pack_compact_msgpack_encoding(self):
+        """Test compact output follows the MessagePack wire format"""
+        self.assertEqual(pack_compact(None), b'\xc0')
+        self.assertEqual(pack_compact(True), b'\xc3')
+        self.assertEqual(pack_compact(5), b'\x05')
+        self.assertEqual(pack_compact(-1), b'\xff')
+        self.assertEqual(pack_compact(300), b'\xce\x00\x00\x01\x2c')
+        self.assertEqual(pack_compact(1.5), b'\xcb\x3f\xf8' + b'\x00' * 6)
+        self.assertEqual(pack_compact("ab"), b'\xa2ab')
+        self.assertEqual(pack_compact([1, 2]), b'\x92\x01\x02')
+        self.assertEqual(pack_compact({"a": 1}), b'\x81\xa1a\x01')
+
+    def test_save_report_formats(self):
+        """Test every output format can be saved and read back"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for output_format in ('json', 'ndjson', 'compact'):
+                path = Path(tmpdir) / f"report.{output_format}"
+                with patch('builtins.print'):
+                    self.validator.save_report(self.report, str(path), output_format)
+                self.assertGreater(path.stat().st_size, 0)
+
+            lines = (Path(tmpdir) / "report.ndjson").read_text().splitlines()
+            self.assertEqual(len(lines), 5)
+            compact = (Path(tmpdir) / "report.compact").read_bytes()
+            self.assertLess(len(compact), (Path(tmpdir) / "report.json").stat().st_size)
+
+
+@unittest.skipUnless(sys.platform.startswith('linux'), "inotify is Linux only")
+class TestWatchMode(unittest.TestCase):
+    """Test inotify-driven incremental re-validation"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.target = Path(self.tmpdir.name)
+        self.validator = SystemValidator(target_dir=self.tmpdir.name)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_inotify_watcher_reports_created_file(self):
+        """Test the ctypes inotify binding delivers events"""
+        watcher = InotifyWatcher()
+        try:
+            watcher.add(str(self.target), IN_CREATE)
+            (self.target / 'blob').write_bytes(b"x")
+
+            events = watcher.read(timeout=2)
+        finally:
+            watcher.close()
+
+        self.assertEqual(events[0][0], str(self.target))
+        self.assertEqual(events[0][2], 'blob')
+
+    def test_inotify_watcher_times_out_without_events(self):
+        """Test an idle watcher returns nothing after the timeout"""
+        watcher = InotifyWatcher()
+        try:
+            watcher.add(str(self.target), IN_CREATE)
+            self.assertEqual(watcher.read(timeout=0.01), [])
+        finally:
+            watcher.close()
+
+    def test_watch_targets_cover_target_tree(self):
+        """Test every directory under the target is watched for storage"""
+        (self.target / 'models' / 'blobs').mkdir(parents=True)
+
+        targets = self.validator.watch_targets(verify_blobs=True)
+
+        self.assertIn(str(self.target / 'models' / 'blobs'), targets)
+        self.assertEqual(targets[str(self.target)][1], {'storage', 'integrity'})
+
+    def test_watch_reemits_only_changed_sections(self):
+        """Test a file change re-runs storage only and emits just what changed"""
+        stream = io.StringIO()
+        storage_calls = []
+
+        def storage_probe():
+            storage_calls.append(1)
+            available = 200.0 - len(list(self.target.iterdir()))
+            return StorageInfo(500.0, available, True, "ext4")
+
+        with patch.object(self.validator, 'get_cpu_info') as mock_cpu, \
+             patch.object(self.validator, 'get_memory_info') as mock_memory, \
+             patch.object(self.validator, 'get_gpu_info', return_value=None), \
+             patch.object(self.validator, 'get_storage_info', side_effect=storage_probe), \
+             patch.object(self.validator, '_find_pci_device', return_value=None):
+
+            mock_cpu.return_value = CPUInfo("Test CPU", 8, 16, "x86_64", True, False)
+            mock_memory.return_value = MemoryInfo(32.0, 28.0, True, False)
+
+            timer = threading.Timer(0.2, lambda: (self.target / 'new.gguf').write_bytes(b"x"))
+            timer.start()
+            try:
+                self.validator.watch(NDJSONWriter(stream), debounce=0.05, max_updates=1)
+            finally:
+                timer.cancel()
+
+        events = [json.loads(line) for line in stream.getvalue().splitlines()]
+        initial, updates = events[:6], events[6:]
+        self.assertEqual(initial[-1]['type'], 'summary')
+        self.assertEqual(mock_cpu.call_count, 1)
+        self.assertEqual(len(storage_calls), 2)
+        self.assertEqual([e.get('probe') for e in updates], ['storage'])
+        self.assertEqual(updates[0]['data']['available_gb'], 199.0)
+
+    def test_watch_ignores_own_preallocation(self):
+        """Test the --check-fallocate file does not retrigger the forecast"""
+        stream = io.StringIO()
+        self.validator.disk_plan = ('pull', 'Q4_K_M', 1)
+        self.validator.check_fallocate = True
+
+        def storage_probe():
+            available = 200.0 - len([p for p in self.target.iterdir() if not p.name.startswith('.')])
+            return StorageInfo(500.0, available, True, "ext4")
+
+        def preallocate(size_gb):
+            (self.target / f"{PREALLOCATE_PREFIX}test").write_bytes(b"x")
+            (self.target / f"{PREALLOCATE_PREFIX}test").unlink()
+            return "ok"
+
+        with patch.object(self.validator, 'get_cpu_info') as mock_cpu, \
+             patch.object(self.validator, 'get_memory_info') as mock_memory, \
+             patch.object(self.validator, 'get_gpu_info', return_value=None), \
+             patch.object(self.validator, 'get_storage_info', side_effect=storage_probe), \
+             patch.object(self.validator, 'try_preallocate', side_effect=preallocate), \
+             patch.object(self.validator, '_find_pci_device', return_value=None):
+
+            mock_cpu.return_value = CPUInfo("Test CPU", 8, 16, "x86_64", True, False)
+            mock_memory.return_value = MemoryInfo(32.0, 28.0, True, False)
+            timers = [
+                threading.Timer(0.2, lambda: (self.target / 'first.gguf').write_bytes(b"x")),
+                threading.Timer(0.8, lambda: (self.target / 'second.gguf').write_bytes(b"x")),
+            ]
+            for timer in timers:
+                timer.start()
+            try:
+                self.validator.watch(NDJSONWriter(stream), debounce=0.05, max_updates=2)
+            finally:
+                for timer in timers:
+                    timer.cancel()
+
+        events = [json.loads(line) for line in stream.getvalue().splitlines()]
+        storage = [e['data']['available_gb'] for e in events if e.get('probe') == 'storage']
+        # Each update was caused by an external file, not by the check itself
+        self.assertEqual(storage, [200.0, 199.0, 198.0])
+
+    def test_cgroup_limits_apply_to_probes(self):
+        """Test the CPU and memory probes report the cgroup's limits, not the host's"""
+        with tempfile.TemporaryDirectory() as cgroup_dir:
+            cgroup = Path(cgroup_dir)
+            (cgroup / 'memory.max').write_text("1073741824\n")
+            (cgroup / 'memory.current').write_text("268435456\n")
+            (cgroup / 'cpuset.cpus.effective').write_text("0-3,6\n")
+            (cgroup / 'cpu.max').write_text("250000 100000\n")
+
+            with patch.object(self.validator, '_cgroup_dirs', return_value=[cgroup]), \
+                 patch('platform.system', return_value="Linux"), \
+                 patch('subprocess.check_output', return_value=b"16\n"):
+                cpu = self.validator.get_cpu_info()
+                memory = self.validator.get_memory_info()
+
+        self.assertEqual(cpu.cores, 3)
+        self.assertEqual(memory.total_gb, 1.0)
+        self.assertLessEqual(memory.available_gb, 0.75)
+
+    @unittest.skipUnless(sys.platform.startswith('linux'), "inotify and /proc/meminfo are Linux only")
+    def test_watch_reemits_memory_on_cgroup_limit_change(self):
+        """Test a cgroup memory limit change re-emits the memory section"""
+        stream = io.StringIO()
+        with tempfile.TemporaryDirectory() as cgroup_dir:
+            limit_file = Path(cgroup_dir) / 'memory.max'
+            limit_file.write_text("2147483648\n")
+
+            with patch.object(self.validator, '_cgroup_dirs', return_value=[Path(cgroup_dir)]), \
+                 patch.object(self.validator, 'get_cpu_info') as mock_cpu, \
+                 patch.object(self.validator, 'get_gpu_info', return_value=None), \
+                 patch.object(self.validator, 'get_storage_info') as mock_storage, \
+                 patch.object(self.validator, '_find_pci_device', return_value=None):
+
+                mock_cpu.return_value = CPUInfo("Test CPU", 8, 16, "x86_64", True, False)
+                mock_storage.return_value = StorageInfo(500.0, 200.0, True, "ext4")
+                timer = threading.Timer(0.2, lambda: limit_file.write_text("1073741824\n"))
+                timer.start()
+                try:
+                    self.validator.watch(NDJSONWriter(stream), debounce=0.05, max_updates=1)
+                finally:
+                    timer.cancel()
+
+        events = [json.loads(line) for line in stream.getvalue().splitlines()]
+        memory = [e['data']['total_gb'] for e in events if e.get('probe') == 'memory']
+        self.assertEqual(memory, [2.0, 1.0])
+
+    def test_verify_skips_unchanged_blobs(self):
+        """Test repeated verification only hashes new or modified blobs"""
+        data = b"weights"
+        (self.target / f"sha256-{hashlib.sha256(data).hexdigest()}").write_bytes(data)
+
+        first = self.validator.verify_model_blobs(workers=1, progress=False)
+        with patch('validate_system_requirements.hash_blob') as mock_hash:
+            second = self.validator.verify_model_blobs(workers=1, progress=False)
+
+        mock_hash.assert_not_called()
+        self.assertEqual(first.bytes_hashed, len(data))
+        self.assertEqual(second.blobs_checked, 1)
+        self.assertEqual(second.bytes_hashed, 0)
+
+
+class TestSimulation(unittest.TestCase):
+    """Test what-if simulation against synthetic host profiles"""
+
+    RTX_5090_BOX = {
+        "name": "7700X + RTX 5090",
+        "cpu": {"model": "AMD Ryzen 7 7700X", "cores": 8, "threads": 16},
+        "memory": {"total_gb": 64, "bandwidth_gbps": 70},
+        "gpu": {"name": "RTX 5090", "vram_gb": 32, "bandwidth_gbps": 1792, "pcie_gen": 5, "pcie_width": 16},
+        "storage": {"total_gb": 2000, "available_gb": 1500, "filesystem": "ext4"},
+    }
+    CPU_ONLY_BOX = {
+        "name": "CPU only",
+        "cpu": {"cores": 16},
+        "memory": {"total_gb": 128, "bandwidth_gbps": 80},
+        "storage": {"total_gb": 1000},
+    }
+
+    def test_parse_host_profile(self):
+        """Test profile parsing fills defaults"""
+        profile = parse_host_profile(self.CPU_ONLY_BOX)
+
+        self.assertIsNone(profile.gpu)
+        self.assertEqual(profile.cpu.threads, 16)
+        self.assertEqual(profile.memory.available_gb, 128.0)
+        self.assertEqual(profile.storage.available_gb, 1000.0)
+
+    def test_parse_host_profile_names_missing_field(self):
+        """Test a profile without a required field raises ValueError naming profile and field"""
+        memory = {"bandwidth_gbps": 80}
+
+        with self.assertRaisesRegex(ValueError, "Host profile CPU only is missing memory.total_gb"):
+            parse_host_profile(dict(self.CPU_ONLY_BOX, memory=memory))
+        with self.assertRaisesRegex(ValueError, "Host profile CPU only is invalid"):
+            parse_host_profile(dict(self.CPU_ONLY_BOX, cpu={"cores": "many"}))
+
+    def test_simulated_validate_uses_profile_and_thresholds(self):
+        """Test validate() runs against the profile with overridden thresholds"""
+        data = dict(self.RTX_5090_BOX, thresholds={"MIN_RAM_GB": 96})
+        validator = SimulatedValidator(parse_host_profile(data))
+
+        report = validator.validate()
+
+        self.assertEqual(report.gpu.name, "RTX 5090")
+        self.assertIn("Q6_K", report.gpu.recommended_quantization)
+        self.assertFalse(report.memory.meets_minimum)
+        self.assertEqual(report.overall_status, "FAILED")
+
+    def test_simulated_probes_leave_profile_untouched(self):
+        """Test probe results are copies, so thresholds do not leak into the profile"""
+        profile = parse_host_profile(dict(self.RTX_5090_BOX, thresholds={"MIN_RAM_GB": 96}))
+
+        report = SimulatedValidator(profile).validate()
+
+        self.assertFalse(report.memory.meets_minimum)
+        self.assertIsNot(report.memory, profile.memory)
+        self.assertFalse(profile.cpu.meets_minimum)
+        self.assertEqual(profile.gpu.recommended_quantization, "")
+
+    def test_unknown_threshold_rejected(self):
+        """Test typos in threshold names are caught"""
+        data = dict(self.CPU_ONLY_BOX, thresholds={"MIN_RAM": 96})
+
+        with self.assertRaises(ValueError):
+            SimulatedValidator(parse_host_profile(data))
+
+    def test_only_numeric_requirement_thresholds_accepted(self):
+        """Test geometry constants and non-numeric values cannot be overridden"""
+        for thresholds in ({"MODEL_LAYERS": 40}, {"VRAM_RESERVED_GB": 0}, {"MIN_CPU_CORES": "8"},
+                           {"MIN_CPU_CORES": True}):
+            data = dict(self.CPU_ONLY_BOX, thresholds=thresholds)
+            with self.assertRaises(ValueError):
+                SimulatedValidator(parse_host_profile(data))
+
+        validator = SimulatedValidator(parse_host_profile(dict(self.CPU_ONLY_BOX, thresholds={"MIN_CPU_CORES": 4.5})))
+        self.assertEqual(validator.MIN_CPU_CORES, 4.5)
+
+    def test_estimate_tokens_per_s(self):
+        """Test bandwidth-bound throughput and fit estimates"""
+        validator = SystemValidator()
+        memory = MemoryInfo(128.0, 120.0, True, True)
+
+        cpu_only = validator.estimate_tokens_per_s("Q4_K_M", memory, None, ram_bandwidth_gbps=85.0)
+        too_big = validator.estimate_tokens_per_s("Q8_0", MemoryInfo(32.0, 30.0, True, False), None)
+
+        self.assertAlmostEqual(cpu_only, 2.0, places=1)
+        self.assertIsNone(too_big)
+
+    def test_simulate_profiles_picks_best_quant(self):
+        """Test batch simulation compares profiles and picks a quantization"""
+        profiles = [parse_host_profile(self.RTX_5090_BOX), parse_host_profile(self.CPU_ONLY_BOX)]
+
+        results = simulate_profiles(profiles)
+
+        gpu_box, cpu_box = results
+        self.assertGreater(gpu_box.tokens_per_s, cpu_box.tokens_per_s)
+        self.assertEqual(list(gpu_box.tokens_per_s_by_quant), ["Q8_0", "Q6_K", "Q5_K_M", "Q4_K_M"])
+        # Nothing reaches the target on CPU alone, so the fastest fit wins
+        self.assertEqual(cpu_box.best_quantization, "Q4_K_M")
+        self.assertTrue(any("GPU" in w for w in cpu_box.warnings))
+
+        table = format_simulation_table(results)
+        self.assertIn("7700X + RTX 5090", table)
+        self.assertEqual(len(table.splitlines()), 4)
+
+    def test_simulate_profiles_with_model(self):
+        """Test simulation scores the selected model instead of the built-in 70B"""
+        model = ModelProfile("llama3-8b", 32, {"Q8_0": 8.5, "Q4_K_M": 4.9}, requirements={"MIN_RAM_GB": 8})
+        profile = parse_host_profile(dict(self.CPU_ONLY_BOX, memory={"total_gb": 16, "bandwidth_gbps": 80}))
+
+        result, = simulate_profiles([profile], model)
+
+        self.assertEqual(list(result.tokens_per_s_by_quant), ["Q8_0", "Q4_K_M"])
+        self.assertEqual(result.best_quantization, "Q8_0")
+        self.assertFalse(any("RAM is" in w for w in result.warnings))
+
+    def test_load_host_profiles_json_and_toml(self):
+        """Test profiles load from JSON lists and TOML files"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            json_path = Path(tmpdir) / "hosts.json"
+            json_path.write_text(json.dumps({"profiles": [self.RTX_5090_BOX, self.CPU_ONLY_BOX]}))
+            toml_path = Path(tmpdir) / "host.toml"
+            toml_path.write_text(
+                'name = "toml box"\n'
+                '[cpu]\ncores = 12\n'
+                '[memory]\ntotal_gb = 96\n'
+                '[storage]\ntotal_gb = 500\n'
+            )
+
+            self.assertEqual([p.name for p in load_host_profiles(str(json_path))],
+                             ["7700X + RTX 5090", "CPU only"])
+            if sys.version_info >= (3, 11):
+                self.assertEqual(load_host_profiles(str(toml_path))[0].cpu.cores, 12)
+
+
+class TestModelProfiles(unittest.TestCase):
+    """Test the model registry and co-residency check"""
+
+    REGISTRY = {
+        "models": [
+            {
+                "name": "llama3-8b",
+                "layers": 32,
+                "sizes_gb": {"Q4_K_M": 4.9, "Q8_0": 8.5},
+                "kv_cache_gb": 1.0,
+                "requirements": {"MIN_RAM_GB": 8, "MIN_VRAM_GB": 6}
+            },
+            {
+                "name": "nomic-embed",
+                "layers": 12,
+                "sizes_gb": {"F16": 0.3},
+                "default_quantization": "F16"
+            }
+        ]
+    }
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        path = Path(self.tmpdir.name) / "models.json"
+        path.write_text(json.dumps(self.REGISTRY))
+        self.registry = load_model_profiles(str(path))
+        self.memory = MemoryInfo(64.0, 60.0, True, True)
+        self.storage = StorageInfo(500.0, 200.0, True, "ext4")
+        self.gpu = GPUInfo("RTX 4090", 24.0, "12.6", "560.35", "8.9", True, "Q5_K_M (full GPU offload)")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_registry_includes_builtin_profile(self):
+        """Test file profiles are added to the built-in 70B profile"""
+        self.assertIn(DEFAULT_MODEL_NAME, self.registry)
+        self.assertIsInstance(self.registry["llama3-8b"], ModelProfile)
+        self.assertEqual(self.registry[DEFAULT_MODEL_NAME].sizes_gb, SystemValidator.MODEL_SIZE_GB)
+
+    def test_resolve_models(self):
+        """Test name and name:quant specs resolve, unknown ones fail"""
+        resolved = resolve_models(self.registry, ["llama3-8b:Q8_0", "nomic-embed"])
+
+        self.assertEqual([(m.name, q) for m, q in resolved], [("llama3-8b", "Q8_0"), ("nomic-embed", "F16")])
+        with self.assertRaises(ValueError):
+            resolve_models(self.registry, ["missing"])
+        with self.assertRaises(ValueError):
+            resolve_models(self.registry, ["llama3-8b:Q2_K"])
+
+    def test_model_profile_replaces_thresholds(self):
+        """Test a model profile overrides the 70B class constants per instance"""
+        validator = SystemValidator(model=self.registry["llama3-8b"])
+
+        self.assertEqual(validator.MIN_RAM_GB, 8)
+        self.assertEqual(validator.MODEL_LAYERS, 32)
+        self.assertEqual(SystemValidator.MIN_RAM_GB, 32)
+
+    def test_model_without_q4_k_m(self):
+        """Test planning and recommendations use the profile's own quantizations"""
+        model = ModelProfile("qwen-14b", 48, {"Q8_0": 15.7, "Q6_K": 12.1}, default_quantization="Q6_K")
+        validator = SystemValidator(target_dir="/tmp", model=model)
+        gpu = GPUInfo("RTX 4000", 20.0, "12.6", "560.35", "8.9", True, validator.recommend_quantization(20.0))
+
+        with patch.object(validator, 'get_cpu_info', return_value=CPUInfo("Test CPU", 8, 16, "x86_64", True, False)), \
+             patch.object(validator, 'get_memory_info', return_value=self.memory), \
+             patch.object(validator, 'get_gpu_info', return_value=gpu), \
+             patch.object(validator, 'get_storage_info', return_value=self.storage):
+            report = validator.validate()
+
+        self.assertEqual(gpu.recommended_quantization, "Q6_K (partial GPU offload)")
+        self.assertEqual(report.offload_plan.quantization, "Q6_K")
+        self.assertEqual(validator.pin_footprint_gb(None), 12.1)
+        self.assertEqual(validator.recommend_quantization(40.0), "Q6_K or Q8_0 (full GPU offload)")
+        self.assertFalse(any("Q4_K_M" in r for r in report.recommendations))
+
+    def test_small_models_stay_on_gpu(self):
+        """Test models that fit in VRAM together are all placed on the GPU"""
+        validator = SystemValidator(
+            co_resident=resolve_models(self.registry, ["llama3-8b:Q8_0", "nomic-embed"])
+        )
+
+        info = validator.check_co_residency(self.memory, self.gpu, self.storage)
+
+        self.assertEqual(set(info.placements.values()), {"gpu"})
+        self.assertTrue(info.fits_in_memory)
+        self.assertAlmostEqual(info.disk_required_gb, 8.8)
+
+    def test_large_set_thrashes(self):
+        """Test a set exceeding RAM + VRAM is flagged as thrashing"""
+        validator = SystemValidator(co_resident=resolve_models(
+            self.registry, [f"{DEFAULT_MODEL_NAME}:Q6_K", f"{DEFAULT_MODEL_NAME}:Q4_K_M", "llama3-8b"]
+        ))
+
+        with patch.object(validator, 'get_cpu_info', return_value=CPUInfo("CPU", 8, 16, "x86_64", True, False)), \
+             patch.object(validator, 'get_memory_info', return_value=self.memory), \
+             patch.object(validator, 'get_gpu_info', return_value=self.gpu), \
+             patch.object(validator, 'get_storage_info', return_value=self.storage):
+            report = validator.validate()
+
+        placements = list(report.co_residency.placements.values())
+        self.assertEqual(placements, ["partial", "cpu", "cpu"])
+        self.assertFalse(report.co_residency.fits_in_memory)
+        self.assertTrue(any("evict" in w for w in report.warnings))
+
+
+class TestMountFeatures(unittest.TestCase):
+    """Test mount option and block queue analysis from procfs/sysfs fixtures"""
+
+    MOUNTINFO = (
+        "22 1 259:2 / / rw,relatime shared:1 - ext4 /dev/nvme0n1p2 rw\n"
+        "30 22 0:40 / /srv/nfs\\040models rw,noatime shared:5 - nfs4 nas:/export rw,vers=4.2\n"
+        "31 22 0:41 / /var/lib/ollama rw,noatime - btrfs /dev/sdb rw,compress=zstd:3,space_cache=v2\n"
+        "32 22 0:42 / /var/lib/ollama/overlay rw,relatime - overlay overlay rw,lowerdir=/l,upperdir=/u\n"
+    )
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        root = Path(self.tmpdir.name)
+        self.mountinfo = root / 'mountinfo'
+        self.mountinfo.write_text(self.MOUNTINFO)
+
+        # /sys/dev/block/259:2 -> partition of nvme0n1, queue lives on the disk
+        self.dev_block = root / 'dev' / 'block'
+        self.dev_block.mkdir(parents=True)
+        disk = root / 'devices' / 'nvme0n1'
+        (disk / 'queue').mkdir(parents=True)
+        (disk / 'queue' / 'read_ahead_kb').write_text("128\n")
+        (disk / 'queue' / 'rotational').write_text("0\n")
+        (disk / 'nvme0n1p2').mkdir()
+        (self.dev_block / '259:2').symlink_to(disk / 'nvme0n1p2')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def features(self, target):
+        validator = SystemValidator(target_dir="/")
+        validator.target_dir = Path(target)
+        with patch.object(SystemValidator, 'PROC_MOUNTINFO', self.mountinfo), \
+             patch.object(SystemValidator, 'SYSFS_DEV_BLOCK', self.dev_block):
+            return validator.get_mount_features()
+
+    def test_parse_mountinfo(self):
+        """Test fields, optional tags and octal escapes are handled"""
+        mounts = parse_mountinfo(self.MOUNTINFO)
+
+        self.assertEqual(len(mounts), 4)
+        self.assertEqual(mounts[1]['mount_point'], "/srv/nfs models")
+        self.assertEqual(mounts[1]['fstype'], "nfs4")
+        self.assertEqual(mounts[2]['super_options'][1], "compress=zstd:3")
+
+    def test_local_partition_reads_parent_queue(self):
+        """Test a partition on the root mount uses its disk's queue settings"""
+        features = self.features("/home/models")
+
+        self.assertEqual(features['filesystem'], "ext4")
+        self.assertEqual(features['mount_point'], "/")
+        self.assertEqual(features['read_ahead_kb'], 128)
+        self.assertFalse(features['rotational'])
+        self.assertFalse(features['noatime'])
+
+    def test_network_and_compressed_mounts(self):
+        """Test network filesystems and compression are detected"""
+        nfs = self.features("/srv/nfs models/llama")
+        btrfs = self.features("/var/lib/ollama/models")
+
+        self.assertTrue(nfs['is_network'])
+        self.assertTrue(nfs['noatime'])
+        self.assertEqual(btrfs['compression'], "zstd:3")
+        self.assertFalse(btrfs['is_network'])
+
+    def test_longest_mount_point_wins(self):
+        """Test a nested overlay mount shadows its parent"""
+        features = self.features("/var/lib/ollama/overlay/blobs")
+
+        self.assertTrue(features['is_overlay'])
+        self.assertEqual(features['mount_point'], "/var/lib/ollama/overlay")
+
+    def test_validate_warns_on_slow_mounts(self):
+        """Test network, overlay, compression and read-ahead findings reach the report"""
+        validator = SystemValidator(target_dir="/tmp")
+        storage = StorageInfo(
+            500.0, 200.0, True, "nfs4",
+            mount_options=["rw", "relatime"], is_network=True, is_overlay=True,
+            compression="zstd", read_ahead_kb=128, rotational=True
+        )
+
+        with patch.object(validator, 'get_cpu_info', return_value=CPUInfo("CPU", 8, 16, "x86_64", True, False)), \
+             patch.object(validator, 'get_memory_info', return_value=MemoryInfo(32.0, 28.0, True, False)), \
+             patch.object(validator, 'get_gpu_info', return_value=None), \
+             patch.object(validator, 'get_storage_info', return_value=storage):
+            report = validator.validate()
+
+        warnings = "\n".join(report.warnings)
+        recommendations = "\n".join(report.recommendations)
+        self.assertIn("network filesystem nfs4", warnings)
+        self.assertIn("overlayfs", warnings)
+        self.assertIn("rotational", warnings)
+        self.assertIn("compression (zstd)", recommendations)
+        self.assertIn("read-ahead is 128KB", recommendations)
+
+    def test_network_fuse_mount_warned_once(self):
+        """Test sshfs gets the network warning only, and local FUSE mounts the FUSE one"""
+        validator = SystemValidator(target_dir="/tmp")
+        cpu = CPUInfo("CPU", 8, 16, "x86_64", True, False)
+        memory = MemoryInfo(32.0, 28.0, True, False)
+
+        sshfs = validator.evaluate(cpu, memory, None, StorageInfo(500.0, 200.0, True, "fuse.sshfs", is_network=True))
+        local = validator.evaluate(cpu, memory, None, StorageInfo(500.0, 200.0, True, "fuse.mergerfs"))
+
+        self.assertEqual([w for w in sshfs.warnings if "filesystem fuse" in w.lower()], [
+            "Model directory is on network filesystem fuse.sshfs; mmap page faults will go over the network"
+        ])
+        self.assertIn("Model directory is on FUSE filesystem fuse.mergerfs", local.warnings)
+
+
+@unittest.skipUnless(sys.platform.startswith('linux'), "memory locking probe is Linux only")
+class TestMemoryLock(unittest.TestCase):
+    """Test memlock, hugepage and THP readiness from procfs/sysfs fixtures"""
+
+    def setUp(self):
+        import resource
+
+        self.resource = resource
+        self.tmpdir = tempfile.TemporaryDirectory()
+        root = Path(self.tmpdir.name)
+
+        self.status = root / 'status'
+        self.status.write_text("Name:\tpython\nCapEff:\t0000000000000000\n")
+        self.vm = root / 'vm'
+        self.vm.mkdir()
+        (self.vm / 'swappiness').write_text("60\n")
+        (self.vm / 'max_map_count').write_text("65530\n")
+        self.hugepages = root / 'hugepages'
+        pool = self.hugepages / 'hugepages-2048kB'
+        pool.mkdir(parents=True)
+        (pool / 'nr_hugepages').write_text("1024\n")
+        (pool / 'free_hugepages').write_text("512\n")
+        self.thp = root / 'thp_enabled'
+        self.thp.write_text("always [madvise] never\n")
+
+        self.validator = SystemValidator(target_dir="/tmp")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def probe(self, soft_limit, trial_ok=True, footprint_gb=40.0, available_gb=60.0):
+        with patch.object(SystemValidator, 'PROC_SELF_STATUS', self.status), \
+             patch.object(SystemValidator, 'PROC_SYS_VM', self.vm), \
+             patch.object(SystemValidator, 'SYSFS_HUGEPAGES', self.hugepages), \
+             patch.object(SystemValidator, 'SYSFS_THP_ENABLED', self.thp), \
+             patch.object(self.validator, '_trial_mlock', return_value=trial_ok) as trial, \
+             patch('resource.getrlimit', return_value=(soft_limit, soft_limit)):
+            info = self.validator.get_memory_lock_info(footprint_gb, available_gb)
+        return info, trial
+
+    def test_default_limit_cannot_pin_model(self):
+        """Test an 8MB memlock limit pins far less than the model needs"""
+        info, trial = self.probe(8 * 1024 * 1024)
+
+        self.assertIsInstance(info, MemoryLockInfo)
+        trial.assert_called_once_with(8 * 1024 * 1024)
+        self.assertAlmostEqual(info.pinnable_gb, 0.01, places=2)
+        self.assertFalse(info.can_pin_model)
+        self.assertEqual(info.hugepages_total_gb, 2.0)
+        self.assertEqual(info.hugepages_free_gb, 1.0)
+        self.assertEqual(info.thp_mode, "madvise")
+        self.assertEqual(info.vm_settings, {'swappiness': "60", 'max_map_count': "65530"})
+
+    def test_unlimited_limit_pins_available_ram(self):
+        """Test an unlimited memlock limit is bounded by available RAM"""
+        info, _ = self.probe(self.resource.RLIM_INFINITY)
+
+        self.assertIsNone(info.memlock_limit_gb)
+        self.assertEqual(info.pinnable_gb, 60.0)
+        self.assertTrue(info.can_pin_model)
+
+    def test_ipc_lock_capability_lifts_limit(self):
+        """Test CAP_IPC_LOCK is detected from CapEff"""
+        self.status.write_text("CapEff:\t0000000000004000\n")
+
+        info, _ = self.probe(0)
+
+        self.assertTrue(info.has_ipc_lock)
+        self.assertTrue(info.can_pin_model)
+
+    def test_failed_trial_pins_nothing(self):
+        """Test a failing trial lock means nothing can be pinned"""
+        info, _ = self.probe(self.resource.RLIM_INFINITY, trial_ok=False)
+
+        self.assertEqual(info.pinnable_gb, 0.0)
+        self.assertFalse(info.can_pin_model)
+
+    def test_trial_mlock_small_buffer(self):
+        """Test the ctypes mlock trial runs and reports a result"""
+        self.assertIsInstance(self.validator._trial_mlock(4096), bool)
+
+    def test_footprint_follows_offload_plan(self):
+        """Test the pinned footprint is the host-resident share of the split"""
+        gpu = GPUInfo("GPU", 24.0, "12.6", "560.35", "8.9", True, "Q5_K_M")
+
+        self.assertEqual(self.validator.pin_footprint_gb(None), SystemValidator.MODEL_SIZE_GB["Q4_K_M"])
+        self.assertEqual(self.validator.pin_footprint_gb(gpu), self.validator.plan_offload(gpu).host_resident_gb)
+
+    def test_validate_warns_only_when_mlock_requested(self):
+        """Test lock shortfalls become warnings only with use_mlock"""
+        info, _ = self.probe(8 * 1024 * 1024)
+        results = (
+            CPUInfo("CPU", 8, 16, "x86_64", True, False),
+            MemoryInfo(64.0, 60.0, True, True),
+            None,
+            StorageInfo(500.0, 200.0, True, "ext4"),
+        )
+
+        plain = self.validator.evaluate(*results, memory_lock=info)
+        self.validator.use_mlock = True
+        pinned = self.validator.evaluate(*results, memory_lock=info)
+
+        self.assertFalse(any("locked" in w for w in plain.warnings))
+        self.assertTrue(any("locked" in w for w in pinned.warnings))
+        self.assertTrue(any("LimitMEMLOCK" in r for r in pinned.recommendations))
+        self.assertTrue(any("nr_hugepages" in r for r in pinned.recommendations))
+
+
+class FakeFleetTransport(Transport):
+    """Stand-in transport answering for N fake hosts without any processes"""
+
+    name = "fake"
+
+    def __init__(self, reports, delay=0.05, hang=(), broken=()):
+        self.reports = reports
+        self.delay = delay
+        self.hang = set(hang)
+        self.broken = set(broken)
+        self.active = 0
+        self.max_active = 0
+        self.commands = []
+        self.lock = threading.Lock()
+
+    def run(self, host, command, stdin, timeout):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            self.commands.append(command)
+        try:
+            if host in self.hang:
+                time.sleep(timeout)
+                raise subprocess.TimeoutExpired(command, timeout)
+            time.sleep(self.delay)
+            stdout = b"not json" if host in self.broken else json.dumps(self.reports[host]).encode()
+            return subprocess.CompletedProcess(command, 0, stdout, b"Traceback: boom\n")
+        finally:
+            with self.lock:
+                self.active -= 1
+
+
+class TestFleet(unittest.TestCase):
+    """Test concurrent fleet validation over pluggable transports"""
+
+    def test_transports_must_implement_run(self):
+        """Test the transport base classes cannot be used without their hooks"""
+        with self.assertRaises(TypeError):
+            Transport()
+        with self.assertRaises(TypeError):
+            SubprocessTransport()
+
+    def make_report(self, cores):
+        cpu = CPUInfo("CPU", cores, cores * 2, "x86_64", cores >= 8, cores >= 12)
+        validator = SystemValidator(target_dir="/tmp")
+        report = validator.evaluate(
+            cpu, MemoryInfo(64.0, 60.0, True, True), None, StorageInfo(500.0, 200.0, True, "ext4")
+        )
+        return validator.serialize_report(report)
+
+    def test_report_round_trip(self):
+        """Test a serialized report rebuilds into equal dataclasses"""
+        validator = SystemValidator(target_dir="/tmp")
+        report = validator.evaluate(
+            CPUInfo("CPU", 8, 16, "x86_64", True, False),
+            MemoryInfo(32.0, 28.0, True, False),
+            GPUInfo("GPU", 16.0, "12.6", "560.35", "8.9", True, "Q4_K_M (partial GPU offload)",
+                    pcie_gen_current=4, pcie_width_current=16),
+            StorageInfo(500.0, 200.0, True, "ext4", mount_options=["rw"])
+        )
+
+        rebuilt = report_from_dict(json.loads(json.dumps(validator.serialize_report(report))))
+
+        self.assertEqual(rebuilt, report)
+
+    def test_fleet_streams_reports_with_bounded_concurrency(self):
+        """Test N fake hosts are validated at most `concurrency` at a time"""
+        hosts = [f"host{i:02d}" for i in range(12)]
+        transport = FakeFleetTransport({host: self.make_report(4 if host == "host03" else 16) for host in hosts})
+
+        results = list(run_fleet(hosts, transport, ['--target-dir', '/models'], concurrency=4, timeout=5))
+
+        self.assertEqual(sorted(r.host for r in results), hosts)
+        self.assertLessEqual(transport.max_active, 4)
+        self.assertGreater(transport.max_active, 1)
+        failed = [r.host for r in results if r.report.overall_status == "FAILED"]
+        self.assertEqual(failed, ["host03"])
+        self.assertIn('/models', transport.commands[0])
+        self.assertEqual(transport.commands[0][-4:], ['json', '--output', '-', '--quiet'])
+
+    def test_fleet_reports_timeouts_and_bad_output(self):
+        """Test hung and broken hosts become error results without stopping the fleet"""
+        hosts = ["good", "hung", "broken"]
+        transport = FakeFleetTransport({"good": self.make_report(16)}, hang=["hung"], broken=["broken"])
+
+        results = {r.host: r for r in run_fleet(hosts, transport, concurrency=3, timeout=0.2)}
+
+        self.assertIsNotNone(results["good"].report)
+        self.assertIn("timed out", results["hung"].error)
+        self.assertIn("boom", results["broken"].error)
+        self.assertIsNone(results["broken"].report)
+
+    def test_ssh_transport_multiplexes_and_quotes(self):
+        """Test SSH commands reuse a control master and quote remote arguments"""
+        command = SSHTransport(control_dir="/tmp/cm").build_command(
+            "gpu01", ['python3', '-', '--target-dir', '/models with space']
+        )
+
+        self.assertIn('ControlMaster=auto', command)
+        self.assertIn('ControlPath=/tmp/cm/validate-%C', command)
+        self.assertIn('ControlPersist=300', command)
+        self.assertEqual(command[-2], "gpu01")
+        self.assertEqual(command[-1], "python3 - --target-dir '/models with space'")
+
+    def test_container_transport(self):
+        """Test container exec keeps stdin open for the script"""
+        command = ContainerTransport("podman").build_command("ollama", ['python3', '-'])
+
+        self.assertEqual(command, ['podman', 'exec', '-i', 'ollama', 'python3', '-'])
+
+
+class TestDiskForecast(unittest.TestCase):
+    """Test peak disk usage forecasting for model workflows"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.validator = SystemValidator(target_dir=self.tmpdir.name)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_pull_stages(self):
+        """Test a pull needs the blob size per kept version"""
+        stages = self.validator.disk_stages('pull', 'Q4_K_M', keep_versions=2)
+
+        self.assertEqual([(s.name, s.usage_gb) for s in stages], [("download", 85.0)])
+
+    def test_convert_keeps_f16_source(self):
+        """Test the kept F16 source counts in every stage of a GGUF requantization"""
+        stages = {s.name: s.usage_gb for s in self.validator.disk_stages('convert', 'Q4_K_M')}
+
+        self.assertEqual(stages["quantize"], round(SystemValidator.SOURCE_SIZE_GB + 42.5, 2))
+        self.assertEqual(stages["ollama create"], round(SystemValidator.SOURCE_SIZE_GB + 85.0, 2))
+
+    def test_convert_hf_keeps_all_inputs(self):
+        """Test safetensors and F16 GGUF stay on disk until ollama create finishes"""
+        stages = {s.name: s.usage_gb for s in self.validator.disk_stages('convert-hf', 'Q4_K_M')}
+
+        self.assertEqual(stages["convert to F16 GGUF"], round(SystemValidator.SOURCE_SIZE_GB * 2, 2))
+        self.assertEqual(stages["ollama create"], round(SystemValidator.SOURCE_SIZE_GB * 2 + 85.0, 2))
+
+    def test_source_size_derived_from_profile(self):
+        """Test registry models without source_size_gb get an F16 size from their quantizations"""
+        model = ModelProfile("llama3-8b", 32, {"Q4_K_M": 4.9, "Q8_0": 8.5})
+        validator = SystemValidator(target_dir=self.tmpdir.name, model=model)
+
+        stages = {s.name: s.usage_gb for s in validator.disk_stages('convert', 'Q4_K_M')}
+
+        self.assertEqual(validator.SOURCE_SIZE_GB, 16.0)
+        self.assertEqual(stages["quantize"], 20.9)
+
+    def test_convert_needs_source_size(self):
+        """Test conversions are rejected when no F16 size can be derived"""
+        model = ModelProfile("tiny", 12, {"IQ2_XS": 2.0}, default_quantization="IQ2_XS")
+        validator = SystemValidator(target_dir=self.tmpdir.name, model=model)
+
+        self.assertEqual(validator.disk_stages('pull', 'IQ2_XS')[0].usage_gb, 2.0)
+        with self.assertRaisesRegex(ValueError, "source_size_gb"):
+            validator.disk_stages('convert', 'IQ2_XS')
+
+    def test_unknown_workflow_or_quant(self):
+        """Test bad workflow specs are rejected"""
+        with self.assertRaises(ValueError):
+            self.validator.disk_stages('mirror', 'Q4_K_M')
+        with self.assertRaises(ValueError):
+            self.validator.disk_stages('pull', 'IQ1_S')
+
+    def test_forecast_against_available_space(self):
+        """Test the forecast compares the peak with free space and warns when short"""
+        self.validator.disk_plan = ('convert', 'Q4_K_M', 1)
+        storage = StorageInfo(500.0, 150.0, True, "ext4")
+
+        forecast = self.validator.forecast_disk_usage(storage)
+        report = self.validator.evaluate(
+            CPUInfo("CPU", 8, 16, "x86_64", True, False),
+            MemoryInfo(32.0, 28.0, True, False),
+            None,
+            storage,
+            disk_forecast=forecast
+        )
+
+        self.assertIsInstance(forecast, DiskForecast)
+        self.assertFalse(forecast.fits)
+        self.assertEqual(forecast.preallocation, "skipped")
+        self.assertTrue(any("ollama create" in w for w in report.warnings))
+
+    @unittest.skipUnless(sys.platform.startswith('linux'), "fallocate is Linux only")
+    def test_try_preallocate(self):
+        """Test a small preallocation succeeds and leaves nothing behind"""
+        result = self.validator.try_preallocate(0.001)
+
+        self.assertIn(result, ("ok", "unsupported"))
+        self.assertEqual(list(Path(self.tmpdir.name).iterdir()), [])
+
+    def test_preallocation_failure_warns(self):
+        """Test a failed preallocation of a fitting plan is reported"""
+        self.validator.disk_plan = ('pull', 'Q4_K_M', 1)
+        self.validator.check_fallocate = True
+        storage = StorageInfo(500.0, 200.0, True, "nfs4")
+
+        with patch.object(self.validator, 'try_preallocate', return_value="unsupported"):
+            forecast = self.validator.forecast_disk_usage(storage)
+        report = self.validator.evaluate(
+            CPUInfo("CPU", 8, 16, "x86_64", True, False),
+            MemoryInfo(32.0, 28.0, True, False),
+            None,
+            storage,
+            disk_forecast=forecast
+        )
+
+        self.assertTrue(forecast.fits)
+        self.assertTrue(any("unsupported" in w for w in report.warnings))
+
+
+class TestReportRendering(unittest.TestCase):
+    """Test every output is rendered from one cached report IR"""
+
+    def setUp(self):
+        self.validator = SystemValidator(target_dir="/tmp")
+        self.report = SystemReport(
+            cpu=CPUInfo("Test CPU", 8, 16, "x86_64", True, False),
+            memory=MemoryInfo(32.0, 28.0, True, False),
+            gpu=GPUInfo("Test GPU", 24.0, "12.0", "550.0", "8.9", True, "Q5_K_M"),
+            storage=StorageInfo(500.0, 200.0, True, "ext4"),
+            overall_status="PASSED_WITH_WARNINGS",
+            recommendations=["Test recommendation"],
+            warnings=["Test warning"],
+            timestamp="2025-01-01T00:00:00"
+        )
+
+    def test_text_rendering(self):
+        """Test the text report is printed with a single write"""
+        with patch('sys.stdout', new_callable=io.StringIO) as stdout:
+            with patch.object(stdout, 'write', wraps=stdout.write) as write:
+                self.validator.print_report(self.report)
+
+        self.assertEqual(write.call_count, 1)
+        text = stdout.getvalue()
+        self.assertIn("  Model: Test CPU\n", text)
+        self.assertIn("  - Test warning\n", text)
+        self.assertIn("SYSTEM VALIDATION PASSED WITH WARNINGS", text)
+        self.assertTrue(text.endswith("=" * 70 + "\n\n"))
+
+    def test_renderer_is_built_once(self):
+        """Test printing and saving share one serialized report"""
+        with tempfile.TemporaryDirectory() as tmpdir, \
+                patch.object(self.validator, 'serialize_report',
+                             wraps=self.validator.serialize_report) as serialize, \
+                patch('sys.stdout', new_callable=io.StringIO):
+            self.validator.print_report(self.report)
+            for output_format in ("json", "ndjson", "compact"):
+                self.validator.save_report(
+                    self.report, str(Path(tmpdir) / f"report.{output_format}"), output_format
+                )
+
+        self.assertEqual(serialize.call_count, 1)
+
+    def test_formats_are_rendered_lazily(self):
+        """Test only requested formats are rendered, each at most once"""
+        renderer = ReportRenderer(self.validator.serialize_report(self.report))
+
+        with patch.object(renderer, '_render_text', wraps=renderer._render_text) as render_text:
+            json_output = renderer.render("json")
+            self.assertIs(renderer.render("json"), json_output)
+
+        render_text.assert_not_called()
+        self.assertEqual(json.loads(json_output)['overall_status'], "PASSED_WITH_WARNINGS")
+        with self.assertRaises(ValueError):
+            renderer.render("yaml")
+
+    def test_ndjson_matches_streaming_writer(self):
+        """Test buffered NDJSON matches the event-by-event writer"""
+        streamed = io.StringIO()
+        writer = NDJSONWriter(streamed)
+        for name in ("cpu", "memory", "gpu", "storage"):
+            writer.emit_probe(name, getattr(self.report, name))
+        writer.emit_summary(self.report)
+
+        rendered = self.validator.render(self.report).render("ndjson")
+
+        self.assertEqual(rendered, streamed.getvalue())
+
+    def test_quiet_skips_text_rendering(self):
+        """Test quiet saves write the file without printing anything"""
+        with tempfile.TemporaryDirectory() as tmpdir, \
+                patch('sys.stdout', new_callable=io.StringIO) as stdout:
+            output_path = Path(tmpdir) / "report.json"
+            self.validator.save_report(self.report, str(output_path), quiet=True)
+
+            self.assertEqual(stdout.getvalue(), "")
+            self.assertNotIn("text", self.validator.render(self.report)._cache)
+            self.assertEqual(json.loads(output_path.read_text())['schema_version'], REPORT_SCHEMA_VERSION)
+
+
+class TestResourceBudget(unittest.TestCase):
+    """Test RAM and VRAM attribution to running processes from procfs fixtures"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.proc = Path(self.tmpdir.name)
+        self.add_process(101, "ollama", rss_kb=8 * 1024 ** 2, hwm_kb=12 * 1024 ** 2, pss_kb=7 * 1024 ** 2)
+        self.add_process(202, "qdrant", rss_kb=2 * 1024 ** 2, hwm_kb=2 * 1024 ** 2)
+        # Kernel threads have no VmRSS
+        (self.proc / '2').mkdir()
+        (self.proc / '2' / 'status').write_text("Name:\tkthreadd\nState:\tS (sleeping)\n")
+        (self.proc / 'self').mkdir()
+        self.validator = SystemValidator(target_dir="/tmp", budget_workloads=True)
+        self.memory = MemoryInfo(64.0, 40.0, True, True)
+        self.gpu = GPUInfo("Test GPU", 32.0, "12.0", "550.0", "8.9", True, "Q6_K or Q8_0 (full GPU offload)")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def add_process(self, pid, name, rss_kb, hwm_kb, pss_kb=None):
+        proc_dir = self.proc / str(pid)
+        proc_dir.mkdir()
+        (proc_dir / 'status').write_text(
+            f"Name:\t{name}\nVmHWM:\t{hwm_kb} kB\nVmRSS:\t{rss_kb} kB\nVmSwap:\t0 kB\n"
+        )
+        if pss_kb is not None:
+            (proc_dir / 'smaps_rollup').write_text(f"Rss:  {rss_kb} kB\nPss:  {pss_kb} kB\n")
+
+    def budget(self, compute_apps=""):
+        smi = Mock(stdout=compute_apps)
+        with patch.object(SystemValidator, 'PROC_DIR', self.proc), \
+             patch('platform.system', return_value="Linux"), \
+             patch('subprocess.run', return_value=smi) as run:
+            return self.validator.get_resource_budget(self.memory, self.gpu), run
+
+    def test_read_process_usage(self):
+        """Test PSS is preferred over RSS and peak adds regrowth to the high-water mark"""
+        with patch.object(SystemValidator, 'PROC_DIR', self.proc):
+            ollama = self.validator.read_process_usage(101)
+            qdrant = self.validator.read_process_usage(202)
+            kthread = self.validator.read_process_usage(2)
+            exited = self.validator.read_process_usage(999)
+
+        self.assertEqual((ollama.name, ollama.rss_gb, ollama.pss_gb, ollama.peak_gb), ("ollama", 8.0, 7.0, 11.0))
+        # Unreadable smaps_rollup falls back to RSS
+        self.assertEqual(qdrant.pss_gb, 2.0)
+        self.assertIsNone(kthread)
+        self.assertIsNone(exited)
+
+    def test_budget_attributes_ram_and_vram(self):
+        """Test consumers are ranked and GPU memory is attributed per process"""
+        info, run = self.budget("101, /usr/bin/ollama, 10240\n303, python3, 4096\n404, [N/A], [N/A]\n")
+
+        self.assertIsInstance(info, ResourceBudgetInfo)
+        run.assert_called_once()
+        self.assertEqual(info.processes_scanned, 3)
+        self.assertEqual(info.ram_in_use_gb, 9.0)
+        self.assertEqual(info.ram_peak_gb, 13.0)
+        self.assertEqual(info.ram_headroom_gb, 64.0 - SystemValidator.HOST_RESERVED_GB - 13.0)
+        self.assertEqual(info.vram_in_use_gb, 14.0)
+        self.assertEqual(info.vram_headroom_gb, 32.0 - SystemValidator.VRAM_RESERVED_GB - 14.0)
+        self.assertEqual([(u.pid, u.name) for u in info.top_consumers],
+                         [(101, "ollama"), (303, "python3"), (202, "qdrant")])
+        self.assertEqual(info.top_consumers[0].vram_gb, 10.0)
+
+    def test_budget_excludes_own_process(self):
+        """Test the validator does not budget against itself"""
+        with patch('os.getpid', return_value=101):
+            info, _ = self.budget()
+
+        self.assertEqual([u.pid for u in info.top_consumers], [202])
+
+    def test_offload_plan_uses_vram_headroom(self):
+        """Test VRAM held by other processes moves layers to the host"""
+        info, _ = self.budget("101, /usr/bin/ollama, 20480\n")
+
+        full = self.validator.plan_offload(self.gpu)
+        budgeted = self.validator.plan_offload(self.gpu, budget=info)
+
+        self.assertLess(budgeted.gpu_layers, full.gpu_layers)
+        self.assertGreater(budgeted.host_resident_gb, full.host_resident_gb)
+
+    def test_evaluate_warns_on_budgeted_headroom(self):
+        """Test the report blames running workloads when they crowd out the model"""
+        info, _ = self.budget("101, /usr/bin/ollama, 30720\n")
+        info.ram_headroom_gb = 10.0
+
+        report = self.validator.evaluate(
+            CPUInfo("Test CPU", 16, 32, "x86_64", True, True), self.memory, self.gpu,
+            StorageInfo(500.0, 200.0, True, "ext4"), resource_budget=info
+        )
+
+        self.assertIs(report.resource_budget, info)
+        self.assertIsNotNone(report.offload_plan)
+        self.assertTrue(any("Running processes peak" in w and "ollama (101)" in w for w in report.warnings))
+        self.assertTrue(any("held by other processes" in w for w in report.warnings))
+        validate_report_schema(self.validator.serialize_report(report))
+
+    def test_evaluate_tiers_quantization_on_free_vram(self):
+        """Test VRAM held by other processes lowers the recommended quantization"""
+        info, _ = self.budget("101, /usr/bin/ollama, 20480\n")
+
+        report = self.validator.evaluate(
+            CPUInfo("Test CPU", 16, 32, "x86_64", True, True), self.memory, self.gpu,
+            StorageInfo(500.0, 200.0, True, "ext4"), resource_budget=info
+        )
+
+        self.assertEqual(report.gpu.recommended_quantization, self.validator.recommend_quantization(12.0))
+        self.assertNotIn("full GPU offload", report.gpu.recommended_quantization)
+        self.assertFalse(any(r.startswith("Excellent!") for r in report.recommendations))
+        # The probe result passed in is left untouched
+        self.assertEqual(self.gpu.recommended_quantization, "Q6_K or Q8_0 (full GPU offload)")
+
+
+class FakeKernel32:
+    """Stands in for kernel32, filling buffers the way the Win32 calls do"""
+
+    def __init__(self, total_bytes, available_bytes, cores, disk_total_bytes=0, disk_free_bytes=0):
+        self.total_bytes = total_bytes
+        self.available_bytes = available_bytes
+        self.disk = (disk_total_bytes, disk_free_bytes)
+        # One PROCESSOR_RELATIONSHIP record per core, two SMT threads each
+        self.records = b"".join(
+            struct.pack('<IIBB20xHQH6x', RELATION_PROCESSOR_CORE, 48, 1, 0, 1, 0b11 << (2 * core), 0)
+            for core in range(cores)
+        )
+
+    def GlobalMemoryStatusEx(self, buffer):
+        length = struct.unpack_from('<I', buffer)[0]
+        if length != struct.calcsize(MEMORYSTATUSEX_FORMAT):
+            return 0
+        struct.pack_into(MEMORYSTATUSEX_FORMAT, buffer, 0, length, 50, self.total_bytes, self.available_bytes,
+                         0, 0, 0, 0, 0)
+        return 1
+
+    def GetDiskFreeSpaceExW(self, path, free_ref, total_ref, total_free_ref):
+        total_ref._obj.value, free_ref._obj.value = self.disk
+        return 1
+
+    def GetLogicalProcessorInformationEx(self, relationship, buffer, length_ref):
+        length = length_ref._obj
+        if buffer is None or length.value < len(self.records):
+            length.value = len(self.records)
+            return 0
+        ctypes.memmove(buffer, self.records, len(self.records))
+        return 1
+
+
+class FakeLibSystem:
+    """Stands in for libSystem's sysctlbyname, statfs and Mach host calls"""
+
+    def __init__(self, sysctls, page_size, free, inactive, speculative, mount=None):
+        self.sysctls = sysctls
+        self.page_size = page_size
+        self.pages = (free, inactive, speculative)
+        self.host_calls = 0
+        # (f_fstypename, f_flags, f_mntonname, f_mntfromname) reported by statfs
+        self.mount = mount
+
+    def statfs(self, path, buffer):
+        if self.mount is None:
+            return -1
+        fstype, flags, mount_point, source = self.mount
+        struct.pack_into(STATFS_FORMAT, buffer, 0, 4096, 1048576, *[0] * 5, 0, 0, 501, 0, flags, 0,
+                         fstype.encode(), mount_point.encode(), source.encode(), *[0] * 8)
+        return 0
+
+    def sysctlbyname(self, name, buffer, size_ref, new, new_size):
+        value = self.sysctls.get(name.decode())
+        if value is None:
+            return -1
+        size_ref._obj.value = len(value)
+        if buffer is not None:
+            ctypes.memmove(buffer, value, len(value))
+        return 0
+
+    def mach_host_self(self):
+        self.host_calls += 1
+        return 42
+
+    def host_page_size(self, host, size_ref):
+        size_ref._obj.value = self.page_size
+        return 0
+
+    def host_statistics64(self, host, flavor, buffer, count_ref):
+        if host != 42 or flavor != HOST_VM_INFO64 or count_ref._obj.value * 4 < len(buffer):
+            return 5  # KERN_FAILURE
+        free, inactive, speculative = self.pages
+        stats = [0] * 24
+        stats[0], stats[2], stats[14] = free, inactive, speculative
+        struct.pack_into(VM_STATISTICS64_FORMAT, buffer, 0, *stats)
+        return 0
+
+
+class TestNativeProbes(unittest.TestCase):
+    """Test the Windows and macOS probes against stubbed ctypes libraries"""
+
+    def setUp(self):
+        self.validator = SystemValidator(target_dir="/tmp")
+
+    def test_windows_probes_share_kernel32(self):
+        """Test the CPU, memory and storage probes share one kernel32 handle"""
+        kernel32 = FakeKernel32(64 * 1024 ** 3, 48 * 1024 ** 3, cores=8,
+                                disk_total_bytes=1000 * 1024 ** 3, disk_free_bytes=400 * 1024 ** 3)
+        with patch('platform.system', return_value="Windows"), \
+             patch('ctypes.WinDLL', return_value=kernel32, create=True) as windll, \
+             patch.object(self.validator, '_windows_cpu_model', return_value="AMD Ryzen 7 7700X"):
+            cpu = self.validator.get_cpu_info()
+            memory = self.validator.get_memory_info()
+            storage = self.validator.get_storage_info()
+
+        self.assertEqual((cpu.model, cpu.cores, cpu.threads), ("AMD Ryzen 7 7700X", 8, 16))
+        self.assertTrue(cpu.meets_minimum)
+        self.assertEqual((memory.total_gb, memory.available_gb), (64.0, 48.0))
+        self.assertEqual((storage.total_gb, storage.available_gb), (1000.0, 400.0))
+        windll.assert_called_once_with('kernel32', use_last_error=True)
+
+    def test_windows_cpu_model_without_registry(self):
+        """Test the model falls back to Unknown where winreg is unavailable"""
+        with patch.dict(sys.modules, {'winreg': None}):
+            self.assertEqual(self.validator._windows_cpu_model(), "Unknown")
+
+    def test_macos_cpu_and_memory(self):
+        """Test sysctlbyname and host_statistics64 replace sysctl forks and the 70% estimate"""
+        libsystem = FakeLibSystem(
+            {
+                'machdep.cpu.brand_string': b"Apple M2 Max\0",
+                'hw.physicalcpu': struct.pack('=i', 12),
+                'hw.logicalcpu': struct.pack('=i', 12),
+                'hw.memsize': struct.pack('=q', 64 * 1024 ** 3),
+            },
+            page_size=16384,
+            free=262144,  # 4GB, of which 1GB speculative
+            inactive=1048576,  # 16GB
+            speculative=65536
+        )
+        with patch('platform.system', return_value="Darwin"), \
+             patch('subprocess.check_output') as check_output, \
+             patch.object(self.validator, '_native', return_value=libsystem):
+            cpu = self.validator.get_cpu_info()
+            memory = self.validator.get_memory_info()
+            self.validator.get_memory_info()
+
+        check_output.assert_not_called()
+        self.assertEqual((cpu.model, cpu.cores, cpu.threads), ("Apple M2 Max", 12, 12))
+        self.assertEqual(memory.total_gb, 64.0)
+        self.assertEqual(memory.available_gb, 19.0)
+        self.assertEqual(libsystem.host_calls, 1)
+
+    def test_macos_mount_from_statfs(self):
+        """Test the filesystem type comes from statfs, so SMB model stores get the network warning"""
+        libsystem = FakeLibSystem({}, 4096, 0, 0, 0, mount=("smbfs", 0, "/Volumes/models", "//nas/models"))
+        with patch('platform.system', return_value="Darwin"), \
+             patch.object(self.validator, '_native', return_value=libsystem):
+            storage = self.validator.get_storage_info()
+
+        self.assertEqual(storage.filesystem, "smbfs")
+        self.assertEqual((storage.mount_point, storage.mount_source), ("/Volumes/models", "//nas/models"))
+        self.assertTrue(storage.is_network)
+
+        libsystem.mount = ("apfs", MNT_LOCAL | MNT_NOATIME, "/", "/dev/disk3s1s1")
+        with patch('platform.system', return_value="Darwin"), \
+             patch.object(self.validator, '_native', return_value=libsystem):
+            storage = self.validator.get_storage_info()
+
+        self.assertEqual(storage.filesystem, "apfs")
+        self.assertFalse(storage.is_network)
+        self.assertTrue(storage.noatime)
+
+    def test_macos_sysctl_failure_warns(self):
+        """Test a failing sysctlbyname falls back to the unknown CPU result"""
+        libsystem = FakeLibSystem({}, 4096, 0, 0, 0)
+        with patch('platform.system', return_value="Darwin"), \
+             patch.object(self.validator, '_native', return_value=libsystem), \
+             patch('sys.stderr', new_callable=io.StringIO) as stderr:
+            cpu = self.validator.get_cpu_info()
+
+        self.assertEqual(cpu.cores, 0)
+        self.assertIn("machdep.cpu.brand_string", stderr.getvalue())
+
+
+class TestCommandLine(unittest.TestCase):
+    """Test argument handling of the command line entry point"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.output = str(Path(self.tmpdir.name) / "report.json")
+        self.report = SystemReport(
+            cpu=CPUInfo("Test CPU", 8, 16, "x86_64", True, False),
+            memory=MemoryInfo(32.0, 28.0, True, False),
+            gpu=None,
+            storage=StorageInfo(500.0, 200.0, True, "ext4"),
+            overall_status="PASSED",
+            recommendations=[],
+            warnings=[],
+            timestamp="2025-01-01T00:00:00"
+        )
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def run_main(self, *argv):
+        """Run main() with validation stubbed; returns (validate mock, exit code)"""
+        with patch.object(sys, 'argv', ['validate_system_requirements.py', *argv]), \
+             patch.object(SystemValidator, 'validate', autospec=True, return_value=self.report) as validate, \
+             patch('sys.stdout', new_callable=io.StringIO):
+            with self.assertRaises(SystemExit) as exit_info:
+                main()
+        return validate, exit_info.exception.code
+
+    def test_options_after_subcommand(self):
+        """Test shared options are accepted after the subcommand"""
+        validate, code = self.run_main('verify', '--target-dir', self.tmpdir.name, '--output', self.output, '--quiet')
+
+        self.assertEqual(code, 0)
+        validator = validate.call_args[0][0]
+        self.assertEqual(validator.target_dir, Path(self.tmpdir.name).resolve())
+        self.assertTrue(validate.call_args[1]['verify_blobs'])
+        self.assertTrue(Path(self.output).is_file())
+
+    def test_options_before_subcommand_are_kept(self):
+        """Test a subcommand does not reset options given before it"""
+        validate, _ = self.run_main('--target-dir', self.tmpdir.name, '--output', self.output, '--mlock', 'verify')
+
+        validator = validate.call_args[0][0]
+        self.assertEqual(validator.target_dir, Path(self.tmpdir.name).resolve())
+        self.assertTrue(validator.use_mlock)
+
+    def test_simulate_uses_selected_model(self):
+        """Test --models/--model reach the simulate subcommand"""
+        hosts = Path(self.tmpdir.name) / "hosts.json"
+        hosts.write_text(json.dumps(TestSimulation.CPU_ONLY_BOX))
+        models = Path(self.tmpdir.name) / "models.json"
+        models.write_text(json.dumps(TestModelProfiles.REGISTRY))
+
+        with patch.object(sys, 'argv', ['validate_system_requirements.py', '--models', str(models),
+                                        '--model', 'llama3-8b', 'simulate', str(hosts)]), \
+             patch('sys.stdout', new_callable=io.StringIO) as stdout:
+            with self.assertRaises(SystemExit):
+                main()
+
+        header = stdout.getvalue().splitlines()[0].split()
+        self.assertEqual(header[-2:], ["Q8_0", "Q4_K_M"])
+
+    def test_simulate_rejects_local_only_options(self):
+        """Test simulate refuses options it would otherwise silently ignore"""
+        hosts = Path(self.tmpdir.name) / "hosts.json"
+        hosts.write_text(json.dumps(TestSimulation.CPU_ONLY_BOX))
+        for extra in (['--disk-plan', 'convert'], ['--format', 'json'], ['--output', self.output], ['--mlock']):
+            with patch.object(sys, 'argv', ['validate_system_requirements.py', 'simulate', str(hosts), *extra]), \
+                 patch('validate_system_requirements.simulate_profiles') as simulate, \
+                 patch('sys.stderr', new_callable=io.StringIO) as stderr:
+                with self.assertRaises(SystemExit) as exit_info:
+                    main()
+
+            self.assertEqual(exit_info.exception.code, 2)
+            self.assertIn(f"{extra[0]} cannot be used with simulate", stderr.getvalue())
+            simulate.assert_not_called()
+        self.assertFalse(Path(self.output).exists())
+
+    def test_simulate_reports_bad_profiles(self):
+        """Test an incomplete or missing host profile file is a usage error"""
+        hosts = Path(self.tmpdir.name) / "hosts.json"
+        hosts.write_text(json.dumps({"name": "no-memory", "cpu": {"cores": 8}, "storage": {"total_gb": 100}}))
+        cases = [(hosts, "Host profile no-memory is missing memory.total_gb"),
+                 (Path(self.tmpdir.name) / "absent.json", "Cannot read host profiles")]
+        for path, message in cases:
+            with patch.object(sys, 'argv', ['validate_system_requirements.py', 'simulate', str(path)]), \
+                 patch('sys.stderr', new_callable=io.StringIO) as stderr:
+                with self.assertRaises(SystemExit) as exit_info:
+                    main()
+
+            self.assertEqual(exit_info.exception.code, 2)
+            self.assertIn(message, stderr.getvalue())
+
+    def test_disk_plan_quantization_checked(self):
+        """Test a bad --disk-plan quantization, workflow or version count is a usage error"""
+        cases = [
+            (['--disk-plan', 'pull:IQ1_S'], "quantization IQ1_S has no size"),
+            (['--disk-plan', 'mirror'], "workflow must be one of"),
+            (['--disk-plan', 'pull', '--keep-versions', '-3'], "--keep-versions must be at least 1"),
+        ]
+        for extra, message in cases:
+            with patch.object(sys, 'argv', ['validate_system_requirements.py', '--output', self.output, *extra]), \
+                 patch.object(SystemValidator, 'validate') as validate, \
+                 patch('sys.stderr', new_callable=io.StringIO) as stderr:
+                with self.assertRaises(SystemExit) as exit_info:
+                    main()
+
+            self.assertEqual(exit_info.exception.code, 2)
+            self.assertIn(message, stderr.getvalue())
+            validate.assert_not_called()
+
+    def test_model_errors_are_usage_errors(self):
+        """Test bad model selections and registries end in a usage error, not a traceback"""
+        malformed = Path(self.tmpdir.name) / "malformed.json"
+        malformed.write_text(json.dumps({"models": [{"name": "no-layers", "sizes_gb": {"Q4_K_M": 1.0}}]}))
+        geometry = Path(self.tmpdir.name) / "geometry.json"
+        geometry.write_text(json.dumps({"models": [
+            {"name": "tiny", "layers": 4, "sizes_gb": {"Q4_K_M": 1.0}, "requirements": {"MODEL_LAYERS": 2}}
+        ]}))
+        cases = [
+            (['--model', 'missing'], "Unknown model"),
+            (['--co-resident', f'{DEFAULT_MODEL_NAME}:IQ1_S'], "no size for IQ1_S"),
+            (['--models', str(Path(self.tmpdir.name) / "absent.json")], "Cannot read model registry"),
+            (['--models', str(malformed)], "missing 'layers'"),
+            (['--models', str(geometry)], "Unknown threshold in model tiny: MODEL_LAYERS"),
+        ]
+        for extra, message in cases:
+            with patch.object(sys, 'argv', ['validate_system_requirements.py', '--output', self.output, *extra]), \
+                 patch.object(SystemValidator, 'validate') as validate, \
+                 patch('sys.stderr', new_callable=io.StringIO) as stderr:
+                with self.assertRaises(SystemExit) as exit_info:
+                    main()
+
+            self.assertEqual(exit_info.exception.code, 2)
+            self.assertIn(message, stderr.getvalue())
+            validate.assert_not_called()
+
+    def test_watch_options_checked(self):
+        """Test --watch rejects non-NDJSON formats and platforms without inotify up front"""
+        cases = [(['--format', 'compact'], "Linux", "--format"), ([], "Darwin", "Linux")]
+        for extra, system, message in cases:
+            with patch.object(sys, 'argv', ['validate_system_requirements.py', '--watch', *extra]), \
+                 patch('platform.system', return_value=system), \
+                 patch.object(SystemValidator, 'watch') as watch, \
+                 patch('sys.stderr', new_callable=io.StringIO) as stderr:
+                with self.assertRaises(SystemExit) as exit_info:
+                    main()
+
+            self.assertEqual(exit_info.exception.code, 2)
+            self.assertIn(message, stderr.getvalue())
+            watch.assert_not_called()
+
+    def test_fleet_forwards_remote_options(self):
+        """Test options meaningful on a remote host are forwarded by fleet"""
+        with patch.object(sys, 'argv', ['validate_system_requirements.py', '--target-dir', '/models', '--mlock',
+                                        '--disk-plan', 'pull', '--check-fallocate', '--output', self.output, 'fleet', 'gpu01',
+                                        '--co-resident', DEFAULT_MODEL_NAME]), \
+             patch('validate_system_requirements.run_fleet', return_value=[]) as fleet, \
+             patch('sys.stdout', new_callable=io.StringIO):
+            with self.assertRaises(SystemExit) as exit_info:
+                main()
+
+        self.assertEqual(exit_info.exception.code, 0)
+        self.assertEqual(fleet.call_args[0][2], [
+            '--target-dir', '/models', '--model', DEFAULT_MODEL_NAME,
+            '--co-resident', DEFAULT_MODEL_NAME, '--disk-plan', 'pull', '--keep-versions', '1',
+            '--mlock', '--check-fallocate',
+        ])
+
+    def test_fleet_rejects_local_only_options(self):
+        """Test fleet refuses options the remote hosts cannot honour"""
+        for extra in (['--models', 'models.json'], ['--format', 'compact'], ['--watch'], ['--model', 'missing']):
+            with patch.object(sys, 'argv', ['validate_system_requirements.py', *extra, 'fleet', 'gpu01']), \
+                 patch('validate_system_requirements.run_fleet') as fleet, \
+                 patch('sys.stderr', new_callable=io.StringIO):
+                with self.assertRaises(SystemExit) as exit_info:
+                    main()
+
+            self.assertEqual(exit_info.exception.code, 2, extra)
+            fleet.assert_not_called()
+
+    def test_fleet_accepts_ndjson_format(self):
+        """Test --format ndjson is fleet's format, and its default output file is named .ndjson"""
+        for extra in ([], ['--format', 'ndjson']):
+            with patch.object(sys, 'argv', ['validate_system_requirements.py', *extra, 'fleet', 'gpu01']), \
+                 patch('validate_system_requirements.run_fleet', return_value=[]) as fleet, \
+                 patch('validate_system_requirements.open', mock_open(), create=True) as opened, \
+                 patch('sys.stderr', new_callable=io.StringIO):
+                with self.assertRaises(SystemExit) as exit_info:
+                    main()
+
+            self.assertEqual(exit_info.exception.code, 0, extra)
+            fleet.assert_called_once()
+            opened.assert_called_once_with('system_validation_report.ndjson', 'w')
+
+
 class TestIntegration(unittest.TestCase):
     """Integration tests for complete validation flow"""
 